@@ -19,6 +19,9 @@ if not SECRET_KEY:
 
 security = HTTPBearer()
 
+# Users allowed to call admin endpoints that cost money or change the live index
+ADMIN_USER_IDS = {user_id.strip() for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a bcrypt hash"""
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
@@ -56,3 +59,12 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         return {"user_id": user_id}
     except JWTError:
         raise credentials_exception
+
+async def get_current_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """
+    Dependency for admin-only endpoints: the user must be listed in ADMIN_USER_IDS.
+    Raises 403 otherwise (including when no admins are configured).
+    """
+    if current_user["user_id"] not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return current_user
@@ -1,15 +1,39 @@
 from supabase import Client
+import time
 import uuid
 from datetime import datetime
 from typing import List, Optional
 
 from . import schemas
+from .database import db_metrics
+from .pg_fastpath import get_fastpath
+
+# Sentinel: the fast path is disabled (or failed), read through PostgREST instead.
+_USE_POSTGREST = object()
+
+def _fast_read(repository: str, method: str, *args):
+    """Run a read on the asyncpg fast path when it is enabled for `repository`."""
+    fastpath = get_fastpath(repository)
+    if fastpath is None:
+        return _USE_POSTGREST
+    start = time.perf_counter()
+    try:
+        result = getattr(fastpath, method)(*args)
+    except Exception as e:
+        db_metrics.record(f"fastpath:{repository}", (time.perf_counter() - start) * 1000, error=True)
+        print(f"[FastPath] {method} failed, falling back to PostgREST: {e}")
+        return _USE_POSTGREST
+    db_metrics.record(f"fastpath:{repository}", (time.perf_counter() - start) * 1000)
+    return result
 
 # =======================
 # User CRUD
 # =======================
 
 def get_user(supabase: Client, user_id: str):
+    user = _fast_read("users", "get_user", user_id)
+    if user is not _USE_POSTGREST:
+        return user
     response = supabase.table("users").select("*, user_profiles(*)").eq("id", user_id).execute()
     return response.data[0] if response.data else None
 
@@ -56,6 +80,17 @@ def create_policy_chunks(supabase: Client, chunks: list[schemas.PolicyChunkCreat
     response = supabase.table("policy_chunks").insert(chunks_data).execute()
     return response.data if response.data else []
 
+def get_policy_chunks_by_ids(supabase: Client, chunk_ids: List[str], chunk_table: str = "policy_chunks"):
+    """
+    Load chunk text (without embeddings) for the given ids, preserving request order.
+    chunk_table is the active index's table (policy_chunks_<version> after a reindex).
+    """
+    if not chunk_ids:
+        return []
+    response = supabase.table(chunk_table).select("id, doc_id, chunk_index, content, metadata").in_("id", chunk_ids).execute()
+    rows_by_id = {row["id"]: row for row in (response.data or [])}
+    return [rows_by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in rows_by_id]
+
 def get_policies(supabase: Client, limit: int = 10):
     """Get policies for display."""
     response = supabase.table("policies").select("*").limit(limit).execute()
@@ -103,7 +138,68 @@ def create_message(supabase: Client, conversation_id: str, role: str, content: s
 
     return response.data[0] if response.data else None
 
+def create_messages_bulk(supabase: Client, messages: List[dict]):
+    """
+    Insert several fully-formed message rows in one request and bump
+    last_message_at once per affected conversation.
+    Used by the write-behind message queue.
+    """
+    if not messages:
+        return []
+    response = supabase.table("messages").insert(messages).execute()
+
+    latest_by_conversation = {}
+    for message in messages:
+        conversation_id = str(message["conversation_id"])
+        created_at = message.get("created_at") or datetime.now().isoformat()
+        if created_at > latest_by_conversation.get(conversation_id, ""):
+            latest_by_conversation[conversation_id] = created_at
+
+    for conversation_id, last_message_at in latest_by_conversation.items():
+        supabase.table("conversations").update({
+            "last_message_at": last_message_at
+        }).eq("id", conversation_id).execute()
+
+    return response.data if response.data else []
+
+def hydrate_rag_sources(supabase: Client, messages: List[dict], chunk_table: str = "policy_chunks"):
+    """
+    Fill in chunk text for rag_sources stored as chunk-id references, read
+    from chunk_table (the active index's table).
+    Loads all referenced chunks with a single query; legacy rows that already
+    carry full content are left untouched.
+    Returns new message/source dicts: the inputs may be rows still queued in
+    the write-behind queue, which must keep storing references only.
+    """
+    chunk_ids = {
+        source["chunk_id"]
+        for message in messages
+        for source in (message.get("rag_sources") or [])
+        if isinstance(source, dict) and source.get("chunk_id") and not source.get("content")
+    }
+    if not chunk_ids:
+        return messages
+
+    response = supabase.table(chunk_table).select("id, content").in_("id", list(chunk_ids)).execute()
+    content_by_id = {row["id"]: row.get("content") or "" for row in (response.data or [])}
+
+    hydrated = []
+    for message in messages:
+        sources = message.get("rag_sources")
+        if sources:
+            sources = [
+                {**source, "content": content_by_id.get(source.get("chunk_id"), "")}
+                if isinstance(source, dict) and not source.get("content")
+                else source
+                for source in sources
+            ]
+        hydrated.append({**message, "rag_sources": sources})
+    return hydrated
+
 def get_conversation(supabase: Client, conversation_id: str):
+    conversation = _fast_read("conversations", "get_conversation", conversation_id)
+    if conversation is not _USE_POSTGREST:
+        return conversation
     response = supabase.table("conversations").select("*").eq("id", conversation_id).execute()
     return response.data[0] if response.data else None
 
@@ -132,6 +228,10 @@ def get_recent_conversation_messages(supabase: Client, conversation_id: str, lim
     Get the most recent N messages from a conversation for context window.
     Returns messages in chronological order (oldest to newest).
     """
+    messages = _fast_read("messages", "get_recent_conversation_messages", conversation_id, limit)
+    if messages is not _USE_POSTGREST:
+        return messages
+
     # Get last N messages in reverse order, then reverse the result
     response = supabase.table("messages").select("*").eq("conversation_id", conversation_id).order("created_at", desc=True).limit(limit).execute()
 
@@ -145,25 +245,29 @@ def get_recent_conversation_messages(supabase: Client, conversation_id: str, lim
 # =======================
 
 def get_posts(supabase: Client, skip: int = 0, limit: int = 10, category_id: str = None):
+    posts = _fast_read("posts", "get_posts", skip, limit, category_id)
+    if posts is not _USE_POSTGREST:
+        return _flatten_author_names(posts)
+
     query = supabase.table("posts").select("*, author:users(id, email, user_profiles(name))").order("created_at", desc=True).range(skip, skip + limit - 1)
 
     if category_id:
         query = query.eq("category_id", category_id)
 
     response = query.execute()
+    return _flatten_author_names(response.data) if response.data else []
 
+def _flatten_author_names(posts: List[dict]) -> List[dict]:
     # Transform nested user_profiles.name to author.name for frontend
-    if response.data:
-        for post in response.data:
-            if post.get("author") and post["author"].get("user_profiles"):
-                profiles = post["author"]["user_profiles"]
-                # Handle both single object and array of profiles
-                if isinstance(profiles, list) and len(profiles) > 0:
-                    post["author"]["name"] = profiles[0].get("name")
-                elif isinstance(profiles, dict):
-                    post["author"]["name"] = profiles.get("name")
-
-    return response.data if response.data else []
+    for post in posts:
+        if post.get("author") and post["author"].get("user_profiles"):
+            profiles = post["author"]["user_profiles"]
+            # Handle both single object and array of profiles
+            if isinstance(profiles, list) and len(profiles) > 0:
+                post["author"]["name"] = profiles[0].get("name")
+            elif isinstance(profiles, dict):
+                post["author"]["name"] = profiles.get("name")
+    return posts
 
 def create_post(supabase: Client, post: schemas.PostCreate, author_id: str):
     post_data = {
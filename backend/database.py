@@ -1,6 +1,39 @@
+"""
+Managed Supabase access layer.
+
+One sync and one async Supabase client are shared per process. Both use a
+pooled httpx client (HTTP/2 keep-alive when `h2` is installed) with explicit
+timeouts. Every `.table(...)` / `.rpc(...)` query built through them is timed
+per table, and read queries are retried on transient network errors. RPCs
+are treated as writes unless listed in _READ_ONLY_RPC_PREFIXES. Clients
+are created on FastAPI startup and closed on shutdown (see main.lifespan).
+"""
+
+import asyncio
+import dataclasses
 import os
-from supabase import create_client, Client
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import httpx
 from dotenv import load_dotenv
+from supabase import Client, ClientOptions, create_client
+
+try:  # pragma: no cover - async client is optional on older supabase releases
+    from supabase import AsyncClient, AsyncClientOptions, acreate_client
+except ImportError:  # pragma: no cover
+    AsyncClient = None  # type: ignore[assignment,misc]
+    AsyncClientOptions = None  # type: ignore[assignment,misc]
+    acreate_client = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - HTTP/2 needs the optional h2 package (httpx[http2])
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    HTTP2_AVAILABLE = False
 
 # Load environment variables from backend/.env
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
@@ -11,9 +44,255 @@ SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
     raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in .env file")
 
-# Create Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+DB_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+DB_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+DB_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "50"))
+DB_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "20"))
+DB_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+DB_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "2"))
+DB_HTTP2 = HTTP2_AVAILABLE and os.getenv("SUPABASE_HTTP2", "true").lower() in {"1", "true", "yes", "on"}
+
+# Builder methods that make a query non-idempotent (never retried).
+_MUTATING_METHODS = {"insert", "upsert", "update", "delete"}
+# RPCs safe to retry (pure reads). Any other function may change data, e.g.
+# increment_views_count or activate_embedding_index, and is never retried.
+_READ_ONLY_RPC_PREFIXES = ("match_policy_chunks",)
+_TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+# =======================
+# Metrics
+# =======================
+
+class QueryMetrics:
+    """Per-table call counts, errors, retries and latency (ms) with a rolling p95."""
+
+    def __init__(self, window: int = 500):
+        self._window = window
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, table: str, elapsed_ms: float, *, error: bool = False, retries: int = 0) -> None:
+        with self._lock:
+            stats = self._tables.get(table)
+            if stats is None:
+                stats = self._tables[table] = {
+                    "calls": 0, "errors": 0, "retries": 0,
+                    "total_ms": 0.0, "max_ms": 0.0, "samples": deque(maxlen=self._window),
+                }
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["retries"] += retries
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["samples"].append(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for table, stats in self._tables.items():
+                samples: Deque[float] = stats["samples"]
+                ordered = sorted(samples)
+                result[table] = {
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "retries": stats["retries"],
+                    "avg_ms": round(stats["total_ms"] / stats["calls"], 2),
+                    "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 2) if ordered else 0.0,
+                    "max_ms": round(stats["max_ms"], 2),
+                }
+            return result
+
+
+db_metrics = QueryMetrics()
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(2.0, 0.1 * (2 ** attempt)))
+
+
+# =======================
+# Instrumented query builders
+# =======================
+
+class _InstrumentedQuery:
+    """Wraps a postgrest request builder; times (and for reads, retries) `execute()`."""
+
+    def __init__(self, builder: Any, table: str, mutating: bool = False):
+        self._builder = builder
+        self._table = table
+        self._mutating = mutating
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if name == "execute":
+            return self._execute
+        mutating = self._mutating or name in _MUTATING_METHODS
+        if callable(attr):
+            def chained(*args, **kwargs):
+                return self._wrap(attr(*args, **kwargs), mutating)
+            return chained
+        return self._wrap(attr, mutating)  # e.g. the `.not_` property
+
+    def _wrap(self, value: Any, mutating: bool) -> Any:
+        if hasattr(value, "execute"):
+            return type(self)(value, self._table, mutating)
+        return value
+
+    def _execute(self) -> Any:
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                response = self._builder.execute()
+            except _TRANSIENT_ERRORS:
+                if self._mutating or attempt >= DB_MAX_RETRIES:
+                    db_metrics.record(self._table, _elapsed_ms(start), error=True, retries=attempt)
+                    raise
+                attempt += 1
+                time.sleep(_backoff(attempt))
+                continue
+            except Exception:
+                db_metrics.record(self._table, _elapsed_ms(start), error=True, retries=attempt)
+                raise
+            db_metrics.record(self._table, _elapsed_ms(start), retries=attempt)
+            return response
+
+
+class _AsyncInstrumentedQuery(_InstrumentedQuery):
+    async def _execute(self) -> Any:  # type: ignore[override]
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                response = await self._builder.execute()
+            except _TRANSIENT_ERRORS:
+                if self._mutating or attempt >= DB_MAX_RETRIES:
+                    db_metrics.record(self._table, _elapsed_ms(start), error=True, retries=attempt)
+                    raise
+                attempt += 1
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            except Exception:
+                db_metrics.record(self._table, _elapsed_ms(start), error=True, retries=attempt)
+                raise
+            db_metrics.record(self._table, _elapsed_ms(start), retries=attempt)
+            return response
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+class ManagedClient:
+    """Drop-in proxy for a Supabase client whose table/rpc queries are instrumented."""
+
+    _query_type = _InstrumentedQuery
+
+    def __init__(self, client: Any, http_client: Optional[Any] = None):
+        self._client = client
+        self._http_client = http_client
+
+    def table(self, table_name: str):
+        return self._query_type(self._client.table(table_name), table_name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[dict] = None, *args, **kwargs):
+        return self._query_type(
+            self._client.rpc(fn, params or {}, *args, **kwargs),
+            f"rpc:{fn}",
+            mutating=not fn.startswith(_READ_ONLY_RPC_PREFIXES),
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class AsyncManagedClient(ManagedClient):
+    _query_type = _AsyncInstrumentedQuery
+
+
+# =======================
+# Client construction
+# =======================
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=DB_MAX_CONNECTIONS,
+        max_keepalive_connections=DB_MAX_KEEPALIVE,
+        keepalive_expiry=DB_KEEPALIVE_EXPIRY,
+    )
+
+
+def _http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(DB_TIMEOUT, connect=DB_CONNECT_TIMEOUT)
+
+
+def _client_options(options_cls: Any, http_client: Any) -> Any:
+    """Build client options, passing our pooled httpx client when this supabase release supports it."""
+    kwargs: Dict[str, Any] = {"postgrest_client_timeout": _http_timeout()}
+    if "httpx_client" in {field.name for field in dataclasses.fields(options_cls)}:
+        kwargs["httpx_client"] = http_client
+    return options_cls(**kwargs)
+
+
+def _create_sync_client() -> ManagedClient:
+    http_client = httpx.Client(http2=DB_HTTP2, limits=_http_limits(), timeout=_http_timeout())
+    client = create_client(
+        SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, options=_client_options(ClientOptions, http_client)
+    )
+    return ManagedClient(client, http_client)
+
+
+async def _create_async_client() -> AsyncManagedClient:
+    if acreate_client is None:
+        raise RuntimeError("This supabase release has no async client; upgrade supabase>=2.0")
+    http_client = httpx.AsyncClient(http2=DB_HTTP2, limits=_http_limits(), timeout=_http_timeout())
+    client = await acreate_client(
+        SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, options=_client_options(AsyncClientOptions, http_client)
+    )
+    return AsyncManagedClient(client, http_client)
+
+
+_sync_client: Optional[ManagedClient] = None
+_async_client: Optional[AsyncManagedClient] = None
+_client_lock = threading.Lock()
+
 
 # Dependency to get Supabase client
 def get_supabase() -> Client:
-    return supabase
+    global _sync_client
+    if _sync_client is None:
+        with _client_lock:
+            if _sync_client is None:
+                _sync_client = _create_sync_client()
+    return _sync_client  # type: ignore[return-value]
+
+
+async def get_async_supabase() -> "AsyncClient":
+    """Async dependency; the client is created on startup or on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = await _create_async_client()
+    return _async_client  # type: ignore[return-value]
+
+
+async def startup_database() -> None:
+    get_supabase()
+    if acreate_client is not None:
+        await get_async_supabase()
+
+
+async def shutdown_database() -> None:
+    global _sync_client, _async_client
+    if _async_client is not None and _async_client._http_client is not None:
+        await _async_client._http_client.aclose()
+    if _sync_client is not None and _sync_client._http_client is not None:
+        _sync_client._http_client.close()
+    _sync_client = None
+    _async_client = None
+
+
+def get_database_metrics() -> Dict[str, Dict[str, float]]:
+    return db_metrics.snapshot()
@@ -58,6 +58,43 @@ CREATE TABLE IF NOT EXISTS policy_chunks (
     embedding VECTOR(1024)
 );
 
+-- SimHash of chunk text (signed 64-bit) for near-duplicate detection at ingest
+ALTER TABLE policy_chunks ADD COLUMN IF NOT EXISTS simhash BIGINT;
+
+-- Last write time; reindex catch-up re-copies rows updated after its last sync
+ALTER TABLE policy_chunks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION touch_policy_chunk()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  NEW.updated_at := NOW();
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS policy_chunks_touch ON policy_chunks;
+CREATE TRIGGER policy_chunks_touch BEFORE UPDATE ON policy_chunks
+  FOR EACH ROW EXECUTE FUNCTION touch_policy_chunk();
+
+-- Near-duplicate chunks are not embedded again; they point at the stored canonical chunk
+CREATE TABLE IF NOT EXISTS policy_chunk_duplicates (
+    id TEXT PRIMARY KEY, -- chunk id the duplicate would have had
+    canonical_id TEXT NOT NULL, -- chunk id in the active chunk table (no FK: it moves on reindex)
+    doc_id TEXT NOT NULL REFERENCES policies(id) ON DELETE CASCADE,
+    page INT,
+    chunk_index INT NOT NULL
+);
+
+-- Streaming PDF ingest progress (one row per policy document)
+CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+    policy_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL, -- file size + mtime; a changed file restarts from page 1
+    last_page INT NOT NULL DEFAULT 0,
+    chunks INT NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'done')),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 CREATE TABLE IF NOT EXISTS user_policies (
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
     policy_id TEXT REFERENCES policies(id) ON DELETE CASCADE,
@@ -206,40 +243,185 @@ CREATE TABLE IF NOT EXISTS notifications (
 -- Vector Search Setup
 -- ========================
 
+-- Quantized ANN indexes (pgvector >= 0.7). The float32 `embedding` column stays
+-- as the source of truth and is only read to re-score the shortlisted candidates.
+--   halfvec: 16-bit floats, half the index memory, near-identical recall
+--   binary : 1 bit per dimension (32x smaller), needs a larger re-score window
 DROP INDEX IF EXISTS policy_chunks_embedding_ivfflat;
-CREATE INDEX policy_chunks_embedding_ivfflat
-  ON policy_chunks USING ivfflat (embedding vector_cosine_ops)
-  WITH (lists = 100);
+CREATE INDEX IF NOT EXISTS policy_chunks_embedding_halfvec_hnsw
+  ON policy_chunks USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops);
+CREATE INDEX IF NOT EXISTS policy_chunks_embedding_binary_hnsw
+  ON policy_chunks USING hnsw ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops);
 
 DROP FUNCTION IF EXISTS match_policy_chunks(vector, int, jsonb);
 DROP FUNCTION IF EXISTS match_policy_chunks(vector, int);
+DROP FUNCTION IF EXISTS match_policy_chunks(vector, int, int);
 
+-- Returns no embedding column: callers only need text, metadata and similarity.
 CREATE FUNCTION match_policy_chunks(
   query_embedding vector(1024),
-  match_count int
+  match_count int,
+  rescore_factor int DEFAULT 4
 ) RETURNS TABLE (
   id text,
   doc_id text,
   chunk_index int,
   content text,
   metadata jsonb,
-  embedding vector(1024)
-) LANGUAGE plpgsql AS $$
-BEGIN
-  RETURN QUERY
+  similarity float
+) LANGUAGE sql STABLE
+SET hnsw.ef_search = 400  -- let the ANN scan return the whole re-score window
+AS $$
+  WITH candidates AS (
+    SELECT pc.id
+    FROM policy_chunks AS pc
+    ORDER BY pc.embedding::halfvec(1024) <=> query_embedding::halfvec(1024)
+    LIMIT match_count * rescore_factor
+  )
   SELECT
     pc.id,
     pc.doc_id,
     pc.chunk_index,
     pc.content,
     pc.metadata,
-    pc.embedding
+    1 - (pc.embedding <=> query_embedding) AS similarity
   FROM policy_chunks AS pc
-  ORDER BY pc.embedding <-> query_embedding
+  JOIN candidates USING (id)
+  ORDER BY pc.embedding <=> query_embedding
   LIMIT match_count;
+$$;
+
+DROP FUNCTION IF EXISTS match_policy_chunks_binary(vector, int, int);
+
+-- Binary-quantized variant (SUPABASE_MATCH_FUNCTION=match_policy_chunks_binary).
+CREATE FUNCTION match_policy_chunks_binary(
+  query_embedding vector(1024),
+  match_count int,
+  rescore_factor int DEFAULT 10
+) RETURNS TABLE (
+  id text,
+  doc_id text,
+  chunk_index int,
+  content text,
+  metadata jsonb,
+  similarity float
+) LANGUAGE sql STABLE
+SET hnsw.ef_search = 400  -- let the ANN scan return the whole re-score window
+AS $$
+  WITH candidates AS (
+    SELECT pc.id
+    FROM policy_chunks AS pc
+    ORDER BY binary_quantize(pc.embedding)::bit(1024) <~> binary_quantize(query_embedding)
+    LIMIT match_count * rescore_factor
+  )
+  SELECT
+    pc.id,
+    pc.doc_id,
+    pc.chunk_index,
+    pc.content,
+    pc.metadata,
+    1 - (pc.embedding <=> query_embedding) AS similarity
+  FROM policy_chunks AS pc
+  JOIN candidates USING (id)
+  ORDER BY pc.embedding <=> query_embedding
+  LIMIT match_count;
+$$;
+
+-- ========================
+-- Embedding Index Versions (reindex + blue-green swap)
+-- ========================
+
+-- One row per embedding model version. Exactly one row is 'active'; the
+-- backend reads it to pick the chunk table / match function / query model.
+CREATE TABLE IF NOT EXISTS embedding_indexes (
+    version TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    dimension INT NOT NULL,
+    chunk_table TEXT NOT NULL,
+    match_function TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'building'
+        CHECK (status IN ('building', 'ready', 'active', 'retired', 'failed')),
+    total_chunks INT NOT NULL DEFAULT 0,
+    embedded_chunks INT NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    activated_at TIMESTAMP WITH TIME ZONE
+);
+-- Source rows updated after this were not yet copied into the version's table
+ALTER TABLE embedding_indexes ADD COLUMN IF NOT EXISTS synced_at TIMESTAMP WITH TIME ZONE;
+CREATE UNIQUE INDEX IF NOT EXISTS embedding_indexes_one_active
+  ON embedding_indexes ((status)) WHERE status = 'active';
+
+-- Create policy_chunks_<version> with a vector(<dimension>) column, its halfvec
+-- index and match_policy_chunks_<version> (same contract as match_policy_chunks).
+CREATE OR REPLACE FUNCTION create_embedding_shadow(p_version text, p_dimension int)
+RETURNS void LANGUAGE plpgsql SECURITY DEFINER AS $fn$
+DECLARE
+  v_table text := 'policy_chunks_' || p_version;
+  v_function text := 'match_policy_chunks_' || p_version;
+BEGIN
+  IF p_version !~ '^[a-z0-9_]+$' THEN
+    RAISE EXCEPTION 'invalid index version %', p_version;
+  END IF;
+
+  IF to_regclass(v_table) IS NULL THEN
+    EXECUTE format('CREATE TABLE %I (LIKE policy_chunks INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', v_table);
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN embedding TYPE vector(%s) USING NULL', v_table, p_dimension);
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id)', v_table);
+    EXECUTE format('ALTER TABLE %I ADD FOREIGN KEY (doc_id) REFERENCES policies(id) ON DELETE CASCADE', v_table);
+  END IF;
+  EXECUTE format('ALTER TABLE %I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()', v_table);
+  EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', v_table || '_touch', v_table);
+  EXECUTE format('CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION touch_policy_chunk()',
+                 v_table || '_touch', v_table);
+  EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I USING hnsw ((embedding::halfvec(%s)) halfvec_cosine_ops)',
+                 v_table || '_halfvec_hnsw', v_table, p_dimension);
+  EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I (doc_id)', v_table || '_doc', v_table);
+
+  EXECUTE format($sql$
+    CREATE OR REPLACE FUNCTION %I(query_embedding vector(%s), match_count int, rescore_factor int DEFAULT 4)
+    RETURNS TABLE (id text, doc_id text, chunk_index int, content text, metadata jsonb, similarity float)
+    LANGUAGE sql STABLE
+    SET hnsw.ef_search = 400
+    AS $body$
+      WITH candidates AS (
+        SELECT pc.id FROM %I AS pc
+        ORDER BY pc.embedding::halfvec(%s) <=> query_embedding::halfvec(%s)
+        LIMIT match_count * rescore_factor
+      )
+      SELECT pc.id, pc.doc_id, pc.chunk_index, pc.content, pc.metadata,
+             1 - (pc.embedding <=> query_embedding) AS similarity
+      FROM %I AS pc JOIN candidates USING (id)
+      ORDER BY pc.embedding <=> query_embedding
+      LIMIT match_count;
+    $body$
+  $sql$, v_function, p_dimension, v_table, p_dimension, p_dimension, v_table);
+
+  NOTIFY pgrst, 'reload schema';
+END;
+$fn$;
+
+-- Atomically make p_version the only active index.
+CREATE OR REPLACE FUNCTION activate_embedding_index(p_version text)
+RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM embedding_indexes WHERE version = p_version AND status IN ('ready', 'retired')) THEN
+    RAISE EXCEPTION 'embedding index % is not ready', p_version;
+  END IF;
+  UPDATE embedding_indexes SET status = 'retired', updated_at = NOW() WHERE status = 'active';
+  UPDATE embedding_indexes
+     SET status = 'active', activated_at = NOW(), updated_at = NOW()
+   WHERE version = p_version;
 END;
 $$;
 
+-- DDL and index swaps are admin-only (service role); PUBLIC can execute functions by default.
+REVOKE EXECUTE ON FUNCTION create_embedding_shadow(text, int) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION activate_embedding_index(text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION create_embedding_shadow(text, int) TO service_role;
+GRANT EXECUTE ON FUNCTION activate_embedding_index(text) TO service_role;
+
 -- ========================
 -- Community Helper Functions
 -- ========================
@@ -305,6 +487,7 @@ CREATE INDEX IF NOT EXISTS idx_comments_post ON comments(post_id);
 CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages(conversation_id);
 CREATE INDEX IF NOT EXISTS idx_conversations_user ON conversations(user_id);
 CREATE INDEX IF NOT EXISTS idx_policy_chunks_doc ON policy_chunks(doc_id);
+CREATE INDEX IF NOT EXISTS idx_policy_chunk_duplicates_canonical ON policy_chunk_duplicates(canonical_id);
 
 -- Success message
 SELECT 'BabyPolicy Database initialized successfully! 🎉' as status;
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
@@ -10,14 +12,32 @@ from .routers.community import router as community_router
 from .routers.user import router as user_router
 from .routers.calendar import router as calendar_router
 from .routers.policy import router as policy_router
+from .database import shutdown_database, startup_database
+from .pg_fastpath import shutdown_fastpath
+from .services.message_writer import shutdown_message_writer
+from .services.rag_system.transport import shutdown_openai_transports
 
 # Load environment variables from root .env
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pooled Supabase clients before serving requests
+    await startup_database()
+    yield
+    # Flush assistant messages still waiting in the write-behind queue
+    shutdown_message_writer()
+    # Close pooled OpenAI HTTP connections
+    shutdown_openai_transports()
+    await shutdown_database()
+    shutdown_fastpath()
+
+
 app = FastAPI(
     title="Baby Policy Chatbot API",
     description="Backend for the Baby Policy Chatbot",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Middleware
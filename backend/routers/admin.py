@@ -3,11 +3,12 @@ from supabase import Client
 from pydantic import BaseModel
 from typing import Optional
 
-from ..database import get_supabase
+from ..database import get_database_metrics, get_supabase
 from ..services import scraper_service
 from ..services.rag_system import get_chat_service
 from ..services.rag_system.ingest import ingest_pdf_files
-from ..auth.utils import get_current_user
+from ..services.rag_system.transport import openai_transport_metrics
+from ..auth.utils import get_current_admin, get_current_user
 
 router = APIRouter()
 
@@ -18,6 +19,11 @@ class ScraperRequest(BaseModel):
 class RagProcessRequest(BaseModel):
     policy_id: Optional[str] = None  # If None, process all unprocessed PDFs
 
+class ReindexRequest(BaseModel):
+    model: str
+    version: Optional[str] = None  # Defaults to a label derived from the model name
+    activate: bool = True  # Swap to the new index as soon as it is ready
+
 @router.post("/run-scraper", status_code=status.HTTP_202_ACCEPTED)
 def run_scraper_endpoint(
     request: ScraperRequest,
@@ -51,3 +57,72 @@ def process_rag_endpoint(
     results = ingest_pdf_files(supabase, chat_service, policy_id=request.policy_id)
     payload = [result.__dict__ for result in results]
     return {"message": "PDF ingestion completed.", "details": payload}
+
+@router.get("/metrics/openai")
+def openai_metrics_endpoint():
+    """
+    OpenAI transport metrics: request/retry/failure counts, queueing delay
+    spent waiting on the RPM/TPM limiter, and circuit breaker state.
+    """
+    return openai_transport_metrics()
+
+@router.get("/metrics/database")
+def database_metrics_endpoint():
+    """
+    Per-table Supabase query metrics (calls, errors, retries, avg/p95/max latency in ms).
+    RPC calls are reported as "rpc:<function>".
+    """
+    return get_database_metrics()
+
+@router.post("/reindex", status_code=status.HTTP_202_ACCEPTED)
+def reindex_endpoint(
+    request: ReindexRequest,
+    supabase: Client = Depends(get_supabase),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Re-embed all policy chunks with another embedding model into a versioned
+    shadow table in the background. The current index keeps serving until the
+    new one is ready and activated.
+    """
+    chat_service = get_chat_service(supabase=supabase)
+    try:
+        version = chat_service.reindex(
+            model=request.model, version=request.version, activate=request.activate
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return {"message": "Reindex started.", "version": version}
+
+@router.get("/reindex")
+def list_indexes_endpoint(supabase: Client = Depends(get_supabase)):
+    """
+    All embedding index versions with their status and progress.
+    """
+    return get_chat_service(supabase=supabase).index_status()
+
+@router.get("/reindex/{version}")
+def reindex_status_endpoint(version: str, supabase: Client = Depends(get_supabase)):
+    """
+    Progress of one index version (status, embedded_chunks / total_chunks, error).
+    """
+    row = get_chat_service(supabase=supabase).index_status(version)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Index version not found")
+    return row
+
+@router.post("/reindex/{version}/activate")
+def activate_index_endpoint(
+    version: str,
+    supabase: Client = Depends(get_supabase),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Atomically switch queries to a ready index version, or roll back to a retired one.
+    """
+    chat_service = get_chat_service(supabase=supabase)
+    try:
+        index = chat_service.activate_index(version)
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return {"message": "Index activated.", "version": index.version, "model": index.model}
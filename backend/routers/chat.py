@@ -8,7 +8,9 @@ from supabase import Client
 
 from .. import crud, schemas
 from ..database import get_supabase
-from ..services.rag_system import get_chat_service
+from ..services.rag_system import get_active_chunk_table, get_chat_service
+from ..services.rag_system.snippets import build_snippet
+from ..services.message_writer import get_message_writer
 from ..auth.utils import get_current_user
 
 router = APIRouter()
@@ -31,6 +33,18 @@ def chat_with_rag(
         if not conversation or conversation["user_id"] != user_id:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
+    chat_service = get_chat_service(supabase=supabase)
+    message_writer = get_message_writer(supabase)
+
+    # Load conversation history before saving the new user message.
+    # The last few turns are kept verbatim; older turns are folded into a summary
+    # cached on conversations.user_context, so the prompt stays within a token budget.
+    # Assistant replies still waiting in the write-behind queue are merged in.
+    conversation_history = chat_service.load_conversation_history(
+        conversation,
+        pending_messages=message_writer.pending_for(conversation_id)
+    )
+
     # Save user message
     crud.create_message(
         supabase=supabase,
@@ -39,22 +53,6 @@ def chat_with_rag(
         content=request.message
     )
 
-    # Retrieve recent conversation history for context (last 10 messages, excluding the just-added user message)
-    # This gives the AI context about previous exchanges in the conversation
-    recent_messages = crud.get_recent_conversation_messages(
-        supabase=supabase,
-        conversation_id=conversation_id,
-        limit=10
-    )
-
-    # Format conversation history for the chat service
-    # Exclude the last message (the one we just added) to avoid duplication
-    conversation_history = [
-        {"role": msg["role"], "content": msg["content"]}
-        for msg in recent_messages[:-1]  # Exclude the just-added user message
-    ] if len(recent_messages) > 1 else []
-
-    chat_service = get_chat_service(supabase=supabase)
     service_response = chat_service.answer(
         request.message,
         conversation_history=conversation_history,
@@ -66,15 +64,22 @@ def chat_with_rag(
     if "function_call" in service_response:
         print(f"[DEBUG] Function call detected: {service_response['function_call']}")
 
-    sources = [
-        schemas.RagSource(
+    sources = []
+    for source in service_response.get("sources", []):
+        rag_source = schemas.RagSource(
             chunk_id=source.get("id"),
             doc_id=source.get("source", ""),
             page=source.get("page"),
-            content=source.get("text", ""),
+            score=source.get("score"),
         )
-        for source in service_response.get("sources", [])
-    ]
+        if request.compact_sources:
+            # Compact mode: short snippet around the best-matching span only
+            snippet, highlights = build_snippet(source.get("text", ""), request.message)
+            rag_source.snippet = snippet
+            rag_source.highlights = [list(span) for span in highlights]
+        else:
+            rag_source.content = source.get("text", "")
+        sources.append(rag_source)
 
     # Handle function call if present
     function_call = None
@@ -94,13 +99,16 @@ def chat_with_rag(
         function_call=function_call
     )
 
-    # Save AI message
-    crud.create_message(
-        supabase=supabase,
+    # Save AI message via the write-behind queue (flushed in batches off the request path).
+    # rag_sources keeps only chunk references + scores; text is hydrated from policy_chunks on read.
+    message_writer.enqueue(
         conversation_id=conversation_id,
         role="assistant",
         content=rag_response.answer,
-        rag_sources=[source.dict() for source in rag_response.sources]
+        rag_sources=[
+            source.dict(include={"chunk_id", "doc_id", "page", "score"})
+            for source in rag_response.sources
+        ]
     )
 
     # Update conversation_id in the final response
@@ -140,7 +148,17 @@ def get_conversation_messages(
         raise HTTPException(status_code=403, detail="Access denied")
 
     messages = crud.get_conversation_messages(supabase=supabase, conversation_id=conversation_id)
-    return messages
+
+    # Include assistant replies that are queued but not yet flushed
+    stored_ids = {str(msg["id"]) for msg in messages}
+    pending = [
+        msg for msg in get_message_writer(supabase).pending_for(conversation_id)
+        if msg["id"] not in stored_ids
+    ]
+    messages.extend(pending)
+
+    chunk_table = get_active_chunk_table(supabase=supabase)
+    return crud.hydrate_rag_sources(supabase, messages, chunk_table=chunk_table)
 
 @router.delete("/conversations/{conversation_id}")
 def delete_conversation(
@@ -162,6 +180,7 @@ def delete_conversation(
         raise HTTPException(status_code=403, detail="Access denied")
 
     # Delete conversation (messages will be cascade deleted)
+    get_message_writer(supabase).discard(conversation_id)
     supabase.table("conversations").delete().eq("id", conversation_id).execute()
 
     return {"message": "Conversation deleted successfully"}
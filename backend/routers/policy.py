@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends
+import hashlib
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from supabase import Client
 
-from .. import crud
+from .. import crud, schemas
 from ..database import get_supabase
+from ..services.rag_system import get_active_chunk_table
 
 router = APIRouter()
 
+MAX_CHUNK_IDS = 100
+
 @router.get("/policies")
 def get_policies(
     limit: int = 5,
@@ -13,3 +20,48 @@ def get_policies(
 ):
     """Get policies for banner display."""
     return crud.get_policies(supabase, limit=limit)
+
+@router.get("/chunks", response_model=List[schemas.PolicyChunkText])
+def get_chunks(
+    request: Request,
+    response: Response,
+    ids: List[str] = Query(..., description="Chunk ids, comma-separated or repeated"),
+    supabase: Client = Depends(get_supabase)
+):
+    """
+    Batched full-text lookup for chat sources returned in compact mode.
+    Responses carry an ETag so expanding the same sources again is a 304.
+    Chunk ids are positional and re-ingest rewrites their content, so the ETag is
+    hashed from the fetched rows: a 304 saves the response body, not the query.
+    """
+    chunk_ids = list(dict.fromkeys(
+        chunk_id.strip() for value in ids for chunk_id in value.split(",") if chunk_id.strip()
+    ))
+    if not chunk_ids:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(chunk_ids) > MAX_CHUNK_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CHUNK_IDS} ids per request")
+
+    chunk_table = get_active_chunk_table(supabase=supabase)
+    rows = crud.get_policy_chunks_by_ids(supabase, chunk_ids, chunk_table=chunk_table)
+    chunks = [
+        {
+            "id": row["id"],
+            "doc_id": row["doc_id"],
+            "chunk_index": row.get("chunk_index", 0),
+            "page": (row.get("metadata") or {}).get("page"),
+            "content": row.get("content") or "",
+        }
+        for row in rows
+    ]
+
+    digest = hashlib.sha256(json.dumps(chunks, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    etag = f'"{digest[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return chunks
@@ -80,6 +80,13 @@ class PolicyChunk(PolicyChunkBase):
     class Config:
         orm_mode = True
 
+class PolicyChunkText(BaseModel):
+    id: str
+    doc_id: str
+    chunk_index: int
+    page: Optional[int] = None
+    content: str
+
 # ========================
 # Community Schemas
 # ========================
@@ -146,12 +153,18 @@ class FunctionCall(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[uuid.UUID] = None
+    # Return short highlighted snippets instead of full chunk text;
+    # full text is fetched lazily via GET /api/chunks?ids=...
+    compact_sources: bool = False
 
 class RagSource(BaseModel):
     chunk_id: Optional[str] = None
     doc_id: str
     page: Optional[int] = None
-    content: str
+    score: Optional[float] = None
+    content: Optional[str] = None
+    snippet: Optional[str] = None
+    highlights: Optional[List[List[int]]] = None
 
 class ChatResponse(BaseModel):
     answer: str
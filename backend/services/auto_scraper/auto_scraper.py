@@ -33,6 +33,8 @@ ver1.3 기능 유지:
 
 사용법:
     python auto_scraper.py
+    python auto_scraper.py "게시판 URL" --workers 4   # ver1.5: 병렬 워커 모드
+    python auto_scraper.py --export-logs               # ver1.5: 로그를 구버전 JSON으로 내보내기
 """
 
 import os
@@ -45,6 +47,11 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+USAGE = """사용법:
+    python auto_scraper.py
+    python auto_scraper.py "게시판 URL" --workers 4
+    python auto_scraper.py --export-logs"""
+
 # Windows 콘솔 UTF-8 인코딩 설정 (이모지 출력 지원)
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -61,6 +68,8 @@ from pdf_detector import (
     get_learned_strategies_stats  # ver1.3.1: 학습 통계 조회
 )
 
+from dedupe_index import get_dedupe_index  # ver1.5: 메모리 중복 인덱스
+
 # ver1.2: DB 사용
 if USE_DATABASE:
     try:
@@ -79,271 +88,277 @@ if USE_DATABASE:
 # 게시판 링크 추출 (ver1.1 안정적 방식)
 # ============================================
 
-def is_navigation_or_tab_element(element):
+# ver1.5: 목록 페이지의 후보 요소를 한 번의 execute_script로 수집
+# (요소마다 get_attribute/text/부모 탐색을 따로 호출하지 않음)
+# 순서는 기존과 동일: 모든 <a> 다음 모든 [onclick] 요소
+_BOARD_CANDIDATES_SCRIPT = """
+var sources = ['a', '[onclick]'];
+var result = [];
+sources.forEach(function (selector) {
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length; i++) {
+        var el = nodes[i];
+        // WebElement.text와 같이 화면에 보이지 않는 요소는 텍스트 없음으로 처리
+        var fullText = el.getClientRects().length ? (el.innerText || '').trim() : '';
+        if (!fullText) continue;
+
+        var tag = el.tagName.toLowerCase();
+        var text = fullText;
+        if (tag === 'tr') {
+            var cells = el.querySelectorAll('td');
+            if (cells.length >= 2) text = (cells[1].innerText || '').trim();
+        }
+        if (!text) continue;
+
+        var parent = el.parentElement;
+        var row = parent ? parent.closest('tr') : null;
+        result.push({
+            selector: selector,
+            index: i,
+            tag: tag,
+            text: text,
+            full_text: fullText,
+            href: typeof el.href === 'string' ? el.href : el.getAttribute('href'),
+            onclick: el.getAttribute('onclick'),
+            title: el.getAttribute('title'),
+            class_name: el.getAttribute('class'),
+            parent_class: parent ? parent.getAttribute('class') : null,
+            row_td_count: row ? row.querySelectorAll('td').length : 0,
+            y: el.getBoundingClientRect().top + window.pageYOffset
+        });
+    }
+});
+return result;
+"""
+
+_LOCATE_CANDIDATE_SCRIPT = "return document.querySelectorAll(arguments[0])[arguments[1]] || null;"
+
+# ver1.5: 페이지별 추출 결과 캐시 {cache_key: [link, ...]}
+_board_links_cache = {}
+
+
+def is_navigation_or_tab_element(candidate):
     """
     ver1.4.1: 탭 메뉴나 네비게이션 요소 필터링
+    ver1.5: WebElement 대신 한 번에 수집한 후보 정보(dict)로 판단
 
     Args:
-        element: WebElement 객체
+        candidate: _BOARD_CANDIDATES_SCRIPT가 반환한 후보 정보
 
     Returns:
         bool: True면 탭/네비게이션 요소 (제외), False면 게시글 링크
     """
-    try:
-        # 1. 클래스명 체크
-        class_name = element.get_attribute('class') or ''
-        class_lower = class_name.lower()
-
-        # 탭/네비게이션 클래스 패턴
-        nav_class_patterns = [
-            'tab', 'nav', 'menu', 'header', 'gnb', 'lnb',
-            'breadcrumb', 'pagination', 'paging', 'pageindexer'
-        ]
-
-        if any(pattern in class_lower for pattern in nav_class_patterns):
-            debug_log(f"탭/네비게이션 제외 (클래스): {class_name}", 'VERBOSE')
-            return True
-
-        # 2. 텍스트 패턴 체크
-        text = element.text.strip()
+    # 1. 클래스명 체크
+    class_name = candidate.get('class_name') or ''
+    class_lower = class_name.lower()
+
+    # 탭/네비게이션 클래스 패턴
+    nav_class_patterns = [
+        'tab', 'nav', 'menu', 'header', 'gnb', 'lnb',
+        'breadcrumb', 'pagination', 'paging', 'pageindexer'
+    ]
+
+    if any(pattern in class_lower for pattern in nav_class_patterns):
+        debug_log(f"탭/네비게이션 제외 (클래스): {class_name}", 'VERBOSE')
+        return True
 
-        # 탭 메뉴 텍스트 패턴 (한글/영문)
-        tab_text_patterns = [
-            '공고문', '임대가이드', '청약연습', '가이드', '연습',
-            'tab', 'guide', 'practice', 'manual', 'tutorial',
-            '이전', '다음', '처음', '마지막',  # 페이징
-            'prev', 'next', 'first', 'last'
-        ]
+    # 2. 텍스트 패턴 체크
+    text = candidate.get('full_text') or ''
 
-        text_lower = text.lower()
-        if any(pattern in text_lower for pattern in tab_text_patterns):
-            debug_log(f"탭 메뉴 제외 (텍스트): {text}", 'VERBOSE')
-            return True
+    # 탭 메뉴 텍스트 패턴 (한글/영문)
+    tab_text_patterns = [
+        '공고문', '임대가이드', '청약연습', '가이드', '연습',
+        'tab', 'guide', 'practice', 'manual', 'tutorial',
+        '이전', '다음', '처음', '마지막',  # 페이징
+        'prev', 'next', 'first', 'last'
+    ]
 
-        # 3. 부모 요소 체크 (탭 컨테이너 안에 있는지)
-        try:
-            parent = element.find_element(By.XPATH, '..')
-            parent_class = (parent.get_attribute('class') or '').lower()
+    text_lower = text.lower()
+    if any(pattern in text_lower for pattern in tab_text_patterns):
+        debug_log(f"탭 메뉴 제외 (텍스트): {text}", 'VERBOSE')
+        return True
 
-            if any(pattern in parent_class for pattern in nav_class_patterns):
-                debug_log(f"탭 컨테이너 내부 요소 제외: {text}", 'VERBOSE')
-                return True
-        except:
-            pass
+    # 3. 부모 요소 체크 (탭 컨테이너 안에 있는지)
+    parent_class = (candidate.get('parent_class') or '').lower()
+    if any(pattern in parent_class for pattern in nav_class_patterns):
+        debug_log(f"탭 컨테이너 내부 요소 제외: {text}", 'VERBOSE')
+        return True
 
-        # 4. 위치 기반 필터 (상단 고정 영역)
-        try:
-            # Y 좌표가 200px 이하이고 텍스트가 짧으면 상단 메뉴일 가능성
-            location = element.location
-            if location['y'] < 200 and len(text) < 15:
-                # 추가 검증: href가 게시판 패턴이 아니면 탭으로 간주
-                href = element.get_attribute('href') or ''
-                is_board_pattern = any(pattern in href.lower() for pattern in BOARD_LINK_PATTERNS)
-
-                if not is_board_pattern:
-                    debug_log(f"상단 영역 제외: {text} (y={location['y']})", 'VERBOSE')
-                    return True
-        except:
-            pass
+    # 4. 위치 기반 필터 (상단 고정 영역)
+    # Y 좌표가 200px 이하이고 텍스트가 짧으면 상단 메뉴일 가능성
+    y = candidate.get('y') or 0
+    if y < 200 and len(text) < 15:
+        # 추가 검증: href가 게시판 패턴이 아니면 탭으로 간주
+        href = candidate.get('href') or ''
+        is_board_pattern = any(pattern in href.lower() for pattern in BOARD_LINK_PATTERNS)
 
-        return False
+        if not is_board_pattern:
+            debug_log(f"상단 영역 제외: {text} (y={y:.0f})", 'VERBOSE')
+            return True
 
-    except Exception as e:
-        debug_log(f"탭 필터링 오류", 'WARNING', e)
-        return False  # 오류 시 게시글로 간주
+    return False
 
 
-def is_valid_article_link(element, text):
+def is_valid_article_link(candidate, text):
     """
     ver1.4.1: 게시글 링크 품질 검증
     ver1.4.2: LH 사이트 대응 추가
+    ver1.5: WebElement 대신 한 번에 수집한 후보 정보(dict)로 판단
 
     Args:
-        element: WebElement 객체
+        candidate: _BOARD_CANDIDATES_SCRIPT가 반환한 후보 정보
         text: 링크 텍스트
 
     Returns:
         bool: True면 유효한 게시글 링크
     """
-    try:
-        # 🆕 LH 사이트 전용: .wrtancInfoBtn 클래스는 무조건 통과
-        element_class = (element.get_attribute('class') or '').lower()
-        if 'wrtancinfobtn' in element_class:
-            debug_log(f"LH 게시글 링크 감지: {text[:50]}", 'VERBOSE')
-            return True
-
-        # 1. 텍스트 길이 검증 (너무 짧으면 탭명일 가능성)
-        if len(text) < 8:  # 최소 8자 이상
-            debug_log(f"텍스트 너무 짧음 제외: {text}", 'VERBOSE')
-            return False
+    # 🆕 LH 사이트 전용: .wrtancInfoBtn 클래스는 무조건 통과
+    element_class = (candidate.get('class_name') or '').lower()
+    if 'wrtancinfobtn' in element_class:
+        debug_log(f"LH 게시글 링크 감지: {text[:50]}", 'VERBOSE')
+        return True
 
-        # 2. URL 패턴 검증
-        href = element.get_attribute('href') or ''
+    # 1. 텍스트 길이 검증 (너무 짧으면 탭명일 가능성)
+    if len(text) < 8:  # 최소 8자 이상
+        debug_log(f"텍스트 너무 짧음 제외: {text}", 'VERBOSE')
+        return False
 
-        # 게시글 ID 파라미터 체크 (board_id, no, idx, seq 등)
-        article_id_patterns = ['no=', 'idx=', 'seq=', 'id=', 'num=', 'board_id=', 'article']
-        has_article_id = any(pattern in href.lower() for pattern in article_id_patterns)
+    # 2. URL 패턴 검증
+    href = candidate.get('href') or ''
 
-        # onclick도 체크
-        onclick = element.get_attribute('onclick') or ''
-        has_onclick_article = any(pattern in onclick.lower() for pattern in ['view', 'detail', 'show'])
+    # 게시글 ID 파라미터 체크 (board_id, no, idx, seq 등)
+    article_id_patterns = ['no=', 'idx=', 'seq=', 'id=', 'num=', 'board_id=', 'article']
+    has_article_id = any(pattern in href.lower() for pattern in article_id_patterns)
 
-        if not (has_article_id or has_onclick_article):
-            # href와 onclick 둘 다 게시글 패턴이 없으면 의심
-            if href and href != '#':
-                debug_log(f"게시글 패턴 없음 제외: {text[:30]}", 'VERBOSE')
-                return False
+    # onclick도 체크
+    onclick = candidate.get('onclick') or ''
+    has_onclick_article = any(pattern in onclick.lower() for pattern in ['view', 'detail', 'show'])
 
-        # 3. 게시글 특성 요소 확인 (날짜, 조회수 등이 포함된 행)
-        try:
-            # 부모 <tr>에서 <td> 개수 확인
-            parent_tr = element.find_element(By.XPATH, './ancestor::tr[1]')
-            tds = parent_tr.find_elements(By.TAG_NAME, 'td')
-
-            # 일반적으로 게시판은 3개 이상의 td (번호, 제목, 날짜 등)
-            if len(tds) >= 3:
-                debug_log(f"게시판 행 구조 확인: {text[:30]} (td={len(tds)})", 'VERBOSE')
-                return True
-        except:
-            pass
+    if not (has_article_id or has_onclick_article):
+        # href와 onclick 둘 다 게시글 패턴이 없으면 의심
+        if href and href != '#':
+            debug_log(f"게시글 패턴 없음 제외: {text[:30]}", 'VERBOSE')
+            return False
 
-        # 4. 모든 검증 통과
+    # 3. 게시글 특성 요소 확인 (날짜, 조회수 등이 포함된 행)
+    # 일반적으로 게시판은 3개 이상의 td (번호, 제목, 날짜 등)
+    if candidate.get('row_td_count', 0) >= 3:
+        debug_log(f"게시판 행 구조 확인: {text[:30]} (td={candidate['row_td_count']})", 'VERBOSE')
         return True
 
-    except Exception as e:
-        debug_log(f"게시글 검증 오류", 'WARNING', e)
-        return True  # 오류 시 게시글로 간주
+    # 4. 모든 검증 통과
+    return True
 
 
-def extract_board_links(driver):
+def extract_board_links(driver, cache_key=None):
     """
     게시판 페이지에서 게시글 링크 자동 추출
     ver1.4.1: 탭/네비게이션 필터링 강화
+    ver1.5: 후보 정보를 execute_script 한 번으로 수집하고 Python에서 필터링,
+            cache_key가 같으면 다시 추출하지 않음 (WebElement는 저장하지 않으므로 stale 문제 없음)
 
     Args:
         driver: WebDriver 객체
+        cache_key: 페이지 식별 키 (예: (목록 URL, 페이지 번호)), None이면 항상 새로 추출
 
     Returns:
-        list: [{"url": "...", "title": "...", "element": WebElement}, ...]
+        list: [{"url": "...", "title": "...", "is_javascript": bool, "locator": {...}}, ...]
+              JavaScript 링크의 요소는 resolve_link_element()로 찾음
     """
-    debug_log("게시글 링크 추출 시작 (ver1.4.1 - 탭 필터링 강화)", 'INFO')
+    if cache_key is not None and cache_key in _board_links_cache:
+        debug_log(f"게시글 링크 캐시 사용 ({len(_board_links_cache[cache_key])}개)", 'DEBUG')
+        return _board_links_cache[cache_key]
 
-    # ✅ 1. <a> 태그 검색
-    all_links = driver.find_elements(By.TAG_NAME, "a")
-    debug_log(f"<a> 태그 수: {len(all_links)}", 'DEBUG')
+    debug_log("게시글 링크 추출 시작 (ver1.5 - 일괄 추출)", 'INFO')
 
-    # ✅ 2. onclick 속성이 있는 모든 요소 검색 (tr, div, span 등)
-    all_onclick_elements = driver.find_elements(By.XPATH, "//*[@onclick]")
-    debug_log(f"onclick 요소 수: {len(all_onclick_elements)}", 'DEBUG')
-
-    # 합치기
-    all_elements = all_links + all_onclick_elements
-    debug_log(f"총 검사 대상: {len(all_elements)}개", 'DEBUG')
+    # ✅ 1. <a> 태그 + onclick 속성 요소를 한 번에 수집
+    candidates = driver.execute_script(_BOARD_CANDIDATES_SCRIPT) or []
+    debug_log(f"총 검사 대상: {len(candidates)}개 (텍스트 있는 요소)", 'DEBUG')
 
     article_links = []
     filtered_count = {'tab': 0, 'invalid': 0, 'safe': 0, 'text_length': 0, 'exclude_pattern': 0}
 
-    for element in all_elements:
-        try:
-            href = element.get_attribute('href')
-            onclick = element.get_attribute('onclick')
-            tag_name = element.tag_name.lower()
-
-            # ✅ 텍스트 추출 (요소 타입에 따라 다르게)
-            if tag_name == 'tr':
-                # <tr> 태그인 경우: td들에서 제목 찾기
-                try:
-                    tds = element.find_elements(By.TAG_NAME, 'td')
-                    if len(tds) >= 2:
-                        text = tds[1].text.strip()
-                    else:
-                        text = element.text.strip()
-                except:
-                    text = element.text.strip()
-            else:
-                text = element.text.strip()
+    for candidate in candidates:
+        text = candidate['text']
+        href = candidate.get('href')
+        onclick = candidate.get('onclick')
+        tag_name = candidate['tag']
+        locator = {'selector': candidate['selector'], 'index': candidate['index']}
+
+        # 1. 안전성 검증
+        if not is_safe_attributes(href, candidate.get('title'), candidate['full_text'],
+                                  onclick, candidate.get('class_name')):
+            filtered_count['safe'] += 1
+            continue
 
-            # 텍스트가 없으면 건너뛰기
-            if not text:
-                continue
+        # 2. ver1.4.1: 탭/네비게이션 필터링
+        if is_navigation_or_tab_element(candidate):
+            filtered_count['tab'] += 1
+            continue
 
-            # 1. 안전성 검증
-            if not is_safe_element(element):
-                filtered_count['safe'] += 1
+        # 3. ver1.4.1: 개인정보 보호 - 이메일 주소 포함 여부 체크
+        if ENABLE_PRIVACY_PROTECTION and BLOCK_EMAIL_COLLECTION:
+            has_personal, info_types = contains_personal_info(text)
+            if has_personal:
+                debug_log(f"🔒 개인정보 포함 링크 제외: {sanitize_for_logging(text)}", 'WARNING')
+                filtered_count['exclude_pattern'] += 1
                 continue
 
-            # 2. ver1.4.1: 탭/네비게이션 필터링
-            if is_navigation_or_tab_element(element):
-                filtered_count['tab'] += 1
-                continue
+        # 4. 텍스트 길이 필터
+        if len(text) < MIN_LINK_TEXT_LENGTH or len(text) > MAX_LINK_TEXT_LENGTH:
+            filtered_count['text_length'] += 1
+            continue
 
-            # 3. ver1.4.1: 개인정보 보호 - 이메일 주소 포함 여부 체크
-            if ENABLE_PRIVACY_PROTECTION and BLOCK_EMAIL_COLLECTION:
-                has_personal, info_types = contains_personal_info(text)
-                if has_personal:
-                    debug_log(f"🔒 개인정보 포함 링크 제외: {sanitize_for_logging(text)}", 'WARNING')
-                    filtered_count['exclude_pattern'] += 1
-                    continue
-
-            # 4. 텍스트 길이 필터
-            if len(text) < MIN_LINK_TEXT_LENGTH or len(text) > MAX_LINK_TEXT_LENGTH:
-                filtered_count['text_length'] += 1
-                continue
+        # 5. 제외 패턴 확인
+        if any(exclude_text in text.lower() for exclude_text in EXCLUDE_LINK_TEXTS):
+            filtered_count['exclude_pattern'] += 1
+            continue
 
-            # 5. 제외 패턴 확인
-            if any(exclude_text in text.lower() for exclude_text in EXCLUDE_LINK_TEXTS):
-                filtered_count['exclude_pattern'] += 1
-                continue
+        # 6. ver1.4.1: 게시글 링크 품질 검증
+        if not is_valid_article_link(candidate, text):
+            filtered_count['invalid'] += 1
+            continue
 
-            # 6. ver1.4.1: 게시글 링크 품질 검증
-            if not is_valid_article_link(element, text):
-                filtered_count['invalid'] += 1
-                continue
+        # 🆕 LH 사이트 전용: .wrtancInfoBtn 클래스 처리
+        element_class = (candidate.get('class_name') or '').lower()
+        if 'wrtancinfobtn' in element_class:
+            article_links.append({
+                'url': None,
+                'title': text,
+                'is_javascript': True,
+                'locator': locator
+            })
+            debug_log(f"LH JavaScript 링크 추가: {text[:50]}", 'VERBOSE')
+            continue
 
-            # 🆕 LH 사이트 전용: .wrtancInfoBtn 클래스 처리
-            element_class = (element.get_attribute('class') or '').lower()
-            if 'wrtancinfobtn' in element_class:
+        # ✅ 6. JavaScript 링크 체크 (onclick 속성)
+        if onclick:
+            onclick_lower = onclick.lower()
+            js_patterns = ['view', 'detail', 'show', 'read', 'open', 'go', 'move']
+
+            if any(pattern in onclick_lower for pattern in js_patterns):
                 article_links.append({
                     'url': None,
                     'title': text,
-                    'element': element,
-                    'is_javascript': True
+                    'is_javascript': True,
+                    'locator': locator
                 })
-                debug_log(f"LH JavaScript 링크 추가: {text[:50]}", 'VERBOSE')
+                debug_log(f"JavaScript 링크 발견 ({tag_name}): {text[:50]} (onclick={onclick[:50]})", 'VERBOSE')
                 continue
 
-            # ✅ 6. JavaScript 링크 체크 (onclick 속성)
-            if onclick:
-                onclick_lower = onclick.lower()
-                js_patterns = ['view', 'detail', 'show', 'read', 'open', 'go', 'move']
+        # 7. 일반 URL 링크 체크
+        if href and href != '#':
+            href_lower = href.lower()
+            is_board_link = any(pattern in href_lower for pattern in BOARD_LINK_PATTERNS)
 
-                if any(pattern in onclick_lower for pattern in js_patterns):
-                    article_links.append({
-                        'url': None,
-                        'title': text,
-                        'element': element,
-                        'is_javascript': True
-                    })
-                    debug_log(f"JavaScript 링크 발견 ({tag_name}): {text[:50]} (onclick={onclick[:50]})", 'VERBOSE')
-                    continue
-
-            # 7. 일반 URL 링크 체크
-            if href and href != '#':
-                href_lower = href.lower()
-                is_board_link = any(pattern in href_lower for pattern in BOARD_LINK_PATTERNS)
-
-                if is_board_link:
-                    article_links.append({
-                        'url': href,
-                        'title': text,
-                        'element': element,
-                        'is_javascript': False
-                    })
-                    debug_log(f"일반 링크 발견: {text[:50]}", 'VERBOSE')
-
-        except Exception as e:
-            debug_log(f"링크 분석 오류", 'WARNING', e)
-            continue
+            if is_board_link:
+                article_links.append({
+                    'url': href,
+                    'title': text,
+                    'is_javascript': False,
+                    'locator': locator
+                })
+                debug_log(f"일반 링크 발견: {text[:50]}", 'VERBOSE')
 
     # 중복 제거
     unique_links = []
@@ -368,9 +383,44 @@ def extract_board_links(driver):
               f"제외패턴={filtered_count['exclude_pattern']}", 'INFO')
     debug_log(f"✅ 총 {len(unique_links)}개 게시글 링크 추출 완료 (JavaScript: {js_count}개, 일반: {url_count}개)", 'INFO')
 
+    if cache_key is not None:
+        _board_links_cache.clear()  # 이전 페이지 결과는 다시 쓰지 않음
+        _board_links_cache[cache_key] = unique_links
+
     return unique_links
 
 
+def resolve_link_element(driver, link_info):
+    """
+    ver1.5: 추출 시 기록한 위치로 현재 페이지에서 링크 요소 찾기 (execute_script 1회)
+
+    DOM이 바뀌어 위치의 텍스트가 제목과 다르면 새로 추출해 제목으로 다시 찾습니다.
+
+    Args:
+        driver: WebDriver 객체
+        link_info: extract_board_links()가 반환한 링크 정보
+
+    Returns:
+        WebElement
+
+    Raises:
+        Exception: 요소를 찾을 수 없는 경우
+    """
+    locator = link_info.get('locator')
+    if locator:
+        element = driver.execute_script(_LOCATE_CANDIDATE_SCRIPT, locator['selector'], locator['index'])
+        if element is not None and link_info['title'] in element.text:
+            return element
+
+    debug_log(f"링크 위치 변경, 다시 추출: {link_info['title'][:30]}", 'DEBUG')
+    for link in extract_board_links(driver):
+        if link['title'] == link_info['title']:
+            locator = link['locator']
+            return driver.execute_script(_LOCATE_CANDIDATE_SCRIPT, locator['selector'], locator['index'])
+
+    raise Exception(f"게시글 링크 요소를 찾을 수 없습니다: {link_info['title'][:30]}")
+
+
 # ============================================
 # 게시글 처리
 # ============================================
@@ -395,7 +445,7 @@ def process_article(driver, wait, link_info, download_dir):
 
         # ✅ JavaScript 링크 처리
         if is_javascript:
-            element = link_info['element']
+            element = resolve_link_element(driver, link_info)  # ver1.5: 위치 정보로 요소 찾기
             debug_log(f"JavaScript 링크 클릭: {article_title[:50]}", 'DEBUG')
 
             try:
@@ -406,6 +456,7 @@ def process_article(driver, wait, link_info, download_dir):
                 driver.execute_script("arguments[0].click();", element)
                 debug_log("JavaScript 클릭 성공", 'DEBUG')
 
+            wait_for_navigation(driver, element)
             wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
             article_url = driver.current_url
 
@@ -547,8 +598,8 @@ def navigate_to_next_page(driver, current_page):
 
         debug_log(f"다음 페이지로 이동 중... (방법: {next_info['method']})", 'INFO')
 
-        # 페이지 로딩 대기
-        time.sleep(2)
+        # 페이지 로딩 대기 (ver1.5: 고정 2초 대신 이전 페이지가 사라지는 시점 감지)
+        wait_for_navigation(driver, element)
         wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
 
         debug_log(f"✅ 페이지 {next_info['page']} 이동 완료", 'INFO')
@@ -566,7 +617,6 @@ def navigate_to_next_page(driver, current_page):
 
 def log_progress(page, article_idx, total, status):
     """간결한 진행 로그 (ver1.4)"""
-    from datetime import datetime
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] P{page} {article_idx}/{total} | {status}")
 
@@ -578,9 +628,7 @@ def display_page_summary(page, success_count, skipped_count, no_pdf_count, error
     print(f"   ✅ 성공: {success_count}개 | ⏭️ 건너뜀: {skipped_count}개 | ⚠️ PDF없음: {no_pdf_count}개 | ❌ 실패: {error_count}개")
 
     # 전체 진행 상황
-    download_log = load_download_log()
-    total_downloaded = download_log['total_downloaded']
-    print(f"💾 전체 진행: {total_downloaded}개 다운로드 완료")
+    print(f"💾 전체 진행: {get_download_count()}개 다운로드 완료")
     print(f"{'='*60}\n")
 
 
@@ -651,8 +699,10 @@ def run_scraper(board_url, download_dir, resume_from=None):
                 driver.get(current_url)
                 wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
 
-                # 게시글 개수 파악 (첫 추출)
-                article_links = extract_board_links(driver)
+                # 게시글 개수 파악 (첫 추출, ver1.5: 이 페이지의 결과를 캐시)
+                page_cache_key = (current_url, current_page)
+                _board_links_cache.pop(page_cache_key, None)
+                article_links = extract_board_links(driver, cache_key=page_cache_key)
 
                 if not article_links:
                     print("⚠️ 게시글을 찾을 수 없습니다.")
@@ -694,8 +744,8 @@ def run_scraper(board_url, download_dir, resume_from=None):
                         print(f"  ⏭️ [{idx + 1}/{total_articles}] 건너뜀 (이미 처리됨)")
                         continue
 
-                    # ✅ 매번 게시판 링크 다시 추출 (stale element 방지)
-                    article_links = extract_board_links(driver)
+                    # ver1.5: 캐시된 목록 사용 (요소는 클릭할 때 위치로 다시 찾으므로 stale 문제 없음)
+                    article_links = extract_board_links(driver, cache_key=page_cache_key)
 
                     if idx >= len(article_links):
                         debug_log(f"게시글 {idx + 1}번을 찾을 수 없음 (총 {len(article_links)}개)", 'WARNING')
@@ -827,13 +877,18 @@ def run_scraper(board_url, download_dir, resume_from=None):
                         page_error += 1
                         total_error += 1
 
-                    # Checkpoint 저장
-                    download_log = load_download_log()
+                    # ver1.5: 처리된 게시물 기록 (연결 재사용 + 일괄 커밋)
+                    if USE_DATABASE and TRACK_PROCESSED_ARTICLES and article_url != 'N/A':
+                        mark_article_processed(article_url, article_title, result['status'],
+                                               pdf_count=len(downloads))
+                        get_dedupe_index().add_article(article_url, result['status'])
+
+                    # Checkpoint 저장 (ver1.5: 로그 파일 대신 메모리 카운터 사용)
                     save_checkpoint(
                         page=current_page,
                         article_index=idx,
                         board_url=current_url,
-                        total_downloaded=download_log['total_downloaded']
+                        total_downloaded=get_download_count()
                     )
 
                     # ✅ 게시판 목록으로 복귀 (안정성 강화)
@@ -841,7 +896,6 @@ def run_scraper(board_url, download_dir, resume_from=None):
                         debug_log(f"게시판 복귀: {current_url}", 'DEBUG')
                         driver.get(current_url)
                         wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
-                        time.sleep(1)
 
                         # 게시판 페이지가 맞는지 확인
                         if "list" not in driver.current_url.lower() and "board" not in driver.current_url.lower():
@@ -853,13 +907,13 @@ def run_scraper(board_url, download_dir, resume_from=None):
                         debug_log("게시판 복귀 중 오류, 재시도", 'WARNING', e)
                         driver.get(current_url)
                         wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
-                        time.sleep(1)
 
-                    # 브라우저 주기적 재시작
+                    # 브라우저 재시작 (ver1.5: 메모리 한도 기준)
                     processed_count += 1
-                    if processed_count % BROWSER_RESTART_INTERVAL == 0:
+                    if should_restart_browser(driver, processed_count):
                         print(f"\n  🔄 브라우저 재시작 중... ({processed_count}개 처리 완료)")
                         driver = restart_browser(driver, download_dir)
+                        processed_count = 0
                         wait = WebDriverWait(driver, TIMEOUT['element_wait'])
                         driver.get(current_url)
                         wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
@@ -917,6 +971,10 @@ def run_scraper(board_url, download_dir, resume_from=None):
         # 최종 통계
         display_final_summary(start_time, total_pages_processed, total_success, total_skipped, total_no_pdf, total_error)
 
+        # ver1.5: 사이트별 대기 시간
+        display_wait_stats()
+        save_wait_stats()
+
 
 # ============================================
 # 메인 함수
@@ -925,8 +983,28 @@ def run_scraper(board_url, download_dir, resume_from=None):
 def main():
     """메인 함수"""
     # 커맨드라인 인자 확인
-    auto_mode = len(sys.argv) > 1
-    auto_url = sys.argv[1] if auto_mode else None
+    # ver1.5: --workers N 옵션 (병렬 워커 수)
+    args = sys.argv[1:]
+    num_workers = PARALLEL_WORKERS
+    if '--workers' in args:
+        option_index = args.index('--workers')
+        value = args[option_index + 1] if option_index + 1 < len(args) else ''
+        if not value.isdigit() or int(value) < 1:
+            print("❌ --workers 뒤에는 1 이상의 워커 수가 필요합니다.")
+            print(USAGE)
+            sys.exit(2)
+        num_workers = int(value)
+        del args[option_index:option_index + 2]
+
+    # ver1.5: JSON Lines 로그를 구버전 JSON 형식으로 내보내기
+    if '--export-logs' in args:
+        exported = export_logs_to_json()
+        print(f"📝 로그 내보내기 완료: 다운로드 {exported['downloads']}건 → {LEGACY_DOWNLOAD_LOG_FILE}")
+        print(f"   실패 {exported['failures']}건 → {LEGACY_FAILED_LOG_FILE}")
+        return
+
+    auto_mode = len(args) > 0
+    auto_url = args[0] if auto_mode else None
 
     print(f"\n{'='*70}")
     print(f"범용 PDF 자동 스크래퍼 ver1.4.1")
@@ -997,7 +1075,7 @@ def main():
 
     # ver1.2: JSON → DB 마이그레이션
     if USE_DATABASE:
-        json_log = DOWNLOAD_LOG_FILE
+        json_log = LEGACY_DOWNLOAD_LOG_FILE
         if os.path.exists(json_log):
             print(f"💾 기존 JSON 로그를 DB로 마이그레이션 중...")
             count = migrate_from_json(json_log)
@@ -1067,7 +1145,12 @@ def main():
     print(f"\n🚀 스크래핑 시작...\n")
 
     # 스크래퍼 실행
-    run_scraper(board_url, download_dir)
+    if num_workers > 1:
+        # ver1.5: 병렬 워커 모드 (체크포인트 대신 DB 게시글 추적으로 재개)
+        from worker_pool import run_parallel_scraper
+        run_parallel_scraper(board_url, download_dir, num_workers=num_workers)
+    else:
+        run_scraper(board_url, download_dir)
 
     print("\n👋 프로그램을 종료합니다.\n")
 
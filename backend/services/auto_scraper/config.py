@@ -33,8 +33,11 @@ DOWNLOAD_DIR = os.path.join(DATA_DIR, 'pdfs', 'auto_scraper')
 LOG_DIR = os.path.join(DATA_DIR, 'logs')
 
 # 로그 파일들
-DOWNLOAD_LOG_FILE = os.path.join(LOG_DIR, 'download_log.json')
-FAILED_LOG_FILE = os.path.join(LOG_DIR, 'failed_log.json')
+# --- ver1.5: 다운로드/실패 이력은 한 줄씩 추가하는 JSON Lines (전체 파일 재작성 안 함) ---
+DOWNLOAD_LOG_FILE = os.path.join(LOG_DIR, 'download_log.jsonl')
+FAILED_LOG_FILE = os.path.join(LOG_DIR, 'failed_log.jsonl')
+LEGACY_DOWNLOAD_LOG_FILE = os.path.join(LOG_DIR, 'download_log.json')  # 구버전 형식 (--export-logs 출력)
+LEGACY_FAILED_LOG_FILE = os.path.join(LOG_DIR, 'failed_log.json')
 CHECKPOINT_FILE = os.path.join(LOG_DIR, 'checkpoint.json')
 DEBUG_LOG_FILE = os.path.join(LOG_DIR, 'debug_log.txt')
 
@@ -106,7 +109,13 @@ MAX_RETRIES = 2                # 최대 재시도 횟수 (3 → 2)
 RETRY_DELAY = 1                # 재시도 간격 (2 → 1초)
 
 # --- 브라우저 설정 ---
-BROWSER_RESTART_INTERVAL = 50  # N개 게시글마다 브라우저 재시작 (30 → 50)
+BROWSER_RESTART_INTERVAL = 50  # 메모리를 측정할 수 없을 때 N개 게시글마다 브라우저 재시작 (ver1.5: 기본은 메모리 기준)
+
+# --- ver1.5: 병렬 워커 풀 ---
+PARALLEL_WORKERS = 1           # 게시글 처리 워커(브라우저) 수 (1이면 기존 단일 브라우저 모드)
+WORKER_QUEUE_SIZE = 100        # 코디네이터가 미리 쌓아둘 수 있는 최대 작업 수
+WORKER_PUT_TIMEOUT = 5         # 작업 큐가 가득 찼을 때 워커 생존 여부를 다시 확인하는 간격 (초)
+WORKER_TEMP_DIR = os.path.join(DATA_DIR, 'tmp', 'workers')  # 워커 전용 다운로드 폴더 (RAG 수집 대상 폴더 밖)
 
 # --- PDF 검증 설정 ---
 MIN_PDF_SIZE = 100             # 최소 PDF 파일 크기 (바이트)
@@ -162,6 +171,33 @@ BLOCKED_DOMAINS = [
     'googleadservices.com', 'google-analytics.com'
 ]
 
+# --- ver1.5: 브라우저 팩토리 ---
+PAGE_LOAD_STRATEGY = 'eager'    # 'eager': DOMContentLoaded에서 반환 (이미지/광고 로딩 대기 안 함), 'normal': 전체 로드
+BROWSER_MEMORY_LIMIT_MB = 1500  # 브라우저(크롬 전체 프로세스) 메모리가 이 값을 넘으면 재시작
+BROWSER_MEMORY_CHECK_INTERVAL = 5   # N개 게시글마다 메모리 측정
+DRIVER_PATH_CACHE_FILE = os.path.join(LOG_DIR, 'chromedriver_path.json')  # ChromeDriverManager 결과 캐시
+DRIVER_PATH_CACHE_DAYS = 7      # 캐시 유효 기간 (지나면 버전 확인 다시 실행)
+
+# --- ver1.5: 스마트 대기 (고정 sleep / DOM 개수 폴링 대체) ---
+WAIT_QUIET_MS = 500             # DOM 변경과 리소스 요청이 이 시간(밀리초) 동안 없으면 안정화로 판단
+WAIT_NAVIGATION_TIMEOUT = 2     # 클릭 후 이전 페이지가 사라질 때까지 최대 대기 (초, 없으면 같은 페이지 갱신으로 판단)
+WAIT_NEW_WINDOW_TIMEOUT = 1     # 클릭/window.open 후 새 창 감지 최대 대기 (초)
+WAIT_STATS_FILE = os.path.join(LOG_DIR, 'wait_stats.jsonl')  # 실행마다 사이트별 대기 시간 한 줄 추가
+
+# 리소스 타입별 차단 URL 패턴 (CDP Network.setBlockedURLs)
+RESOURCE_TYPE_URL_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp'],
+    'stylesheet': ['*.css'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.avi']
+}
+
+# --- ver1.5: HTTP 우선 다운로드 ---
+HTTP_FIRST_DOWNLOAD = True      # URL이 있는 전략은 브라우저 대신 HTTP로 직접 다운로드
+HTTP_FIRST_STRATEGY_TYPES = ['direct_link', 'filename_link', 'iframe', 'embed', 'object']
+HTTP_POOL_SIZE = 10             # HTTP 연결 풀 크기
+HTTP_CHUNK_SIZE = 256 * 1024    # 스트리밍 저장 단위 (바이트)
+
 # --- 다중 PDF 다운로드 ---
 DOWNLOAD_ALL_PDFS = True        # 게시물당 모든 PDF 다운로드
 MAX_PDFS_PER_ARTICLE = 10       # 게시물당 최대 PDF 개수
@@ -171,8 +207,18 @@ USE_FILENAME_CHECK = True       # 파일명 기반 중복 체크
 USE_HASH_CHECK = True           # SHA256 해시 기반 중복 체크
 USE_DATABASE = True             # SQLite DB 이력 관리
 
+# --- ver1.5: 메모리 중복 인덱스 (시작 시 DB/다운로드 폴더에서 한 번 적재) ---
+DEDUPE_EXACT_LIMIT = 500000     # 기록이 이보다 많으면 집합 대신 Bloom 필터 사용 (메모리 절약)
+DEDUPE_BLOOM_ERROR_RATE = 0.001 # Bloom 필터 오탐률 (오탐은 DB로 확인하므로 누락은 없음)
+DEDUPE_DB_REFRESH_SECONDS = 30  # 정확 모드 해시 미스 시 다른 워커 기록을 DB에서 가져오는 최소 간격(초, 0이면 안 함)
+
+# --- ver1.5: SQLite 연결/커밋 설정 (프로세스당 연결 1개, WAL) ---
+DB_COMMIT_BATCH = 50            # 쓰기 N건마다 커밋
+DB_COMMIT_INTERVAL = 1.0        # 첫 미커밋 쓰기 후 최대 N초 안에 커밋 (다른 워커에 보이는 지연)
+DB_BUSY_TIMEOUT = 30000         # 다른 프로세스가 쓰는 중일 때 대기 시간 (밀리초)
+
 # --- ver1.2: 게시물 URL 추적 (중복 방문 방지) ---
-TRACK_PROCESSED_ARTICLES = False        # 처리된 게시물 URL 추적 (비활성화: DB 부하)
+TRACK_PROCESSED_ARTICLES = True         # 처리된 게시물 URL 추적 (ver1.5: 연결 재사용/일괄 커밋으로 부하 없음)
 SKIP_PROCESSED_ARTICLES = False         # 이미 처리된 게시물 건너뛰기 (비활성화)
 PROCESSED_ARTICLES_EXPIRE_DAYS = 90    # 처리 기록 유효 기간 (일)
 
@@ -238,6 +284,11 @@ DYNAMIC_SCRIPT_EXTENSIONS = [
 
 # --- 고급 설정 ---
 REMOVE_DUPLICATE_AFTER_DOWNLOAD = True   # 다운로드 후 해시 중복 시 자동 삭제
+
+# --- ver1.5: 내용 주소 PDF 저장소 (SHA256 기준, 같은 내용은 한 번만 저장) ---
+USE_PDF_STORE = True                     # objects/<해시 앞 2자리>/<해시>.pdf에 저장, 다운로드 폴더에는 하드 링크
+PDF_STORE_DIR = os.path.join(DATA_DIR, 'pdfs', 'store')
+HASH_BUFFER_SIZE = 1024 * 1024           # 해시 계산 읽기 단위 (바이트)
 NORMALIZE_FILENAMES = True               # 파일명 자동 정규화
 VERIFY_PDF_INTEGRITY = True              # PDF 무결성 검증 강화
 
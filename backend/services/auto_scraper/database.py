@@ -1,21 +1,455 @@
 """
-범용 PDF 자동 스크래퍼 ver1.2 - 데이터베이스 이력 관리
+범용 PDF 자동 스크래퍼 ver1.5 - 데이터베이스 이력 관리
 
-ver1.2 새로운 기능:
+ver1.5 새로운 기능:
+- ScraperRepository: 프로세스당 하나의 SQLite 연결을 계속 재사용 (함수 호출마다 connect/close 안 함)
+- WAL 저널 + synchronous=NORMAL (여러 워커 프로세스가 동시에 읽고 쓰기 가능)
+- 쓰기는 커밋 창(DB_COMMIT_BATCH건 또는 DB_COMMIT_INTERVAL초)마다 묶어서 커밋
+- 기존 모듈 함수(add_download_record 등)는 그대로 사용 가능 (내부에서 저장소 호출)
+
+ver1.2 기능:
 - 처리된 게시물 URL 추적 테이블 추가 (중복 방문 방지)
 - 게시판 패턴 캐시 테이블 추가 (패턴 학습)
 - 빠른 조회를 위한 인덱스 최적화
 """
 
 import os
+import time
+import atexit
 import sqlite3
 import json
+import threading
 from datetime import datetime, timedelta
-from config import LOG_DIR, PROCESSED_ARTICLES_EXPIRE_DAYS
+from config import (
+    LOG_DIR, PROCESSED_ARTICLES_EXPIRE_DAYS,
+    DB_COMMIT_BATCH, DB_COMMIT_INTERVAL, DB_BUSY_TIMEOUT
+)
 
 # DB 파일 경로
 DB_FILE = os.path.join(LOG_DIR, 'download_history.db')
 
+# 자주 쓰는 SQL (문자열이 같으면 sqlite3 문장 캐시에서 준비된 문장을 재사용)
+SQL_INSERT_DOWNLOAD = '''
+    INSERT OR REPLACE INTO downloads
+    (article_title, article_url, filename, file_hash, file_size, download_method, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_RENAME_DOWNLOAD = 'UPDATE downloads SET filename = ? WHERE article_url = ? AND filename = ?'
+SQL_EXISTS_FILENAME = 'SELECT 1 FROM downloads WHERE filename = ? LIMIT 1'
+SQL_FIND_HASH = '''
+    SELECT filename, article_title, timestamp
+    FROM downloads
+    WHERE file_hash = ?
+    LIMIT 1
+'''
+SQL_EXISTS_URL_FILENAME = 'SELECT 1 FROM downloads WHERE article_url = ? AND filename = ? LIMIT 1'
+SQL_FIND_PROCESSED = '''
+    SELECT process_status, pdf_count, timestamp
+    FROM processed_articles
+    WHERE article_url = ?
+'''
+SQL_MARK_PROCESSED = '''
+    INSERT OR REPLACE INTO processed_articles
+    (article_url, article_title, process_status, pdf_count, timestamp, last_accessed)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+SQL_TOUCH_PROCESSED = '''
+    UPDATE processed_articles
+    SET last_accessed = ?
+    WHERE article_url = ?
+'''
+SQL_INSERT_FAILURE = '''
+    INSERT INTO failures (article_title, article_url, reason, timestamp)
+    VALUES (?, ?, ?, ?)
+'''
+
+
+def processed_cutoff(expire_days=PROCESSED_ARTICLES_EXPIRE_DAYS):
+    """처리 기록 유효 기간의 시작 시각 (이보다 오래된 기록은 만료)"""
+    return (datetime.now() - timedelta(days=expire_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ============================================
+# ver1.5: 저장소 (프로세스당 하나의 연결)
+# ============================================
+
+class ScraperRepository:
+    """
+    스크래퍼 이력 DB 저장소
+
+    프로세스마다 연결 하나를 열어 두고 재사용합니다.
+    쓰기는 바로 실행되지만 커밋은 commit_batch건 또는 commit_interval초마다 한 번만 합니다.
+    같은 연결에서의 조회는 커밋 전 기록도 보이고, 다른 워커 프로세스에는
+    다음 커밋(최대 commit_interval초) 이후에 보입니다.
+
+    Args:
+        db_file: SQLite 파일 경로
+        commit_batch: 이 건수만큼 쓰기가 쌓이면 커밋
+        commit_interval: 첫 미커밋 쓰기 후 이 시간(초)이 지나면 커밋
+        busy_timeout: 다른 프로세스가 쓰는 중일 때 대기할 최대 시간 (밀리초)
+    """
+
+    def __init__(self, db_file=DB_FILE, commit_batch=DB_COMMIT_BATCH,
+                 commit_interval=DB_COMMIT_INTERVAL, busy_timeout=DB_BUSY_TIMEOUT):
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+
+        self.db_file = db_file
+        self.pid = os.getpid()
+        self.commit_batch = max(1, commit_batch)
+        self.commit_interval = commit_interval
+        self._pending = 0
+        self._first_pending_at = None
+        self._flush_timer = None
+        self._lock = threading.RLock()
+
+        self.conn = sqlite3.connect(
+            db_file, timeout=busy_timeout / 1000, check_same_thread=False, cached_statements=256
+        )
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(f'PRAGMA busy_timeout={int(busy_timeout)}')
+
+    # --- 트랜잭션 ---
+
+    def _write(self, sql, params=()):
+        """쓰기 실행 후 커밋 창 확인"""
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            self._pending += 1
+
+            if self._first_pending_at is None:
+                self._first_pending_at = time.time()
+                # 이후 쓰기가 없어도 commit_interval 안에 커밋 (쓰기 잠금을 오래 잡지 않음)
+                self._flush_timer = threading.Timer(self.commit_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+            if (self._pending >= self.commit_batch
+                    or time.time() - self._first_pending_at >= self.commit_interval):
+                self.flush()
+            return cursor
+
+    def flush(self):
+        """미커밋 쓰기를 커밋"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._pending:
+                self.conn.commit()
+                self._pending = 0
+                self._first_pending_at = None
+
+    def close(self):
+        """남은 쓰기를 커밋하고 연결 종료"""
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self.conn.close()
+
+    def _fetchone(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()
+
+
+    # --- 스키마 ---
+
+    def create_tables(self):
+        """테이블/인덱스 생성"""
+        with self._lock:
+            self.conn.executescript('''
+                -- 다운로드 이력 테이블
+                CREATE TABLE IF NOT EXISTS downloads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_title TEXT NOT NULL,
+                    article_url TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    file_hash TEXT,
+                    file_size TEXT,
+                    download_method TEXT,
+                    timestamp TEXT NOT NULL,
+                    UNIQUE(article_url, filename)
+                );
+
+                -- 해시 인덱스 (빠른 중복 검사)
+                CREATE INDEX IF NOT EXISTS idx_file_hash ON downloads(file_hash);
+
+                -- 파일명 인덱스
+                CREATE INDEX IF NOT EXISTS idx_filename ON downloads(filename);
+
+                -- 실패 이력 테이블
+                CREATE TABLE IF NOT EXISTS failures (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_title TEXT NOT NULL,
+                    article_url TEXT NOT NULL,
+                    reason TEXT,
+                    timestamp TEXT NOT NULL
+                );
+
+                -- ver1.2: 처리된 게시물 추적 테이블 (중복 방문 방지)
+                CREATE TABLE IF NOT EXISTS processed_articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_url TEXT NOT NULL UNIQUE,
+                    article_title TEXT,
+                    process_status TEXT NOT NULL,
+                    pdf_count INTEGER DEFAULT 0,
+                    timestamp TEXT NOT NULL,
+                    last_accessed TEXT NOT NULL
+                );
+
+                -- 처리된 게시물 URL 인덱스
+                CREATE INDEX IF NOT EXISTS idx_processed_url ON processed_articles(article_url);
+
+                -- ver1.5: 내용 주소 저장소 이름 → 해시 색인 (같은 내용의 다른 파일명 포함)
+                CREATE TABLE IF NOT EXISTS pdf_names (
+                    filename TEXT PRIMARY KEY,
+                    file_hash TEXT NOT NULL,
+                    timestamp TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_pdf_names_hash ON pdf_names(file_hash);
+
+                -- ver1.2: 게시판 패턴 캐시 테이블
+                CREATE TABLE IF NOT EXISTS board_patterns (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    board_domain TEXT NOT NULL,
+                    link_selector TEXT,
+                    pagination_selector TEXT,
+                    pdf_strategy TEXT,
+                    success_count INTEGER DEFAULT 0,
+                    total_attempts INTEGER DEFAULT 0,
+                    confidence REAL DEFAULT 0.0,
+                    last_used TEXT NOT NULL,
+                    UNIQUE(board_domain)
+                );
+            ''')
+
+    # --- 다운로드 이력 ---
+
+    def add_download(self, article_title, article_url, filename, file_hash=None, file_size=None, method=None):
+        self._write(SQL_INSERT_DOWNLOAD,
+                    (article_title, article_url, filename, file_hash, file_size, method, _now()))
+
+    def rename_download(self, article_url, filename, new_filename):
+        self._write(SQL_RENAME_DOWNLOAD, (new_filename, article_url, filename))
+
+    def has_filename(self, filename):
+        return self._fetchone(SQL_EXISTS_FILENAME, (filename,)) is not None
+
+    def find_by_hash(self, file_hash):
+        row = self._fetchone(SQL_FIND_HASH, (file_hash,))
+        if row:
+            return {'filename': row[0], 'article_title': row[1], 'timestamp': row[2]}
+        return None
+
+    def has_url_filename(self, article_url, filename):
+        return self._fetchone(SQL_EXISTS_URL_FILENAME, (article_url, filename)) is not None
+
+    # --- 처리된 게시물 ---
+
+    def get_processed_article(self, article_url):
+        row = self._fetchone(SQL_FIND_PROCESSED, (article_url,))
+        if row:
+            return {'status': row[0], 'pdf_count': row[1], 'timestamp': row[2]}
+        return None
+
+    def mark_article_processed(self, article_url, article_title, status, pdf_count=0):
+        timestamp = _now()
+        self._write(SQL_MARK_PROCESSED,
+                    (article_url, article_title, status, pdf_count, timestamp, timestamp))
+
+    def touch_article(self, article_url):
+        self._write(SQL_TOUCH_PROCESSED, (_now(), article_url))
+
+    def cleanup_processed_articles(self, expire_days=PROCESSED_ARTICLES_EXPIRE_DAYS):
+        expire_date = processed_cutoff(expire_days)
+        cursor = self._write('DELETE FROM processed_articles WHERE last_accessed < ?', (expire_date,))
+        return cursor.rowcount
+
+    # --- 게시판 패턴 ---
+
+    def get_board_pattern(self, board_domain):
+        row = self._fetchone('''
+            SELECT link_selector, pagination_selector, pdf_strategy, confidence
+            FROM board_patterns
+            WHERE board_domain = ?
+        ''', (board_domain,))
+        if row:
+            return {
+                'link_selector': row[0],
+                'pagination_selector': row[1],
+                'pdf_strategy': row[2],
+                'confidence': row[3]
+            }
+        return None
+
+    def save_board_pattern(self, board_domain, link_selector=None, pagination_selector=None,
+                           pdf_strategy=None, success=True):
+        with self._lock:
+            row = self._fetchone('''
+                SELECT success_count, total_attempts
+                FROM board_patterns
+                WHERE board_domain = ?
+            ''', (board_domain,))
+
+            if row:
+                success_count = row[0] + (1 if success else 0)
+                total_attempts = row[1] + 1
+                self._write('''
+                    UPDATE board_patterns
+                    SET success_count = ?, total_attempts = ?, confidence = ?, last_used = ?
+                    WHERE board_domain = ?
+                ''', (success_count, total_attempts, success_count / total_attempts, _now(), board_domain))
+            else:
+                success_count = 1 if success else 0
+                self._write('''
+                    INSERT INTO board_patterns
+                    (board_domain, link_selector, pagination_selector, pdf_strategy,
+                     success_count, total_attempts, confidence, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (board_domain, link_selector, pagination_selector, pdf_strategy,
+                      success_count, 1, float(success_count), _now()))
+
+    # --- 실패 이력 ---
+
+    def add_failure(self, article_title, article_url, reason):
+        self._write(SQL_INSERT_FAILURE, (article_title, article_url, reason, _now()))
+
+    # --- ver1.5: 내용 주소 저장소 ---
+
+    def set_pdf_name(self, filename, file_hash):
+        self._write('INSERT OR REPLACE INTO pdf_names (filename, file_hash, timestamp) VALUES (?, ?, ?)',
+                    (filename, file_hash, _now()))
+
+    def get_pdf_hash(self, filename):
+        row = self._fetchone('SELECT file_hash FROM pdf_names WHERE filename = ?', (filename,))
+        return row[0] if row else None
+
+    # --- ver1.5: 중복 인덱스 적재 ---
+
+    def iter_download_keys(self, batch_size=5000, since=None):
+        """downloads의 (filename, file_hash, article_url, article_title, timestamp) (since: 이 시각 이후 기록만)"""
+        sql = 'SELECT filename, file_hash, article_url, article_title, timestamp FROM downloads'
+        params = []
+        if since:
+            sql += ' WHERE timestamp >= ?'
+            params.append(since)
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+
+    def iter_processed_urls(self, batch_size=5000, statuses=None, since=None):
+        """processed_articles의 URL (statuses: 처리 상태 목록, since: 이 시각 이후 처리분만)"""
+        sql = 'SELECT article_url FROM processed_articles WHERE 1 = 1'
+        params = []
+        if statuses:
+            sql += f" AND process_status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+        if since:
+            sql += ' AND timestamp >= ?'
+            params.append(since)
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield row[0]
+
+    def count(self, table):
+        return self._fetchone(f'SELECT COUNT(*) FROM {table}')[0]
+
+    # --- 통계 ---
+
+    def stats(self):
+        with self._lock:
+            total_downloads = self._fetchone('SELECT COUNT(*) FROM downloads')[0]
+            total_failures = self._fetchone('SELECT COUNT(*) FROM failures')[0]
+            total_processed = self._fetchone('SELECT COUNT(*) FROM processed_articles')[0]
+            methods = self.conn.execute('''
+                SELECT download_method, COUNT(*)
+                FROM downloads
+                GROUP BY download_method
+            ''').fetchall()
+
+        return {
+            'total_downloads': total_downloads,
+            'total_failures': total_failures,
+            'total_processed': total_processed,
+            'methods': {method: count for method, count in methods if method}
+        }
+
+    def recent_downloads(self, limit=10):
+        with self._lock:
+            rows = self.conn.execute('''
+                SELECT article_title, filename, file_size, timestamp
+                FROM downloads
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (limit,)).fetchall()
+
+        return [
+            {'title': row[0], 'filename': row[1], 'size': row[2], 'timestamp': row[3]}
+            for row in rows
+        ]
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository():
+    """
+    현재 프로세스의 저장소 반환 (fork된 워커 프로세스에서는 새 연결 생성)
+
+    Returns:
+        ScraperRepository
+    """
+    global _repository
+    with _repository_lock:
+        if _repository is None or _repository.pid != os.getpid():
+            _repository = ScraperRepository()
+            _repository.create_tables()
+        return _repository
+
+
+def flush_database():
+    """미커밋 쓰기 커밋 (워커 종료 시 등)"""
+    if _repository is not None and _repository.pid == os.getpid():
+        try:
+            _repository.flush()
+        except Exception as e:
+            print(f"DB 커밋 오류: {e}")
+
+
+def close_database():
+    """남은 쓰기를 커밋하고 연결 종료 (DB 파일 삭제 전 등)"""
+    global _repository
+    with _repository_lock:
+        if _repository is not None and _repository.pid == os.getpid():
+            try:
+                _repository.close()
+            except Exception as e:
+                print(f"DB 종료 오류: {e}")
+        _repository = None
+
+
+atexit.register(flush_database)
+
+# fork 전에 연결을 닫음 (SQLite 연결은 fork를 넘겨 쓰면 잠금 상태가 꼬임, 부모는 다음 사용 시 다시 연결)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=close_database)
+
 
 # ============================================
 # 데이터베이스 초기화
@@ -29,87 +463,7 @@ def init_database():
         bool: 성공 여부
     """
     try:
-        os.makedirs(LOG_DIR, exist_ok=True)
-
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        # 다운로드 이력 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS downloads (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_title TEXT NOT NULL,
-                article_url TEXT NOT NULL,
-                filename TEXT NOT NULL,
-                file_hash TEXT,
-                file_size TEXT,
-                download_method TEXT,
-                timestamp TEXT NOT NULL,
-                UNIQUE(article_url, filename)
-            )
-        ''')
-
-        # 해시 인덱스 (빠른 중복 검사)
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_file_hash
-            ON downloads(file_hash)
-        ''')
-
-        # 파일명 인덱스
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_filename
-            ON downloads(filename)
-        ''')
-
-        # 실패 이력 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS failures (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_title TEXT NOT NULL,
-                article_url TEXT NOT NULL,
-                reason TEXT,
-                timestamp TEXT NOT NULL
-            )
-        ''')
-
-        # ver1.2: 처리된 게시물 추적 테이블 (중복 방문 방지)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS processed_articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_url TEXT NOT NULL UNIQUE,
-                article_title TEXT,
-                process_status TEXT NOT NULL,
-                pdf_count INTEGER DEFAULT 0,
-                timestamp TEXT NOT NULL,
-                last_accessed TEXT NOT NULL
-            )
-        ''')
-
-        # 처리된 게시물 URL 인덱스
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_processed_url
-            ON processed_articles(article_url)
-        ''')
-
-        # ver1.2: 게시판 패턴 캐시 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS board_patterns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                board_domain TEXT NOT NULL,
-                link_selector TEXT,
-                pagination_selector TEXT,
-                pdf_strategy TEXT,
-                success_count INTEGER DEFAULT 0,
-                total_attempts INTEGER DEFAULT 0,
-                confidence REAL DEFAULT 0.0,
-                last_used TEXT NOT NULL,
-                UNIQUE(board_domain)
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
-
+        get_repository()
         return True
 
     except Exception as e:
@@ -137,24 +491,32 @@ def add_download_record(article_title, article_url, filename, file_hash=None, fi
         bool: 성공 여부
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
+        get_repository().add_download(article_title, article_url, filename, file_hash, file_size, method)
+        return True
+
+    except Exception as e:
+        print(f"다운로드 기록 추가 오류: {e}")
+        return False
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        cursor.execute('''
-            INSERT OR REPLACE INTO downloads
-            (article_title, article_url, filename, file_hash, file_size, download_method, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (article_title, article_url, filename, file_hash, file_size, method, timestamp))
+def rename_download_record(article_url, filename, new_filename):
+    """
+    다운로드 기록의 파일명 변경 (병렬 워커가 이름 충돌로 다른 이름으로 옮긴 경우)
 
-        conn.commit()
-        conn.close()
+    Args:
+        article_url: 게시글 URL
+        filename: 기록된 파일명
+        new_filename: 실제 저장된 파일명
 
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        get_repository().rename_download(article_url, filename, new_filename)
         return True
 
     except Exception as e:
-        print(f"다운로드 기록 추가 오류: {e}")
+        print(f"다운로드 기록 파일명 변경 오류: {e}")
         return False
 
 
@@ -169,15 +531,7 @@ def is_duplicate_by_filename(filename):
         bool: 이미 다운로드된 경우 True
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT COUNT(*) FROM downloads WHERE filename = ?', (filename,))
-        count = cursor.fetchone()[0]
-
-        conn.close()
-
-        return count > 0
+        return get_repository().has_filename(filename)
 
     except Exception as e:
         print(f"파일명 중복 체크 오류: {e}")
@@ -198,26 +552,7 @@ def is_duplicate_by_hash(file_hash):
         if not file_hash:
             return None
 
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT filename, article_title, timestamp
-            FROM downloads
-            WHERE file_hash = ?
-        ''', (file_hash,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return {
-                'filename': result[0],
-                'article_title': result[1],
-                'timestamp': result[2]
-            }
-
-        return None
+        return get_repository().find_by_hash(file_hash)
 
     except Exception as e:
         print(f"해시 중복 체크 오류: {e}")
@@ -236,18 +571,7 @@ def is_duplicate_by_url_filename(article_url, filename):
         bool: 이미 다운로드된 경우 True
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT COUNT(*) FROM downloads
-            WHERE article_url = ? AND filename = ?
-        ''', (article_url, filename))
-
-        count = cursor.fetchone()[0]
-        conn.close()
-
-        return count > 0
+        return get_repository().has_url_filename(article_url, filename)
 
     except Exception as e:
         print(f"URL+파일명 중복 체크 오류: {e}")
@@ -269,26 +593,7 @@ def is_article_processed(article_url):
         dict or None: 처리 정보 또는 None
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT process_status, pdf_count, timestamp
-            FROM processed_articles
-            WHERE article_url = ?
-        ''', (article_url,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return {
-                'status': result[0],
-                'pdf_count': result[1],
-                'timestamp': result[2]
-            }
-
-        return None
+        return get_repository().get_processed_article(article_url)
 
     except Exception as e:
         print(f"게시물 처리 확인 오류: {e}")
@@ -309,20 +614,7 @@ def mark_article_processed(article_url, article_title, status, pdf_count=0):
         bool: 성공 여부
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO processed_articles
-            (article_url, article_title, process_status, pdf_count, timestamp, last_accessed)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (article_url, article_title, status, pdf_count, timestamp, timestamp))
-
-        conn.commit()
-        conn.close()
-
+        get_repository().mark_article_processed(article_url, article_title, status, pdf_count)
         return True
 
     except Exception as e:
@@ -341,20 +633,7 @@ def update_article_access_time(article_url):
         bool: 성공 여부
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        cursor.execute('''
-            UPDATE processed_articles
-            SET last_accessed = ?
-            WHERE article_url = ?
-        ''', (timestamp, article_url))
-
-        conn.commit()
-        conn.close()
-
+        get_repository().touch_article(article_url)
         return True
 
     except Exception as e:
@@ -370,21 +649,7 @@ def cleanup_old_processed_articles():
         int: 삭제된 레코드 수
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        expire_date = (datetime.now() - timedelta(days=PROCESSED_ARTICLES_EXPIRE_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
-
-        cursor.execute('''
-            DELETE FROM processed_articles
-            WHERE last_accessed < ?
-        ''', (expire_date,))
-
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
-
-        return deleted_count
+        return get_repository().cleanup_processed_articles()
 
     except Exception as e:
         print(f"오래된 기록 삭제 오류: {e}")
@@ -406,27 +671,7 @@ def get_board_pattern(board_domain):
         dict or None: 패턴 정보 또는 None
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT link_selector, pagination_selector, pdf_strategy, confidence
-            FROM board_patterns
-            WHERE board_domain = ?
-        ''', (board_domain,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return {
-                'link_selector': result[0],
-                'pagination_selector': result[1],
-                'pdf_strategy': result[2],
-                'confidence': result[3]
-            }
-
-        return None
+        return get_repository().get_board_pattern(board_domain)
 
     except Exception as e:
         print(f"게시판 패턴 조회 오류: {e}")
@@ -449,55 +694,57 @@ def save_board_pattern(board_domain, link_selector=None, pagination_selector=Non
         bool: 성공 여부
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
+        get_repository().save_board_pattern(board_domain, link_selector, pagination_selector,
+                                            pdf_strategy, success)
+        return True
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    except Exception as e:
+        print(f"게시판 패턴 저장 오류: {e}")
+        return False
 
-        # 기존 레코드 조회
-        cursor.execute('''
-            SELECT success_count, total_attempts
-            FROM board_patterns
-            WHERE board_domain = ?
-        ''', (board_domain,))
 
-        result = cursor.fetchone()
+# ============================================
+# ver1.5: 내용 주소 저장소 이름 색인
+# ============================================
 
-        if result:
-            # 업데이트
-            success_count = result[0] + (1 if success else 0)
-            total_attempts = result[1] + 1
-            confidence = success_count / total_attempts if total_attempts > 0 else 0.0
+def set_pdf_name(filename, file_hash):
+    """
+    파일명 → SHA256 해시 기록
 
-            cursor.execute('''
-                UPDATE board_patterns
-                SET success_count = ?, total_attempts = ?, confidence = ?, last_used = ?
-                WHERE board_domain = ?
-            ''', (success_count, total_attempts, confidence, timestamp, board_domain))
-        else:
-            # 새로 삽입
-            success_count = 1 if success else 0
-            total_attempts = 1
-            confidence = success_count / total_attempts if total_attempts > 0 else 0.0
-
-            cursor.execute('''
-                INSERT INTO board_patterns
-                (board_domain, link_selector, pagination_selector, pdf_strategy,
-                 success_count, total_attempts, confidence, last_used)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (board_domain, link_selector, pagination_selector, pdf_strategy,
-                  success_count, total_attempts, confidence, timestamp))
-
-        conn.commit()
-        conn.close()
+    Args:
+        filename: 파일명
+        file_hash: SHA256 해시
 
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        get_repository().set_pdf_name(filename, file_hash)
         return True
 
     except Exception as e:
-        print(f"게시판 패턴 저장 오류: {e}")
+        print(f"파일명 색인 기록 오류: {e}")
         return False
 
 
+def get_pdf_hash(filename):
+    """
+    파일명으로 SHA256 해시 조회
+
+    Args:
+        filename: 파일명
+
+    Returns:
+        str or None: 해시
+    """
+    try:
+        return get_repository().get_pdf_hash(filename)
+
+    except Exception as e:
+        print(f"파일명 색인 조회 오류: {e}")
+        return None
+
+
 # ============================================
 # 실패 이력 관리
 # ============================================
@@ -515,19 +762,7 @@ def add_failure_record(article_title, article_url, reason):
         bool: 성공 여부
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        cursor.execute('''
-            INSERT INTO failures (article_title, article_url, reason, timestamp)
-            VALUES (?, ?, ?, ?)
-        ''', (article_title, article_url, reason, timestamp))
-
-        conn.commit()
-        conn.close()
-
+        get_repository().add_failure(article_title, article_url, reason)
         return True
 
     except Exception as e:
@@ -547,37 +782,7 @@ def get_download_stats():
         dict: 통계 정보
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        # 전체 다운로드 수
-        cursor.execute('SELECT COUNT(*) FROM downloads')
-        total_downloads = cursor.fetchone()[0]
-
-        # 전체 실패 수
-        cursor.execute('SELECT COUNT(*) FROM failures')
-        total_failures = cursor.fetchone()[0]
-
-        # 처리된 게시물 수
-        cursor.execute('SELECT COUNT(*) FROM processed_articles')
-        total_processed = cursor.fetchone()[0]
-
-        # 다운로드 방법별 통계
-        cursor.execute('''
-            SELECT download_method, COUNT(*)
-            FROM downloads
-            GROUP BY download_method
-        ''')
-        methods = cursor.fetchall()
-
-        conn.close()
-
-        return {
-            'total_downloads': total_downloads,
-            'total_failures': total_failures,
-            'total_processed': total_processed,
-            'methods': {method: count for method, count in methods if method}
-        }
+        return get_repository().stats()
 
     except Exception as e:
         print(f"통계 조회 오류: {e}")
@@ -600,28 +805,7 @@ def get_recent_downloads(limit=10):
         list: 다운로드 기록 리스트
     """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT article_title, filename, file_size, timestamp
-            FROM downloads
-            ORDER BY id DESC
-            LIMIT ?
-        ''', (limit,))
-
-        results = cursor.fetchall()
-        conn.close()
-
-        return [
-            {
-                'title': row[0],
-                'filename': row[1],
-                'size': row[2],
-                'timestamp': row[3]
-            }
-            for row in results
-        ]
+        return get_repository().recent_downloads(limit)
 
     except Exception as e:
         print(f"최근 다운로드 조회 오류: {e}")
@@ -664,6 +848,7 @@ def migrate_from_json(json_file_path):
             if success:
                 count += 1
 
+        flush_database()
         print(f"✅ {count}개 레코드를 JSON에서 DB로 마이그레이션했습니다.")
         return count
 
@@ -0,0 +1,255 @@
+"""
+범용 PDF 자동 스크래퍼 ver1.5 - 메모리 중복 인덱스
+
+ver1.5 새로운 기능:
+- 시작 시 DB(downloads, processed_articles)와 다운로드 폴더를 한 번만 읽어 메모리에 적재
+- 파일명 / SHA256 해시 / 게시글 URL 중복 체크를 O(1)로 처리 (후보마다 SQLite/디스크 조회 안 함)
+- 기록이 DEDUPE_EXACT_LIMIT를 넘으면 집합 대신 Bloom 필터 사용
+  (없음 판정은 확정, 있음 판정만 DB/디스크로 확인 → 오탐으로 건너뛰는 일 없음)
+- 다운로드/게시글 기록 시 인덱스도 함께 갱신
+- 게시글 건너뛰기는 유효 기간 안에 성공(SKIP_ARTICLE_STATUSES)한 게시글만 (일시 오류는 다음 실행에서 재시도)
+- 정확 모드 해시 미스는 SQLite를 매번 조회하지 않고, DEDUPE_DB_REFRESH_SECONDS 간격으로
+  다른 워커가 새로 기록한 다운로드만 가져와 인덱스에 반영
+"""
+
+import os
+import math
+import time
+import hashlib
+from datetime import datetime
+
+from config import *
+from utils import debug_log
+
+if USE_DATABASE:
+    try:
+        from database import (get_repository, is_duplicate_by_filename, is_duplicate_by_hash,
+                              is_article_processed, processed_cutoff)
+    except ImportError:
+        USE_DATABASE = False
+
+# 다음 실행에서 건너뛸 게시글 처리 상태 (no_pdf/error는 다시 시도)
+SKIP_ARTICLE_STATUSES = ('success',)
+
+
+class BloomFilter:
+    """
+    고정 크기 Bloom 필터 (blake2b 이중 해싱)
+
+    Args:
+        capacity: 예상 항목 수
+        error_rate: 목표 오탐률
+    """
+
+    def __init__(self, capacity, error_rate=DEDUPE_BLOOM_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class DedupeIndex:
+    """
+    파일명 / 해시 / 게시글 URL 중복 인덱스
+
+    Args:
+        download_dir: 다운로드 폴더 (기존 파일명 적재 및 Bloom 모드 확인용)
+        exact_limit: 이 개수 이하이면 집합/딕셔너리, 초과하면 Bloom 필터
+    """
+
+    def __init__(self, download_dir=DOWNLOAD_DIR, exact_limit=DEDUPE_EXACT_LIMIT):
+        self.download_dir = download_dir
+        self.exact_limit = exact_limit
+        self.exact = True
+        self.filenames = {}     # 정확 모드: 파일명 → 중복 사유 / Bloom 모드: BloomFilter
+        self.hashes = {}        # 정확 모드: 해시 → 중복 파일 정보 / Bloom 모드: BloomFilter
+        self.article_urls = set()
+        self._refreshed_at = time.monotonic()   # 마지막 DB 동기화 (monotonic)
+        self._refreshed_until = None            # 마지막 DB 동기화 시점의 DB timestamp
+
+    def load(self):
+        """DB와 다운로드 폴더에서 인덱스 적재"""
+        self._mark_refreshed()
+        disk_files = []
+        if os.path.isdir(self.download_dir):
+            disk_files = [name for name in os.listdir(self.download_dir) if name.lower().endswith('.pdf')]
+
+        repo = get_repository() if USE_DATABASE else None
+        download_count = repo.count('downloads') if repo else 0
+        processed_count = repo.count('processed_articles') if repo else 0
+
+        self.exact = max(download_count + len(disk_files), processed_count) <= self.exact_limit
+        if not self.exact:
+            # 앞으로 늘어날 기록까지 고려해 2배 크기로 생성
+            self.filenames = BloomFilter(max((download_count + len(disk_files)) * 2, self.exact_limit))
+            self.hashes = BloomFilter(max(download_count * 2, self.exact_limit))
+            self.article_urls = BloomFilter(max(processed_count * 2, self.exact_limit))
+
+        for name in disk_files:
+            self._add_filename(name, 'filename_exists')
+
+        if repo:
+            self._add_download_rows(repo.iter_download_keys())
+            for article_url in repo.iter_processed_urls(statuses=SKIP_ARTICLE_STATUSES,
+                                                        since=processed_cutoff()):
+                self.article_urls.add(article_url)
+
+        debug_log(
+            f"중복 인덱스 적재: 파일 {download_count + len(disk_files)}개, 게시글 {processed_count}개 "
+            f"({'집합' if self.exact else 'Bloom 필터'})", 'INFO'
+        )
+        return self
+
+    # --- 내부 갱신 ---
+
+    def _mark_refreshed(self):
+        self._refreshed_at = time.monotonic()
+        # 초 단위 timestamp 경계의 기록을 놓치지 않도록 다음 동기화는 이 시각부터 (>=) 다시 읽음
+        self._refreshed_until = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def _add_download_rows(self, rows):
+        for filename, file_hash, article_url, article_title, timestamp in rows:
+            self._add_filename(filename, 'filename_in_db')
+            if file_hash:
+                self._add_hash(file_hash, {
+                    'filename': filename,
+                    'article_title': article_title,
+                    'timestamp': timestamp
+                })
+
+    def _refresh_from_db(self):
+        """
+        마지막 동기화 이후 다른 워커가 기록한 다운로드를 인덱스에 반영
+        (DEDUPE_DB_REFRESH_SECONDS 간격을 넘었을 때만)
+
+        Returns:
+            bool: 동기화했으면 True
+        """
+        if not USE_DATABASE or DEDUPE_DB_REFRESH_SECONDS <= 0:
+            return False
+        if time.monotonic() - self._refreshed_at < DEDUPE_DB_REFRESH_SECONDS:
+            return False
+
+        since = self._refreshed_until
+        self._mark_refreshed()
+        try:
+            self._add_download_rows(get_repository().iter_download_keys(since=since))
+        except Exception as e:
+            debug_log("중복 인덱스 DB 동기화 실패", 'WARNING', e)
+            return False
+        return True
+
+    def _add_filename(self, filename, reason):
+        if self.exact:
+            # DB 기록이 있으면 DB 사유 우선 (기존 check_duplicate 순서와 동일)
+            if self.filenames.get(filename) != 'filename_in_db':
+                self.filenames[filename] = reason
+        else:
+            self.filenames.add(filename)
+
+    def _add_hash(self, file_hash, info):
+        if self.exact:
+            self.hashes.setdefault(file_hash, info)
+        else:
+            self.hashes.add(file_hash)
+
+    # --- 조회 ---
+
+    def filename_duplicate_reason(self, filename):
+        """
+        파일명 중복 사유
+
+        Returns:
+            str or None: 'filename_in_db' / 'filename_exists' / None
+        """
+        if self.exact:
+            return self.filenames.get(filename)
+
+        if filename not in self.filenames:
+            return None
+
+        # Bloom 필터 '있음'은 오탐일 수 있으므로 확인
+        if USE_DATABASE and is_duplicate_by_filename(filename):
+            return 'filename_in_db'
+        if os.path.exists(os.path.join(self.download_dir, filename)):
+            return 'filename_exists'
+        return None
+
+    def find_hash(self, file_hash):
+        """
+        해시 중복 정보
+
+        Returns:
+            dict or None: 중복 파일 정보
+        """
+        if self.exact:
+            info = self.hashes.get(file_hash)
+            if info or not self._refresh_from_db():
+                return info
+            # 다른 워커 프로세스가 그 사이 기록한 해시일 수 있음 (간격마다 새 기록만 반영)
+            return self.hashes.get(file_hash)
+
+        if file_hash not in self.hashes:
+            return None
+        return is_duplicate_by_hash(file_hash) if USE_DATABASE else None
+
+    def has_article(self, article_url):
+        """유효 기간 안에 성공적으로 처리된 게시글 URL인지 확인"""
+        if article_url not in self.article_urls:
+            return False
+        if self.exact:
+            return True
+        if not USE_DATABASE:
+            return False
+        processed = is_article_processed(article_url)
+        return bool(processed and processed['status'] in SKIP_ARTICLE_STATUSES
+                    and processed['timestamp'] >= processed_cutoff())
+
+    # --- 기록 시 갱신 ---
+
+    def add_download(self, filename, file_hash=None, article_title=None, timestamp=None):
+        """다운로드 기록과 함께 호출"""
+        self._add_filename(filename, 'filename_in_db' if USE_DATABASE else 'filename_exists')
+        if file_hash:
+            self._add_hash(file_hash, {
+                'filename': filename,
+                'article_title': article_title,
+                'timestamp': timestamp
+            })
+
+    def add_article(self, article_url, status='success'):
+        """게시글 처리 기록과 함께 호출 (건너뛸 상태일 때만 인덱스에 추가)"""
+        if status in SKIP_ARTICLE_STATUSES:
+            self.article_urls.add(article_url)
+
+
+# 프로세스당 하나 (첫 사용 시 적재)
+_index = None
+
+
+def get_dedupe_index():
+    """
+    공용 중복 인덱스 반환
+
+    Returns:
+        DedupeIndex
+    """
+    global _index
+
+    if _index is None:
+        _index = DedupeIndex().load()
+
+    return _index
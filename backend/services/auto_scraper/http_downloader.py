@@ -0,0 +1,243 @@
+"""
+범용 PDF 자동 스크래퍼 ver1.5 - HTTP 직접 다운로드
+
+ver1.5 새로운 기능:
+- URL이 있는 전략(direct_link, iframe/embed/object 등)은 브라우저 클릭 없이 HTTP로 바로 다운로드
+- 브라우저 쿠키 + User-Agent + Referer를 그대로 사용 (로그인/세션 유지)
+- 연결 풀을 재사용하는 requests.Session (게시글마다 새 연결 생성 안 함)
+- 스트리밍 저장 중 첫 바이트에서 %PDF 헤더 검증 (PDF가 아니면 즉시 중단 → 브라우저로 폴백)
+- Content-Disposition 헤더 기반 파일명 추출
+- 스트리밍 중 SHA256 계산, 이미 받은 내용이면 임시 파일만 지우고 다운로드 폴더에 쓰지 않음
+"""
+
+import os
+import hashlib
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+
+from config import *
+from utils import (
+    debug_log, normalize_filename, extract_filename_from_url,
+    extract_filename_from_content_disposition, generate_fallback_filename
+)
+from dedupe_index import get_dedupe_index
+from download_tracker import move_to_unique_path
+
+# 프로세스당 하나의 세션 (연결 풀 재사용)
+_session = None
+
+
+def get_http_session():
+    """
+    연결 풀이 설정된 공용 requests.Session 반환
+
+    Returns:
+        requests.Session
+    """
+    global _session
+
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+
+    return _session
+
+
+def sync_browser_session(driver, session=None):
+    """
+    브라우저 쿠키와 User-Agent를 HTTP 세션에 복사
+
+    Args:
+        driver: WebDriver 객체
+        session: requests.Session (기본값: 공용 세션)
+
+    Returns:
+        requests.Session
+    """
+    session = session or get_http_session()
+
+    try:
+        user_agent = driver.execute_script("return navigator.userAgent") or USER_AGENT
+    except Exception:
+        user_agent = USER_AGENT
+    session.headers['User-Agent'] = user_agent
+
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie['name'], cookie['value'],
+            domain=cookie.get('domain'), path=cookie.get('path', '/')
+        )
+
+    return session
+
+
+def is_http_url(url):
+    """http/https URL인지 확인 (javascript:, # 등 제외)"""
+    return bool(url) and urlparse(url).scheme in ('http', 'https')
+
+
+def _decode_header(value):
+    """
+    latin-1로 잘못 해석된 한글 헤더 복원 (UTF-8 → EUC-KR 순서로 시도)
+
+    Args:
+        value: 헤더 문자열
+
+    Returns:
+        str: 복원된 문자열
+    """
+    try:
+        raw = value.encode('latin-1')
+    except UnicodeEncodeError:
+        return value
+
+    for encoding in ('utf-8', 'euc-kr'):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+
+    return value
+
+
+def _resolve_filename(response, fallback_name=None, article_title=''):
+    """
+    응답에서 저장할 파일명 결정 (Content-Disposition → URL → 예상 파일명 → 대체 파일명)
+
+    Args:
+        response: requests.Response
+        fallback_name: 전략에서 추출한 예상 파일명
+        article_title: 게시글 제목
+
+    Returns:
+        str: 파일명
+    """
+    content_disposition = response.headers.get('Content-Disposition')
+    filename = None
+
+    if content_disposition:
+        filename = extract_filename_from_content_disposition(
+            {'Content-Disposition': _decode_header(content_disposition)}
+        )
+
+    if not filename:
+        filename = extract_filename_from_url(response.url)
+
+    if not filename:
+        filename = fallback_name or generate_fallback_filename(article_title or 'download')
+
+    if not filename.lower().endswith('.pdf'):
+        filename = f"{os.path.splitext(filename)[0]}.pdf"
+
+    return normalize_filename(filename) if NORMALIZE_FILENAMES else filename
+
+
+def _chain(first_chunk, chunks):
+    """첫 청크 + 나머지 청크 (빈 청크 제외)"""
+    yield first_chunk
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+
+
+def download_via_http(driver, url, download_dir, fallback_name=None, article_title=''):
+    """
+    브라우저 세션으로 PDF를 HTTP 스트리밍 다운로드
+
+    Args:
+        driver: WebDriver 객체 (쿠키/User-Agent/Referer 제공)
+        url: 다운로드 URL
+        download_dir: 저장 폴더
+        fallback_name: 헤더/URL에 파일명이 없을 때 사용할 파일명
+        article_title: 게시글 제목 (대체 파일명용)
+
+    Returns:
+        dict: {"status": "success/duplicate/failed", "filename": ..., "filepath": ..., "size": ...,
+               "hash": ..., "reason": ...}
+    """
+    session = sync_browser_session(driver)
+    headers = {}
+    try:
+        headers['Referer'] = driver.current_url
+    except Exception:
+        pass
+
+    temp_path = None
+
+    try:
+        with session.get(url, headers=headers, stream=True, allow_redirects=True,
+                         timeout=(TIMEOUT['page_load'], TIMEOUT['download_wait'])) as response:
+            if response.status_code != 200:
+                return {'status': 'failed', 'reason': f'http_{response.status_code}'}
+
+            chunks = response.iter_content(chunk_size=HTTP_CHUNK_SIZE)
+            first_chunk = b''
+            for chunk in chunks:
+                if chunk:
+                    first_chunk = chunk
+                    break
+
+            # 스트리밍 시작 시점에 PDF 헤더 검증 (HTML 오류 페이지 등은 저장하지 않음)
+            if not first_chunk.startswith(PDF_HEADER):
+                debug_log(f"HTTP 응답이 PDF가 아님, 브라우저로 폴백: {url[:80]}", 'DEBUG')
+                return {'status': 'failed', 'reason': 'not_pdf'}
+
+            filename = _resolve_filename(response, fallback_name, article_title)
+            os.makedirs(download_dir, exist_ok=True)
+            file_path = os.path.join(download_dir, filename)
+            temp_path = file_path + '.part'
+
+            size = 0
+            sha256_hash = hashlib.sha256()
+            with open(temp_path, 'wb') as f:
+                for chunk in _chain(first_chunk, chunks):
+                    f.write(chunk)
+                    sha256_hash.update(chunk)
+                    size += len(chunk)
+
+        if size <= MIN_PDF_SIZE:
+            os.remove(temp_path)
+            return {'status': 'failed', 'reason': 'too_small'}
+
+        # 같은 내용을 이미 받았으면 임시 파일만 지우고 끝 (다운로드 폴더에 쓰지 않음)
+        file_hash = sha256_hash.hexdigest()
+        if USE_HASH_CHECK:
+            dup_info = get_dedupe_index().find_hash(file_hash)
+            if dup_info:
+                os.remove(temp_path)
+                debug_log(f"HTTP 다운로드 내용 중복: {filename} = {dup_info['filename']}", 'INFO')
+                return {
+                    'status': 'duplicate',
+                    'filename': filename,
+                    'hash': file_hash,
+                    'duplicate_info': dup_info,
+                    'transport': 'http'
+                }
+
+        # 헤더/URL 파일명은 앞서 확인한 이름과 다를 수 있음: 같은 이름의 다른 PDF를 덮어쓰지 않음
+        file_path = move_to_unique_path(temp_path, download_dir, filename)
+        temp_path = None
+        filename = os.path.basename(file_path)
+        file_size_mb = size / (1024 * 1024)
+        debug_log(f"HTTP 다운로드 완료: {filename} ({file_size_mb:.2f} MB)", 'INFO')
+
+        return {
+            'status': 'success',
+            'filename': filename,
+            'filepath': file_path,
+            'size': f"{file_size_mb:.2f} MB",
+            'hash': file_hash,
+            'transport': 'http'
+        }
+
+    except Exception as e:
+        debug_log(f"HTTP 다운로드 실패, 브라우저로 폴백: {url[:80]}", 'DEBUG', e)
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return {'status': 'failed', 'reason': str(e)}
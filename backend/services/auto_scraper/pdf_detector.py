@@ -21,8 +21,8 @@ ver1.3 기능 유지:
 
 import re
 import os
-import time
 import json
+from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -30,10 +30,13 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from config import *
 from utils import (
-    debug_log, wait_for_page_stable, wait_for_download_completion, is_safe_element,
+    debug_log, wait_for_page_stable, wait_for_new_window, track_download, is_safe_element,
     calculate_file_hash, normalize_filename, extract_filename_from_url,
     generate_fallback_filename, is_already_downloaded
 )
+from http_downloader import download_via_http, is_http_url
+from dedupe_index import get_dedupe_index
+from pdf_store import get_pdf_store
 
 # ver1.4: 빠른 모드 함수 export
 __all__ = ['auto_detect_and_download_all', 'auto_detect_and_download_fast',
@@ -44,7 +47,6 @@ __all__ = ['auto_detect_and_download_all', 'auto_detect_and_download_fast',
 if USE_DATABASE:
     try:
         from database import (
-            is_duplicate_by_filename, is_duplicate_by_hash,
             is_duplicate_by_url_filename, add_download_record as db_add_download_record
         )
     except ImportError:
@@ -941,7 +943,7 @@ def extract_filename_from_strategy(strategy, article_title=''):
 # ver1.1: 다중 PDF 다운로드 지원
 # ============================================
 
-def check_duplicate(filename, file_path, article_url):
+def check_duplicate(filename, file_path, article_url, file_hash=None):
     """
     중복 체크 (파일명 + 해시)
 
@@ -949,36 +951,31 @@ def check_duplicate(filename, file_path, article_url):
         filename: 파일명
         file_path: 파일 경로 (다운로드 후)
         article_url: 게시글 URL
+        file_hash: 이미 계산된 SHA256 (ver1.5: HTTP 다운로드는 스트리밍 중 계산)
 
     Returns:
-        dict: {"is_duplicate": bool, "reason": str, "duplicate_info": dict}
+        dict: {"is_duplicate": bool, "reason": str, "duplicate_info": dict, "file_hash": str}
     """
-    # 1. 파일명 기반 체크
-    if USE_FILENAME_CHECK:
-        if USE_DATABASE and is_duplicate_by_filename(filename):
-            debug_log(f"DB 파일명 중복: {filename}", 'INFO')
-            return {
-                'is_duplicate': True,
-                'reason': 'filename_in_db',
-                'duplicate_info': {'filename': filename}
-            }
+    index = get_dedupe_index()
 
-        # 파일 시스템 체크
-        download_path = os.path.join(DOWNLOAD_DIR, filename)
-        if os.path.exists(download_path):
-            debug_log(f"파일 시스템 중복: {filename}", 'INFO')
+    # 1. 파일명 기반 체크 (ver1.5: DB/파일 시스템 대신 메모리 인덱스)
+    if USE_FILENAME_CHECK:
+        reason = index.filename_duplicate_reason(filename)
+        if reason:
+            debug_log(f"{'DB' if reason == 'filename_in_db' else '파일 시스템'} 파일명 중복: {filename}", 'INFO')
             return {
                 'is_duplicate': True,
-                'reason': 'filename_exists',
+                'reason': reason,
                 'duplicate_info': {'filename': filename}
             }
 
     # 2. 해시 기반 체크 (다운로드 후)
     if USE_HASH_CHECK and file_path and os.path.exists(file_path):
-        file_hash = calculate_file_hash(file_path)
+        # ver1.5: 파일당 한 번만 계산 (결과의 file_hash를 기록에 재사용)
+        file_hash = file_hash or calculate_file_hash(file_path)
 
-        if file_hash and USE_DATABASE:
-            dup_info = is_duplicate_by_hash(file_hash)
+        if file_hash:
+            dup_info = index.find_hash(file_hash)
             if dup_info:
                 debug_log(f"해시 중복 발견: {dup_info['filename']}", 'INFO')
 
@@ -993,87 +990,99 @@ def check_duplicate(filename, file_path, article_url):
                 return {
                     'is_duplicate': True,
                     'reason': 'hash_duplicate',
-                    'duplicate_info': dup_info
+                    'duplicate_info': dup_info,
+                    'file_hash': file_hash
                 }
 
     return {
         'is_duplicate': False,
         'reason': None,
-        'duplicate_info': None
+        'duplicate_info': None,
+        'file_hash': file_hash
     }
 
 
-def execute_download_strategy(driver, strategy, download_dir):
+def execute_download_strategy(driver, strategy, download_dir, expected_filename=None, article_title=''):
     """
     전략 실행 및 다운로드
     ver1.1: 새 창 자동 감지 및 닫기 기능 추가
+    ver1.5: URL이 있는 전략은 HTTP 직접 다운로드 우선 (실패 시 브라우저 클릭으로 폴백)
 
     Args:
         driver: WebDriver
         strategy: 다운로드 전략 dict
         download_dir: 다운로드 폴더
+        expected_filename: 예상 파일명 (HTTP 응답에 파일명이 없을 때 사용)
+        article_title: 게시글 제목
 
     Returns:
         dict: 다운로드 결과
     """
-    try:
-        before_files = set(os.listdir(download_dir))
-
-        # 현재 창 개수 저장 (새 창 감지용)
-        initial_windows = len(driver.window_handles)
-        current_window = driver.current_window_handle
-
-        # 전략 실행
-        if strategy['method'] == 'click':
-            element = strategy['element']
+    # ver1.5: HTTP 우선 다운로드 (JavaScript 핸들러만 브라우저 사용)
+    url = strategy.get('url')
+    if HTTP_FIRST_DOWNLOAD and is_http_url(url) and (
+            strategy['method'] == 'download_url' or strategy['type'] in HTTP_FIRST_STRATEGY_TYPES):
+        result = download_via_http(driver, url, download_dir,
+                                   fallback_name=expected_filename, article_title=article_title)
+        # 내용 중복은 브라우저로 다시 받지 않음
+        if result['status'] in ('success', 'duplicate'):
+            return result
+        debug_log(f"HTTP 다운로드 실패 ({result.get('reason')}), 브라우저로 재시도", 'DEBUG')
 
-            if not element.is_displayed() or not element.is_enabled():
-                return {'status': 'failed', 'reason': 'element_not_valid'}
-
-            try:
-                element.click()
-            except:
-                driver.execute_script("arguments[0].click();", element)
-
-            debug_log("요소 클릭 완료", 'DEBUG')
-
-            # 새 창 감지 및 처리 (CLOSE_NEW_WINDOWS 옵션)
-            if CLOSE_NEW_WINDOWS:
-                time.sleep(1)  # 새 창이 열릴 시간 대기
-
-                current_windows = len(driver.window_handles)
-
-                if current_windows > initial_windows:
-                    # 새 창이 열렸음
-                    debug_log(f"새 창 감지됨 ({current_windows - initial_windows}개), 닫고 복귀", 'INFO')
-
-                    # 모든 새 창 닫기
-                    for handle in driver.window_handles:
-                        if handle != current_window:
-                            try:
-                                driver.switch_to.window(handle)
-                                driver.close()
-                                debug_log(f"새 창 닫음", 'DEBUG')
-                            except:
-                                pass
-
-                    # 원래 창으로 복귀
-                    driver.switch_to.window(current_window)
-                    debug_log("원래 창으로 복귀", 'DEBUG')
-
-                    # 새 창이 열렸다는 것은 미리보기 버튼일 가능성 → 실패 처리
-                    return {'status': 'failed', 'reason': 'new_window_opened'}
-
-        elif strategy['method'] == 'download_url':
-            url = strategy['url']
-            driver.execute_script(f"window.open('{url}', '_blank');")
-            time.sleep(2)
-            driver.switch_to.window(driver.window_handles[0])
-
-        # 다운로드 대기
-        result = wait_for_download_completion(download_dir, timeout=TIMEOUT['download_wait'])
-
-        return result
+    try:
+        # ver1.5: 클릭 전에 추적 시작 (브라우저가 게시글 전용 임시 폴더로 다운로드)
+        with track_download(driver, download_dir) as job:
+            # 현재 창 개수 저장 (새 창 감지용)
+            initial_windows = len(driver.window_handles)
+            current_window = driver.current_window_handle
+
+            # 전략 실행
+            if strategy['method'] == 'click':
+                element = strategy['element']
+
+                if not element.is_displayed() or not element.is_enabled():
+                    return {'status': 'failed', 'reason': 'element_not_valid'}
+
+                try:
+                    element.click()
+                except:
+                    driver.execute_script("arguments[0].click();", element)
+
+                debug_log("요소 클릭 완료", 'DEBUG')
+
+                # 새 창 감지 및 처리 (CLOSE_NEW_WINDOWS 옵션)
+                if CLOSE_NEW_WINDOWS:
+                    # ver1.5: 고정 1초 대신 새 창이 열리면 바로 반환
+                    if wait_for_new_window(driver, initial_windows):
+                        current_windows = len(driver.window_handles)
+                        # 새 창이 열렸음
+                        debug_log(f"새 창 감지됨 ({current_windows - initial_windows}개), 닫고 복귀", 'INFO')
+
+                        # 모든 새 창 닫기
+                        for handle in driver.window_handles:
+                            if handle != current_window:
+                                try:
+                                    driver.switch_to.window(handle)
+                                    driver.close()
+                                    debug_log(f"새 창 닫음", 'DEBUG')
+                                except:
+                                    pass
+
+                        # 원래 창으로 복귀
+                        driver.switch_to.window(current_window)
+                        debug_log("원래 창으로 복귀", 'DEBUG')
+
+                        # 새 창이 열렸다는 것은 미리보기 버튼일 가능성 → 실패 처리
+                        return {'status': 'failed', 'reason': 'new_window_opened'}
+
+            elif strategy['method'] == 'download_url':
+                url = strategy['url']
+                driver.execute_script(f"window.open('{url}', '_blank');")
+                wait_for_new_window(driver, initial_windows)
+                driver.switch_to.window(current_window)
+
+            # 다운로드 대기
+            return job.wait(TIMEOUT['download_wait'])
 
     except Exception as e:
         debug_log(f"전략 실행 오류: {e}", 'WARNING')
@@ -1120,13 +1129,36 @@ def auto_detect_and_download_fast(driver, wait, download_dir, known_strategy, ar
 
     # 첫 번째 전략만 시도
     strategy = strategies[0]
-    result = execute_download_strategy(driver, strategy, download_dir)
+    result = execute_download_strategy(driver, strategy, download_dir, article_title=article_title)
+
+    if result['status'] == 'duplicate':
+        # ver1.5: HTTP 스트리밍 중 내용 중복 확인 (파일을 쓰지 않음)
+        get_pdf_store().register_name(result['filename'], result['hash'])
+        return {
+            'status': 'all_skipped',
+            'downloads': [],
+            'skipped': [{'filename': result['filename'], 'reason': 'hash_duplicate', 'strategy': known_strategy}],
+            'successful_strategy': None
+        }
 
     if result['status'] == 'success':
         # 파일명 추출
         expected_filename = extract_filename_from_strategy(strategy, article_title)
         actual_filename = result.get('filename', expected_filename)
-        file_hash = calculate_file_hash(result.get('filepath', '')) if USE_HASH_CHECK else None
+        file_hash = result.get('hash')
+        if USE_PDF_STORE:
+            stored = get_pdf_store().put(result['filepath'], file_hash)
+            if stored['duplicate']:
+                # 저장소에 같은 내용이 있음: 다운로드 폴더에 남기지 않고 중복으로 처리
+                return {
+                    'status': 'all_skipped',
+                    'downloads': [],
+                    'skipped': [{'filename': actual_filename, 'reason': 'hash_duplicate', 'strategy': known_strategy}],
+                    'successful_strategy': None
+                }
+            file_hash = stored['hash']
+        elif USE_HASH_CHECK and not file_hash:
+            file_hash = calculate_file_hash(result.get('filepath', ''))
 
         return {
             'status': 'success',
@@ -1297,16 +1329,33 @@ def auto_detect_and_download_all(driver, wait, download_dir, article_title='', a
                     continue
 
                 # 다운로드 실행
-                download_result = execute_download_strategy(driver, strategy, download_dir)
+                download_result = execute_download_strategy(driver, strategy, download_dir,
+                                                            expected_filename=expected_filename,
+                                                            article_title=article_title)
+
+                # ver1.5: HTTP 스트리밍 중 내용 중복 확인됨 (파일을 쓰지 않음)
+                if download_result['status'] == 'duplicate':
+                    get_pdf_store().register_name(download_result['filename'], download_result['hash'])
+                    skipped.append({
+                        'filename': download_result['filename'],
+                        'reason': 'hash_duplicate',
+                        'strategy': strategy['type']
+                    })
+                    if USE_STRATEGY_LEARNING:
+                        update_strategy_stats(board_url, strategy['type'], success=False)
+                    continue
 
                 if download_result['status'] == 'success':
                     filepath = download_result['filepath']
                     actual_filename = download_result['filename']
 
                     # 해시 기반 중복 체크
-                    dup_check_after = check_duplicate(actual_filename, filepath, article_url)
+                    dup_check_after = check_duplicate(actual_filename, filepath, article_url,
+                                                      file_hash=download_result.get('hash'))
 
                     if dup_check_after['is_duplicate']:
+                        if dup_check_after.get('file_hash'):
+                            get_pdf_store().register_name(actual_filename, dup_check_after['file_hash'])
                         skipped.append({
                             'filename': actual_filename,
                             'reason': dup_check_after['reason'],
@@ -1317,8 +1366,20 @@ def auto_detect_and_download_all(driver, wait, download_dir, article_title='', a
                             update_strategy_stats(board_url, strategy['type'], success=False)
                         continue
 
-                    # 성공 기록
-                    file_hash = calculate_file_hash(filepath) if USE_HASH_CHECK else None
+                    # 성공 기록 (ver1.5: 중복 체크에서 계산한 해시 재사용, 저장소에 해시 이름으로 저장)
+                    file_hash = dup_check_after.get('file_hash')
+                    if USE_PDF_STORE:
+                        stored = get_pdf_store().put(filepath, file_hash)
+                        if stored['duplicate']:
+                            skipped.append({
+                                'filename': actual_filename,
+                                'reason': 'hash_duplicate',
+                                'strategy': strategy['type']
+                            })
+                            if USE_STRATEGY_LEARNING:
+                                update_strategy_stats(board_url, strategy['type'], success=False)
+                            continue
+                        file_hash = stored['hash']
 
                     downloads.append({
                         'filename': actual_filename,
@@ -1340,6 +1401,10 @@ def auto_detect_and_download_all(driver, wait, download_dir, article_title='', a
                             method=strategy['type']
                         )
 
+                    # ver1.5: 메모리 중복 인덱스 갱신
+                    get_dedupe_index().add_download(actual_filename, file_hash, article_title,
+                                                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
                     # ver1.3: 성공한 전략 학습!
                     if USE_STRATEGY_LEARNING:
                         update_strategy_stats(board_url, strategy['type'], success=True)
@@ -1480,42 +1545,42 @@ def auto_detect_and_download(driver, wait, download_dir):
                             'confidence': strategy['confidence']
                         }
 
-                # 다운로드 시작 전 파일 목록 저장
-                before_files = set(os.listdir(download_dir))
-
-                # 전략 실행
-                if strategy['method'] == 'click':
-                    # 요소 클릭
-                    element = strategy['element']
-
-                    # 요소가 여전히 유효한지 확인
-                    if not element.is_displayed() or not element.is_enabled():
-                        debug_log("요소가 유효하지 않음, 다음 전략 시도", 'WARNING')
-                        continue
-
-                    # 클릭 시도
-                    try:
-                        element.click()
-                    except:
-                        # JavaScript 클릭 시도
-                        driver.execute_script("arguments[0].click();", element)
-
-                    debug_log("요소 클릭 완료", 'DEBUG')
-
-                elif strategy['method'] == 'download_url':
-                    # URL에서 직접 다운로드 (iframe/embed)
-                    url = strategy['url']
-                    debug_log(f"URL에서 직접 다운로드: {url}", 'DEBUG')
-
-                    # 새 탭에서 열어서 다운로드 트리거
-                    driver.execute_script(f"window.open('{url}', '_blank');")
-                    time.sleep(2)
-
-                    # 원래 탭으로 복귀
-                    driver.switch_to.window(driver.window_handles[0])
-
-                # 다운로드 대기
-                result = wait_for_download_completion(download_dir, timeout=TIMEOUT['download_wait'])
+                # ver1.5: 클릭 전에 추적 시작 (게시글 전용 임시 폴더)
+                with track_download(driver, download_dir) as job:
+                    # 전략 실행
+                    if strategy['method'] == 'click':
+                        # 요소 클릭
+                        element = strategy['element']
+
+                        # 요소가 여전히 유효한지 확인
+                        if not element.is_displayed() or not element.is_enabled():
+                            debug_log("요소가 유효하지 않음, 다음 전략 시도", 'WARNING')
+                            continue
+
+                        # 클릭 시도
+                        try:
+                            element.click()
+                        except:
+                            # JavaScript 클릭 시도
+                            driver.execute_script("arguments[0].click();", element)
+
+                        debug_log("요소 클릭 완료", 'DEBUG')
+
+                    elif strategy['method'] == 'download_url':
+                        # URL에서 직접 다운로드 (iframe/embed)
+                        url = strategy['url']
+                        debug_log(f"URL에서 직접 다운로드: {url}", 'DEBUG')
+
+                        # 새 탭에서 열어서 다운로드 트리거 (ver1.5: 고정 2초 대신 탭이 열리면 진행)
+                        initial_windows = len(driver.window_handles)
+                        driver.execute_script(f"window.open('{url}', '_blank');")
+                        wait_for_new_window(driver, initial_windows)
+
+                        # 원래 탭으로 복귀
+                        driver.switch_to.window(driver.window_handles[0])
+
+                    # 다운로드 대기
+                    result = job.wait(TIMEOUT['download_wait'])
 
                 if result['status'] == 'success':
                     debug_log(f"✅ 다운로드 성공: {strategy['type']}", 'INFO')
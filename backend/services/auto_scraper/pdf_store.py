@@ -0,0 +1,128 @@
+"""
+범용 PDF 자동 스크래퍼 ver1.5 - 내용 주소 PDF 저장소
+
+ver1.5 새로운 기능:
+- PDF를 SHA256 해시로 저장 (PDF_STORE_DIR/objects/ab/abcdef....pdf)
+- 다운로드 폴더의 원래 파일명은 저장소 객체를 가리키는 하드 링크 (추가 복사 없음)
+- 파일명 → 해시 색인 (SQLite pdf_names 테이블)
+- 같은 내용은 다시 쓰지 않음 (이미 있는 객체면 새 파일을 버리고 이름만 기록, 다운로드 폴더에도 남기지 않음)
+"""
+
+import os
+import shutil
+
+from config import *
+from utils import debug_log, calculate_file_hash
+
+if USE_DATABASE:
+    try:
+        from database import set_pdf_name, get_pdf_hash
+    except ImportError:
+        USE_DATABASE = False
+
+
+class PdfStore:
+    """
+    SHA256 기준 PDF 저장소
+
+    Args:
+        root: 저장소 폴더
+    """
+
+    def __init__(self, root=PDF_STORE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+
+    def object_path(self, file_hash):
+        """해시에 해당하는 객체 경로"""
+        return os.path.join(self.objects_dir, file_hash[:2], f"{file_hash}.pdf")
+
+    def contains(self, file_hash):
+        """같은 내용의 객체가 이미 저장되어 있는지 확인"""
+        return bool(file_hash) and os.path.exists(self.object_path(file_hash))
+
+    def register_name(self, filename, file_hash):
+        """파일명 → 해시 색인 기록"""
+        if USE_DATABASE and filename and file_hash:
+            set_pdf_name(filename, file_hash)
+
+    def lookup_name(self, filename):
+        """
+        파일명으로 저장소 객체 찾기
+
+        Returns:
+            str or None: 객체 경로
+        """
+        file_hash = get_pdf_hash(filename) if USE_DATABASE else None
+        return self.object_path(file_hash) if self.contains(file_hash) else None
+
+    def put(self, file_path, file_hash=None):
+        """
+        다운로드한 파일을 저장소로 옮기고, 원래 경로에는 하드 링크를 남김
+
+        같은 내용이 이미 저장되어 있으면 새 파일을 지우고 이름만 기록합니다.
+        다운로드 폴더에 링크를 남기면 RAG 수집이 같은 내용을 다시 읽기 때문입니다.
+
+        Args:
+            file_path: 다운로드한 파일 경로 (원래 파일명)
+            file_hash: 이미 계산된 SHA256 (없으면 한 번 계산)
+
+        Returns:
+            dict: {"hash": ..., "object_path": ..., "filepath": ... (중복이면 None), "duplicate": bool}
+        """
+        file_hash = file_hash or calculate_file_hash(file_path)
+        target = self.object_path(file_hash)
+        duplicate = os.path.exists(target)
+
+        if duplicate:
+            # 같은 내용이 이미 있음: 새로 받은 파일은 버리고 이름만 기존 객체에 연결
+            os.remove(file_path)
+            self.register_name(os.path.basename(file_path), file_hash)
+            debug_log(f"저장소 중복: {os.path.basename(file_path)} -> {file_hash[:16]}...", 'DEBUG')
+            return {
+                'hash': file_hash,
+                'object_path': target,
+                'filepath': None,
+                'duplicate': True
+            }
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(file_path, target)
+        except OSError:
+            # 다른 파일 시스템이면 이동(복사 후 삭제)
+            shutil.move(file_path, target)
+
+        try:
+            os.link(target, file_path)
+        except OSError as e:
+            debug_log(f"하드 링크 실패, 복사본으로 대체: {os.path.basename(file_path)}", 'WARNING', e)
+            shutil.copy2(target, file_path)
+
+        self.register_name(os.path.basename(file_path), file_hash)
+        debug_log(f"저장소 저장: {os.path.basename(file_path)} -> {file_hash[:16]}...", 'DEBUG')
+
+        return {
+            'hash': file_hash,
+            'object_path': target,
+            'filepath': file_path,
+            'duplicate': False
+        }
+
+
+_store = None
+
+
+def get_pdf_store():
+    """
+    공용 PDF 저장소 반환
+
+    Returns:
+        PdfStore
+    """
+    global _store
+
+    if _store is None:
+        _store = PdfStore()
+
+    return _store
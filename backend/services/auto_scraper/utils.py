@@ -26,8 +26,24 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    import psutil  # 브라우저 메모리 측정 (선택)
+except ImportError:
+    psutil = None
+
 from config import *
 
+# ver1.5: 공용 다운로드 추적기 (backend/services/download_tracker.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from download_tracker import track_download as _track_download
+# ver1.5: 공용 대기 도구 (backend/services/smart_wait.py)
+from smart_wait import (
+    wait_for_selector, wait_for_quiet, format_wait_stats,
+    wait_for_navigation as _wait_for_navigation,
+    wait_for_new_window as _wait_for_new_window,
+    save_wait_stats as _save_wait_stats
+)
+
 
 # ============================================
 # ver1.4.1: 개인정보 보호 (정보통신망법 준수)
@@ -196,10 +212,73 @@ def debug_log(message, level='INFO', error=None):
 # Selenium 드라이버 설정
 # ============================================
 
+# ver1.5: ChromeDriverManager().install() 결과 (프로세스 내 캐시)
+_driver_path = None
+
+
+def get_chromedriver_path():
+    """
+    chromedriver 경로 반환 (버전 확인은 DRIVER_PATH_CACHE_DAYS마다 한 번)
+
+    프로세스 안에서는 메모리에, 프로세스 간(워커/재실행)에는 DRIVER_PATH_CACHE_FILE에 캐시합니다.
+
+    Returns:
+        str: chromedriver 실행 파일 경로
+    """
+    global _driver_path
+
+    if _driver_path and os.path.exists(_driver_path):
+        return _driver_path
+
+    try:
+        with open(DRIVER_PATH_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        age_days = (time.time() - cached['checked_at']) / 86400
+        if age_days < DRIVER_PATH_CACHE_DAYS and os.path.exists(cached['path']):
+            _driver_path = cached['path']
+            return _driver_path
+    except (IOError, ValueError, KeyError):
+        pass
+
+    _driver_path = ChromeDriverManager().install()
+    debug_log(f"chromedriver 경로 확인: {_driver_path}", 'DEBUG')
+
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        with open(DRIVER_PATH_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'path': _driver_path, 'checked_at': time.time()}, f)
+    except IOError as e:
+        debug_log("chromedriver 경로 캐시 저장 실패", 'WARNING', e)
+
+    return _driver_path
+
+
+def get_blocked_url_patterns():
+    """
+    CDP Network.setBlockedURLs에 넘길 차단 패턴 (BLOCKED_RESOURCE_TYPES + BLOCKED_DOMAINS)
+
+    Returns:
+        list: URL 패턴 목록
+    """
+    patterns = []
+
+    for resource_type in BLOCKED_RESOURCE_TYPES:
+        if resource_type == 'image' and not BLOCK_IMAGES:
+            continue
+        patterns.extend(RESOURCE_TYPE_URL_PATTERNS.get(resource_type, []))
+
+    if BLOCK_ADS:
+        patterns.extend(f"*{domain}*" for domain in BLOCKED_DOMAINS)
+
+    return patterns
+
+
 def setup_driver(download_dir=None):
     """
     Selenium WebDriver 설정 (안티봇 우회 포함)
 
+    ver1.5: 캐시된 chromedriver 경로, 리소스 차단(prefs + CDP), headless, pageLoadStrategy 적용
+
     Args:
         download_dir: PDF 다운로드 폴더 경로
 
@@ -221,6 +300,11 @@ def setup_driver(download_dir=None):
         "download.prompt_for_download": False,
         "download.directory_upgrade": True
     }
+
+    # ver1.5: 이미지 차단 (렌더러 수준, CDP 차단과 함께 적용)
+    if BLOCK_IMAGES and 'image' in BLOCKED_RESOURCE_TYPES:
+        prefs["profile.managed_default_content_settings.images"] = 2
+
     chrome_options.add_experimental_option("prefs", prefs)
 
     # 안티봇 우회 설정
@@ -234,11 +318,16 @@ def setup_driver(download_dir=None):
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
 
-    # Headless 모드 (필요시 주석 해제)
-    # chrome_options.add_argument("--headless")
+    # ver1.5: DOMContentLoaded 시점에 driver.get() 반환
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+
+    # Headless 모드
+    if HEADLESS_MODE:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
 
     try:
-        service = Service(ChromeDriverManager().install())
+        service = Service(get_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
 
         # WebDriver 감지 우회
@@ -250,6 +339,12 @@ def setup_driver(download_dir=None):
             '''
         })
 
+        # ver1.5: 네트워크 단계에서 리소스/광고 요청 차단
+        blocked_patterns = get_blocked_url_patterns()
+        if blocked_patterns:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_patterns})
+
         debug_log("Selenium 드라이버 설정 완료", 'INFO')
         return driver
 
@@ -266,125 +361,155 @@ def restart_browser(old_driver, download_dir=None):
     except:
         pass
 
-    time.sleep(2)
+    # ver1.5: quit()이 크롬 프로세스 종료까지 기다리므로 추가 대기 없음
     new_driver = setup_driver(download_dir)
     debug_log("브라우저 재시작 완료", 'INFO')
     return new_driver
 
 
+def get_browser_memory_mb(driver):
+    """
+    브라우저 메모리 사용량 측정 (MB)
+
+    psutil이 있으면 chromedriver 아래 크롬 프로세스 전체의 RSS 합계,
+    없으면 현재 페이지의 JS 힙 크기(performance.memory)를 사용합니다.
+
+    Args:
+        driver: WebDriver 객체
+
+    Returns:
+        float or None: 측정값 (측정 불가 시 None)
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            total = sum(proc.memory_info().rss for proc in root.children(recursive=True))
+            return total / (1024 * 1024)
+        except Exception as e:
+            debug_log("브라우저 프로세스 메모리 측정 실패", 'DEBUG', e)
+
+    try:
+        used = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : null")
+        return used / (1024 * 1024) if used else None
+    except Exception:
+        return None
+
+
+def should_restart_browser(driver, processed_count):
+    """
+    브라우저 재시작 필요 여부 (ver1.5: 고정 개수 대신 측정한 메모리 기준)
+
+    Args:
+        driver: WebDriver 객체
+        processed_count: 현재 브라우저로 처리한 게시글 수
+
+    Returns:
+        bool: 재시작이 필요하면 True
+    """
+    if processed_count <= 0 or processed_count % BROWSER_MEMORY_CHECK_INTERVAL != 0:
+        return False
+
+    memory_mb = get_browser_memory_mb(driver)
+    if memory_mb is None:
+        # 측정 불가: 기존 고정 주기로 대체
+        return processed_count % BROWSER_RESTART_INTERVAL == 0
+
+    debug_log(f"브라우저 메모리: {memory_mb:.0f} MB (한도 {BROWSER_MEMORY_LIMIT_MB} MB)", 'DEBUG')
+    return memory_mb >= BROWSER_MEMORY_LIMIT_MB
+
+
 # ============================================
-# 페이지 안정화 대기
+# 페이지 안정화 대기 (ver1.5: 스마트 대기)
 # ============================================
 
-def wait_for_page_stable(driver, timeout=None, stable_time=2):
+def wait_for_page_stable(driver, timeout=None, quiet_ms=None, selector=None):
     """
-    페이지가 완전히 로드되고 안정화될 때까지 대기
+    페이지가 안정화될 때까지 대기
+
+    ver1.5: 0.5초 간격 DOM 개수 폴링 대신 DOM 변경/리소스 요청이
+    quiet_ms 동안 없으면 바로 반환 (smart_wait.wait_for_quiet)
 
     Args:
         driver: WebDriver 객체
         timeout: 최대 대기 시간 (초)
-        stable_time: 안정화 판단 시간 (초)
+        quiet_ms: 안정화 판단 시간 (밀리초)
+        selector: 먼저 기다릴 CSS 선택자 (선택)
 
     Returns:
         bool: 성공 여부
     """
     if timeout is None:
         timeout = TIMEOUT['page_stable']
-
-    debug_log(f"페이지 안정화 대기 중 (timeout: {timeout}s)", 'DEBUG')
+    if quiet_ms is None:
+        quiet_ms = WAIT_QUIET_MS
 
     start_time = time.time()
-    last_dom_size = 0
-    stable_count = 0
 
-    while time.time() - start_time < timeout:
-        try:
-            # 페이지 로딩 상태 확인
-            ready_state = driver.execute_script("return document.readyState")
-            if ready_state != "complete":
-                debug_log("페이지 로딩 중...", 'VERBOSE')
-                time.sleep(0.5)
-                continue
-
-            # DOM 안정성 확인
-            current_dom_size = driver.execute_script("return document.getElementsByTagName('*').length")
-
-            if current_dom_size == last_dom_size:
-                stable_count += 1
-                if stable_count >= stable_time:
-                    debug_log(f"페이지 안정화 완료 ({time.time() - start_time:.1f}s)", 'DEBUG')
-                    return True
-            else:
-                stable_count = 0
-                last_dom_size = current_dom_size
-                debug_log(f"DOM 변경 감지 (요소: {current_dom_size}개)", 'VERBOSE')
-
-            time.sleep(0.5)
+    if selector and wait_for_selector(driver, selector, timeout=timeout) is None:
+        debug_log(f"요소 대기 타임아웃: {selector} ({timeout}s)", 'WARNING')
+        return False
 
-        except Exception as e:
-            debug_log(f"페이지 안정성 확인 오류", 'WARNING', e)
-            time.sleep(0.5)
+    debug_log(f"페이지 안정화 대기 중 (timeout: {timeout}s)", 'DEBUG')
+
+    remaining = max(0.1, timeout - (time.time() - start_time))
+    if wait_for_quiet(driver, timeout=remaining, quiet_ms=quiet_ms):
+        debug_log(f"페이지 안정화 완료 ({time.time() - start_time:.1f}s)", 'DEBUG')
+        return True
 
     debug_log(f"페이지 안정화 타임아웃 ({timeout}s)", 'WARNING')
     return False
 
 
+def wait_for_navigation(driver, old_element, timeout=None):
+    """클릭 후 이전 페이지가 사라질 때까지 대기 (고정 sleep 대체, 최대 WAIT_NAVIGATION_TIMEOUT초)"""
+    return _wait_for_navigation(driver, old_element, timeout or WAIT_NAVIGATION_TIMEOUT)
+
+
+def wait_for_new_window(driver, initial_count, timeout=None):
+    """새 창이 열릴 때까지 대기 (고정 sleep 대체, 최대 WAIT_NEW_WINDOW_TIMEOUT초)"""
+    return _wait_for_new_window(driver, initial_count, timeout or WAIT_NEW_WINDOW_TIMEOUT)
+
+
+def save_wait_stats():
+    """이번 실행의 사이트별 대기 시간을 WAIT_STATS_FILE에 한 줄로 추가"""
+    try:
+        _save_wait_stats(WAIT_STATS_FILE)
+    except IOError as e:
+        debug_log("대기 시간 통계 저장 실패", 'WARNING', e)
+
+
+def display_wait_stats(limit=5):
+    """대기 시간이 긴 사이트 출력"""
+    lines = format_wait_stats(limit)
+    if lines:
+        print("⏳ 사이트별 대기 시간:")
+        for line in lines:
+            print(f"   {line}")
+
+
 # ============================================
 # 다운로드 관리
 # ============================================
 
-def wait_for_download_completion(download_dir, expected_filename=None, timeout=None):
+def track_download(driver, download_dir):
     """
-    파일 다운로드 완료 대기 및 검증
+    다운로드 한 건 추적 (ver1.5: 폴더 폴링 대신 게시글별 임시 폴더 + 파일 이벤트)
+
+    다운로드를 일으키는 클릭 전에 진입해야 브라우저가 임시 폴더로 받습니다.
 
     Args:
+        driver: WebDriver 객체
         download_dir: 다운로드 폴더
-        expected_filename: 예상 파일명 (선택)
-        timeout: 최대 대기 시간 (초)
 
     Returns:
-        dict: {"status": "success/timeout", "filename": "...", "filepath": "..."}
-    """
-    if timeout is None:
-        timeout = TIMEOUT['download_wait']
-
-    start_time = time.time()
-    initial_files = set(os.listdir(download_dir))
-
-    debug_log("다운로드 완료 대기 중...", 'DEBUG')
-
-    while time.time() - start_time < timeout:
-        current_files = set(os.listdir(download_dir))
-        new_files = current_files - initial_files
+        컨텍스트 매니저 (DownloadJob, job.wait(timeout)으로 결과 dict 반환)
 
-        # 다운로드 중인 파일 제외 (.crdownload, .tmp, .part)
-        completed_downloads = [f for f in new_files if not f.endswith(('.crdownload', '.tmp', '.part'))]
-
-        if completed_downloads:
-            latest_file = max(completed_downloads, key=lambda f: os.path.getctime(os.path.join(download_dir, f)))
-            file_path = os.path.join(download_dir, latest_file)
-
-            # 파일 크기 및 PDF 검증
-            if os.path.getsize(file_path) > MIN_PDF_SIZE:
-                try:
-                    with open(file_path, 'rb') as f:
-                        header = f.read(4)
-                        if header == PDF_HEADER:
-                            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-                            debug_log(f"다운로드 완료: {latest_file} ({file_size_mb:.2f} MB)", 'INFO')
-                            return {
-                                "status": "success",
-                                "filename": latest_file,
-                                "filepath": file_path,
-                                "size": f"{file_size_mb:.2f} MB"
-                            }
-                except Exception as e:
-                    debug_log(f"PDF 검증 실패", 'WARNING', e)
-
-        time.sleep(1)
-
-    debug_log("다운로드 타임아웃", 'WARNING')
-    return {"status": "timeout", "message": "다운로드 시간 초과"}
+    Example:
+        with track_download(driver, download_dir) as job:
+            element.click()
+            result = job.wait(TIMEOUT['download_wait'])
+    """
+    return _track_download(driver, download_dir, min_size=MIN_PDF_SIZE, pdf_header=PDF_HEADER)
 
 
 def is_already_downloaded(filename, download_dir=None):
@@ -432,92 +557,167 @@ def get_safe_filename(text, max_length=100):
 # 로그 파일 관리
 # ============================================
 
-def load_download_log():
-    """다운로드 로그 불러오기"""
-    if os.path.exists(DOWNLOAD_LOG_FILE):
-        try:
-            with open(DOWNLOAD_LOG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            debug_log("다운로드 로그 읽기 오류", 'ERROR', e)
+# ver1.5: 프로세스 내 누적 개수 (최초 사용 시 한 번만 파일 줄 수를 셈)
+_log_counts = {}
 
-    return {
-        "last_updated": None,
-        "total_downloaded": 0,
-        "downloads": []
-    }
+
+def _append_jsonl(path, record):
+    """JSON Lines 파일에 레코드 한 줄 추가 (기존 내용은 읽지 않음)"""
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return True
+    except Exception as e:
+        debug_log(f"로그 기록 실패: {os.path.basename(path)}", 'ERROR', e)
+        return False
 
 
-def save_download_log(log_data):
-    """다운로드 로그 저장"""
-    log_data["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def _read_jsonl(path):
+    """JSON Lines 파일의 레코드 목록 (깨진 줄은 건너뜀)"""
+    records = []
+    if not os.path.exists(path):
+        return records
 
     try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except IOError as e:
+        debug_log(f"로그 읽기 오류: {os.path.basename(path)}", 'ERROR', e)
+
+    return records
+
+
+def _convert_legacy_log(legacy_path, path, key):
+    """구버전 JSON 로그가 있고 JSON Lines 로그가 없으면 한 번 변환"""
+    if os.path.exists(path) or not os.path.exists(legacy_path):
+        return
+
+    try:
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            records = json.load(f).get(key, [])
         os.makedirs(LOG_DIR, exist_ok=True)
-        with open(DOWNLOAD_LOG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        debug_log("다운로드 로그 저장 실패", 'ERROR', e)
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        debug_log(f"구버전 로그 변환: {os.path.basename(legacy_path)} → {os.path.basename(path)} ({len(records)}건)", 'INFO')
+    except (json.JSONDecodeError, IOError, AttributeError) as e:
+        debug_log(f"구버전 로그 변환 실패: {os.path.basename(legacy_path)}", 'WARNING', e)
+
+
+def _log_count(path, legacy_path, key):
+    """로그 레코드 수 (메모리 카운터)"""
+    if path not in _log_counts:
+        _convert_legacy_log(legacy_path, path, key)
+        count = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                count = sum(1 for line in f if line.strip())
+        _log_counts[path] = count
+    return _log_counts[path]
+
+
+def get_download_count():
+    """누적 다운로드 기록 수"""
+    return _log_count(DOWNLOAD_LOG_FILE, LEGACY_DOWNLOAD_LOG_FILE, 'downloads')
+
+
+def get_failure_count():
+    """누적 실패 기록 수"""
+    return _log_count(FAILED_LOG_FILE, LEGACY_FAILED_LOG_FILE, 'failures')
+
+
+def load_download_log():
+    """
+    다운로드 로그 불러오기 (구버전 JSON 형식으로 조립)
+
+    전체 파일을 읽으므로 내보내기/조회용으로만 사용하고,
+    진행 중 개수는 get_download_count()를 사용합니다.
+    """
+    get_download_count()
+    downloads = _read_jsonl(DOWNLOAD_LOG_FILE)
+
+    return {
+        "last_updated": downloads[-1].get("timestamp") if downloads else None,
+        "total_downloaded": len(downloads),
+        "downloads": downloads
+    }
 
 
 def add_download_record(title, filename, url, size, method):
-    """다운로드 기록 추가"""
-    log_data = load_download_log()
+    """다운로드 기록 추가 (ver1.5: 한 줄 추가)"""
+    count = get_download_count()
 
-    log_data["downloads"].append({
+    if _append_jsonl(DOWNLOAD_LOG_FILE, {
         "title": title,
         "filename": filename,
         "url": url,
         "size": size,
         "method": method,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
-
-    log_data["total_downloaded"] = len(log_data["downloads"])
-    save_download_log(log_data)
+    }):
+        _log_counts[DOWNLOAD_LOG_FILE] = count + 1
 
 
 def load_failed_log():
-    """실패 로그 불러오기"""
-    if os.path.exists(FAILED_LOG_FILE):
-        try:
-            with open(FAILED_LOG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            debug_log("실패 로그 읽기 오류", 'ERROR', e)
+    """실패 로그 불러오기 (구버전 JSON 형식으로 조립)"""
+    get_failure_count()
+    failures = _read_jsonl(FAILED_LOG_FILE)
 
     return {
-        "last_updated": None,
-        "total_failed": 0,
-        "failures": []
+        "last_updated": failures[-1].get("timestamp") if failures else None,
+        "total_failed": len(failures),
+        "failures": failures
     }
 
 
-def save_failed_log(log_data):
-    """실패 로그 저장"""
-    log_data["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    try:
-        os.makedirs(LOG_DIR, exist_ok=True)
-        with open(FAILED_LOG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        debug_log("실패 로그 저장 실패", 'ERROR', e)
-
-
 def add_failure_record(title, url, reason):
-    """실패 기록 추가"""
-    log_data = load_failed_log()
+    """실패 기록 추가 (ver1.5: 한 줄 추가)"""
+    count = get_failure_count()
 
-    log_data["failures"].append({
+    if _append_jsonl(FAILED_LOG_FILE, {
         "title": title,
         "url": url,
         "reason": reason,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    }):
+        _log_counts[FAILED_LOG_FILE] = count + 1
+
+
+def export_logs_to_json(download_path=None, failed_path=None):
+    """
+    JSON Lines 로그를 구버전 JSON 형식(indent=2)으로 내보내기
 
-    log_data["total_failed"] = len(log_data["failures"])
-    save_failed_log(log_data)
+    Args:
+        download_path: 다운로드 로그 출력 경로 (기본값: LEGACY_DOWNLOAD_LOG_FILE)
+        failed_path: 실패 로그 출력 경로 (기본값: LEGACY_FAILED_LOG_FILE)
+
+    Returns:
+        dict: {"downloads": 내보낸 다운로드 수, "failures": 내보낸 실패 수}
+    """
+    exports = [
+        (download_path or LEGACY_DOWNLOAD_LOG_FILE, load_download_log()),
+        (failed_path or LEGACY_FAILED_LOG_FILE, load_failed_log()),
+    ]
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    for path, log_data in exports:
+        log_data["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(log_data, f, ensure_ascii=False, indent=2)
+        debug_log(f"로그 내보내기: {path}", 'INFO')
+
+    return {
+        "downloads": exports[0][1]["total_downloaded"],
+        "failures": exports[1][1]["total_failed"]
+    }
 
 
 # ============================================
@@ -625,8 +825,8 @@ def calculate_file_hash(file_path):
         sha256_hash = hashlib.sha256()
 
         with open(file_path, 'rb') as f:
-            # 대용량 파일 대비 블록 단위로 읽기
-            for byte_block in iter(lambda: f.read(4096), b""):
+            # ver1.5: 큰 버퍼로 한 번에 읽기 (HTTP 다운로드는 스트리밍 중 계산하므로 호출 안 함)
+            for byte_block in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
                 sha256_hash.update(byte_block)
 
         hash_value = sha256_hash.hexdigest()
@@ -789,26 +989,42 @@ def is_safe_element(element):
 
     try:
         # 요소 속성 가져오기
-        href = element.get_attribute('href') or ''
-        title = element.get_attribute('title') or ''
-        text = element.text or ''
-        onclick = element.get_attribute('onclick') or ''
-        class_name = element.get_attribute('class') or ''
+        return is_safe_attributes(
+            href=element.get_attribute('href'),
+            title=element.get_attribute('title'),
+            text=element.text,
+            onclick=element.get_attribute('onclick'),
+            class_name=element.get_attribute('class')
+        )
+
+    except Exception as e:
+        debug_log("안전성 검증 오류", 'WARNING', e)
+        return False
 
-        # 모든 텍스트 결합
-        all_text = (href + title + text + onclick + class_name).lower()
 
-        # 위험한 패턴 확인
-        for pattern in DANGEROUS_PATTERNS:
-            if pattern in all_text:
-                debug_log(f"위험한 패턴 감지: {pattern}", 'WARNING')
-                return False
+def is_safe_attributes(href=None, title=None, text=None, onclick=None, class_name=None):
+    """
+    이미 읽어 온 속성값으로 안전성 검증 (ver1.5: 브라우저 왕복 없이 확인)
+
+    Args:
+        href, title, text, onclick, class_name: 요소 속성값
 
+    Returns:
+        bool: 안전하면 True
+    """
+    if not SAFE_MODE:
         return True
 
-    except Exception as e:
-        debug_log("안전성 검증 오류", 'WARNING', e)
-        return False
+    # 모든 텍스트 결합
+    all_text = ''.join(value or '' for value in (href, title, text, onclick, class_name)).lower()
+
+    # 위험한 패턴 확인
+    for pattern in DANGEROUS_PATTERNS:
+        if pattern in all_text:
+            debug_log(f"위험한 패턴 감지: {pattern}", 'WARNING')
+            return False
+
+    return True
 
 
 # ============================================
@@ -846,6 +1062,7 @@ def reset_all_data(keep_downloads=False):
             pdf_count = len([f for f in os.listdir(DOWNLOAD_DIR) if f.endswith('.pdf')])
             shutil.rmtree(DOWNLOAD_DIR)
             os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+            shutil.rmtree(PDF_STORE_DIR, ignore_errors=True)  # ver1.5: 내용 주소 저장소
             stats['pdf_files'] = pdf_count
             debug_log(f"PDF 파일 {pdf_count}개 삭제", 'INFO')
 
@@ -853,6 +1070,8 @@ def reset_all_data(keep_downloads=False):
         log_files = [
             DOWNLOAD_LOG_FILE,
             FAILED_LOG_FILE,
+            LEGACY_DOWNLOAD_LOG_FILE,
+            LEGACY_FAILED_LOG_FILE,
             DEBUG_LOG_FILE,
             STRATEGY_LEARN_FILE,
             BOARD_PATTERN_CACHE
@@ -863,6 +1082,7 @@ def reset_all_data(keep_downloads=False):
                 os.remove(log_file)
                 stats['log_files'] += 1
 
+        _log_counts.clear()
         debug_log(f"로그 파일 {stats['log_files']}개 삭제", 'INFO')
 
         # 4. 체크포인트 삭제
@@ -0,0 +1,466 @@
+"""
+범용 PDF 자동 스크래퍼 ver1.5 - 병렬 워커 풀
+
+ver1.5 새로운 기능:
+- 코디네이터: 게시판 목록 페이지만 순회하며 게시글 작업(job)을 큐에 넣음
+- 워커: 프로세스마다 독립된 Chrome + 전용 다운로드 폴더(WORKER_TEMP_DIR, RAG 수집 폴더 밖)로 게시글 처리
+- 결과 병합: 각 워커가 SQLite downloads/failures 테이블에 직접 기록,
+  JSONL 다운로드/실패 로그는 결과 큐를 받은 코디네이터만 기록 (get_download_count가 전체 워커 합계)
+- 게시글마다 목록으로 복귀/링크 재추출하지 않음 (워커 수만큼 처리량 증가)
+
+사용법:
+    python auto_scraper.py "https://example.com/board" --workers 4
+"""
+
+import os
+import time
+import queue
+import shutil
+import itertools
+import multiprocessing as mp
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import *
+from utils import *
+from pdf_detector import save_learned_strategies
+from pdf_store import get_pdf_store
+from dedupe_index import get_dedupe_index
+from auto_scraper import extract_board_links, process_article, navigate_to_next_page
+
+if USE_DATABASE:
+    try:
+        from database import add_failure_record as db_add_failure
+        from database import mark_article_processed, flush_database, rename_download_record
+    except ImportError:
+        debug_log("database.py를 찾을 수 없습니다.", 'WARNING')
+        USE_DATABASE = False
+
+# 큐 종료 신호
+_STOP = None
+
+
+class WorkersExitedError(Exception):
+    """작업 큐를 비울 워커가 하나도 남지 않음"""
+
+
+def _put_job(job_queue, item, workers):
+    """
+    작업 큐에 추가 (가득 차 있으면 워커가 살아 있는 동안만 대기)
+
+    Args:
+        job_queue: 작업 큐
+        item: 작업 dict 또는 _STOP
+        workers: 워커 프로세스 목록 (None이면 생존 확인 없이 대기)
+
+    Raises:
+        WorkersExitedError: 모든 워커가 종료되어 큐가 비워지지 않을 때
+    """
+    while True:
+        try:
+            job_queue.put(item, timeout=WORKER_PUT_TIMEOUT)
+            return
+        except queue.Full:
+            if workers is not None and not any(worker.is_alive() for worker in workers):
+                raise WorkersExitedError("모든 워커가 종료되었습니다")
+
+
+# ============================================
+# 코디네이터: 게시글 작업 수집
+# ============================================
+
+def enumerate_article_jobs(driver, board_url, job_queue, max_pages=None, workers=None):
+    """
+    게시판 목록 페이지를 순회하며 게시글 작업을 큐에 추가
+
+    Args:
+        driver: 코디네이터 WebDriver
+        board_url: 게시판 URL
+        job_queue: 작업 큐 (multiprocessing.Queue)
+        max_pages: 최대 페이지 수 (None이면 마지막 페이지까지)
+        workers: 워커 프로세스 목록 (큐가 가득 찼을 때 생존 확인용)
+
+    Returns:
+        dict: {"pages": 처리한 페이지 수, "jobs": 큐에 넣은 작업 수, "skipped": 건너뛴 게시글 수}
+    """
+    current_page = 1
+    stats = {'pages': 0, 'jobs': 0, 'skipped': 0}
+
+    driver.get(board_url)
+    wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
+
+    while True:
+        # JavaScript 링크는 URL이 없으므로 워커가 이 목록 페이지에서 제목으로 다시 찾음
+        list_url = driver.current_url
+        article_links = extract_board_links(driver)
+        print(f"📄 페이지 {current_page}: 게시글 {len(article_links)}개 → 작업 큐 추가")
+
+        for idx, link in enumerate(article_links):
+            if (USE_DATABASE and SKIP_PROCESSED_ARTICLES and link.get('url')
+                    and get_dedupe_index().has_article(link['url'])):
+                stats['skipped'] += 1
+                continue
+
+            _put_job(job_queue, {
+                'page': current_page,
+                'index': idx,
+                'title': link['title'],
+                'url': link.get('url'),
+                'is_javascript': link.get('is_javascript', False),
+                'list_url': list_url
+            }, workers)
+            stats['jobs'] += 1
+
+        stats['pages'] += 1
+        if max_pages and stats['pages'] >= max_pages:
+            break
+
+        nav_result = navigate_to_next_page(driver, current_page)
+        if not nav_result['success']:
+            break
+        current_page = nav_result['page']
+
+    return stats
+
+
+# ============================================
+# 워커: 게시글 처리
+# ============================================
+
+def _open_job(driver, job):
+    """
+    작업을 process_article에 넘길 link_info로 변환
+
+    Args:
+        driver: 워커 WebDriver
+        job: 작업 dict
+
+    Returns:
+        dict or None: link_info (JavaScript 링크를 찾지 못하면 None)
+    """
+    if not job['is_javascript']:
+        return {'url': job['url'], 'title': job['title'], 'is_javascript': False}
+
+    # JavaScript 링크: 목록 페이지를 열고 같은 제목의 요소를 다시 찾음
+    driver.get(job['list_url'])
+    wait_for_page_stable(driver, timeout=TIMEOUT['page_load'])
+
+    for link in extract_board_links(driver):
+        if link['title'] == job['title']:
+            return link
+
+    return None
+
+
+def _move_exclusive(source, download_dir, worker_name):
+    """
+    파일을 공용 폴더로 이동하되 이미 있는 이름은 덮어쓰지 않음
+
+    여러 워커가 동시에 같은 이름을 옮길 수 있으므로 존재 확인 후 이동하지 않고,
+    하드 링크(또는 O_EXCL 생성)로 이름을 원자적으로 선점합니다.
+    이름이 있으면 name_worker-N.pdf, name_worker-N (1).pdf ... 순서로 시도합니다.
+
+    Args:
+        source: 워커 폴더의 파일 경로
+        download_dir: 공용 다운로드 폴더
+        worker_name: 워커 폴더명 (예: worker-1)
+
+    Returns:
+        str: 최종 경로
+    """
+    filename = os.path.basename(source)
+    name, ext = os.path.splitext(filename)
+    candidates = itertools.chain(
+        [filename, f"{name}_{worker_name}{ext}"],
+        (f"{name}_{worker_name} ({n}){ext}" for n in itertools.count(1))
+    )
+
+    for candidate in candidates:
+        target = os.path.join(download_dir, candidate)
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            continue
+        except OSError:
+            # 하드 링크 불가 (다른 파일 시스템 등): 빈 파일로 이름을 먼저 선점한 뒤 이동
+            try:
+                os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            shutil.move(source, target)
+            return target
+        os.remove(source)
+        return target
+
+
+def _collect_downloads(result, worker_dir, download_dir, article_title, article_url):
+    """
+    워커 전용 폴더에 받은 PDF를 공용 다운로드 폴더로 이동
+
+    이름 충돌로 다른 이름으로 옮기면 DB 다운로드 기록, 파일명 색인, 중복 인덱스도
+    실제 저장된 이름으로 갱신합니다.
+
+    Args:
+        result: process_article 결과
+        worker_dir: 워커 다운로드 폴더
+        download_dir: 공용 다운로드 폴더
+        article_title: 게시글 제목
+        article_url: 게시글 URL
+    """
+    for dl in result.get('downloads', []):
+        source = dl.get('filepath')
+        if not source or not os.path.exists(source):
+            continue
+
+        original_name = dl.get('filename') or os.path.basename(source)
+        # 다른 워커가 같은 이름으로 먼저 저장한 경우 이름 뒤에 워커 폴더명 추가
+        target = _move_exclusive(source, download_dir, os.path.basename(worker_dir))
+        dl['filepath'] = target
+        dl['filename'] = os.path.basename(target)
+
+        if os.path.basename(target) == os.path.basename(source):
+            continue
+        existing = os.path.join(download_dir, os.path.basename(source))
+
+        file_hash = dl.get('hash')
+        if USE_DATABASE:
+            rename_download_record(article_url, original_name, dl['filename'])
+        if USE_PDF_STORE and file_hash:
+            store = get_pdf_store()
+            store.register_name(dl['filename'], file_hash)
+            # 원래 이름의 색인은 먼저 저장된 파일을 가리키도록 되돌림
+            store.register_name(original_name, calculate_file_hash(existing))
+        get_dedupe_index().add_download(dl['filename'], file_hash, article_title,
+                                        datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+
+def worker_main(worker_id, job_queue, result_queue, download_dir):
+    """
+    워커 프로세스 진입점: 큐에서 게시글 작업을 꺼내 처리
+
+    Args:
+        worker_id: 워커 번호
+        job_queue: 작업 큐
+        result_queue: 결과 큐 (코디네이터 통계용)
+        download_dir: 공용 다운로드 폴더
+    """
+    worker_dir = os.path.join(WORKER_TEMP_DIR, os.path.basename(os.path.normpath(download_dir)),
+                              f'worker-{worker_id}')
+    driver = None
+    processed_count = 0
+
+    try:
+        # 폴더/드라이버 준비 실패도 finally에서 완료 신호를 보내도록 try 안에서 시작
+        os.makedirs(worker_dir, exist_ok=True)
+        driver = setup_driver(worker_dir)
+        wait = WebDriverWait(driver, TIMEOUT['element_wait'])
+
+        while True:
+            job = job_queue.get()
+            if job is _STOP:
+                break
+
+            article_title = job['title']
+            try:
+                link_info = _open_job(driver, job)
+                if link_info is None:
+                    raise Exception("목록 페이지에서 게시글 링크를 찾을 수 없습니다")
+
+                result = process_article(driver, wait, link_info, worker_dir)
+                _collect_downloads(result, worker_dir, download_dir, article_title,
+                                   result.get('article_url') or job.get('url') or 'N/A')
+
+            except Exception as e:
+                debug_log(f"[W{worker_id}] 게시글 처리 오류", 'ERROR', e)
+                result = {
+                    'status': 'error',
+                    'message': str(e),
+                    'article_title': article_title,
+                    'article_url': job.get('url') or 'N/A',
+                    'downloads': [],
+                    'skipped': []
+                }
+
+            article_url = result.get('article_url') or job.get('url') or 'N/A'
+
+            # 다운로드 기록은 pdf_detector가 DB에 직접 남김, 실패/게시글 추적만 여기서 기록
+            if USE_DATABASE:
+                if result['status'] == 'no_pdf':
+                    db_add_failure(article_title, article_url, 'no_pdf')
+                elif result['status'] == 'error':
+                    db_add_failure(article_title, article_url, result.get('message', 'unknown'))
+
+                if TRACK_PROCESSED_ARTICLES and article_url != 'N/A':
+                    mark_article_processed(article_url, article_title, result['status'],
+                                           pdf_count=len(result.get('downloads', [])))
+                    get_dedupe_index().add_article(article_url, result['status'])
+
+            result_queue.put({
+                'worker': worker_id,
+                'page': job['page'],
+                'title': article_title,
+                'url': article_url,
+                'status': result['status'],
+                'message': result.get('message'),
+                'downloads': [
+                    {'filename': dl.get('filename'), 'size': dl.get('size'),
+                     'method': dl.get('method', 'unknown')}
+                    for dl in result.get('downloads', [])
+                ],
+                'skipped': len(result.get('skipped', []))
+            })
+
+            # 브라우저 재시작 (ver1.5: 메모리 한도 기준)
+            processed_count += 1
+            if should_restart_browser(driver, processed_count):
+                driver = restart_browser(driver, worker_dir)
+                processed_count = 0
+                wait = WebDriverWait(driver, TIMEOUT['element_wait'])
+
+    except Exception as e:
+        debug_log(f"[W{worker_id}] 워커 종료 (브라우저 오류)", 'ERROR', e)
+
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except:
+                pass
+
+        if USE_STRATEGY_LEARNING:
+            save_learned_strategies()
+
+        # ver1.5: 워커별 사이트 대기 시간 기록
+        save_wait_stats()
+
+        # 워커 프로세스는 atexit이 실행되지 않으므로 남은 DB 쓰기를 직접 커밋
+        if USE_DATABASE:
+            flush_database()
+
+        result_queue.put({'worker': worker_id, 'done': True})
+
+
+# ============================================
+# 병렬 스크래퍼 실행
+# ============================================
+
+def run_parallel_scraper(board_url, download_dir, num_workers=None, max_pages=None):
+    """
+    코디네이터 + N개 워커로 게시판 스크래핑
+
+    Args:
+        board_url: 게시판 URL
+        download_dir: 다운로드 폴더
+        num_workers: 워커 수 (기본값: PARALLEL_WORKERS)
+        max_pages: 최대 페이지 수 (None이면 전체)
+
+    Returns:
+        dict: 최종 통계
+    """
+    num_workers = max(1, num_workers or PARALLEL_WORKERS)
+    os.makedirs(download_dir, exist_ok=True)
+
+    job_queue = mp.Queue(maxsize=WORKER_QUEUE_SIZE)
+    result_queue = mp.Queue()
+
+    workers = [
+        mp.Process(target=worker_main, args=(n, job_queue, result_queue, download_dir),
+                   name=f'scraper-worker-{n}', daemon=True)
+        for n in range(1, num_workers + 1)
+    ]
+    for worker in workers:
+        worker.start()
+
+    print(f"🚀 병렬 모드: 워커 {num_workers}개 시작\n")
+
+    start_time = time.time()
+    totals = {'success': 0, 'skipped': 0, 'no_pdf': 0, 'error': 0}
+    enum_stats = {'pages': 0, 'jobs': 0, 'skipped': 0}
+    finished_workers = 0
+
+    def drain(block):
+        """결과 큐 비우기 (진행 로그 + 통계 집계 + JSONL 로그 기록)"""
+        nonlocal finished_workers
+        while True:
+            try:
+                message = result_queue.get(timeout=1) if block else result_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            if message.get('done'):
+                finished_workers += 1
+                if block and finished_workers >= num_workers:
+                    return
+                continue
+
+            status = message['status']
+            if status in ('success', 'partial'):
+                totals['success'] += len(message['downloads'])
+                for dl in message['downloads']:
+                    print(f"    ✅ [W{message['worker']}] {dl['filename']} ({dl['size']})")
+                    add_download_record(message['title'], dl['filename'], message['url'],
+                                        dl['size'], dl['method'])
+            elif status == 'no_pdf':
+                totals['no_pdf'] += 1
+                if not USE_DATABASE:
+                    add_failure_record(message['title'], message['url'], 'no_pdf')
+            elif status == 'error':
+                totals['error'] += 1
+                print(f"    ❌ [W{message['worker']}] {message['title'][:30]}: {message.get('message')}")
+                if not USE_DATABASE:
+                    add_failure_record(message['title'], message['url'],
+                                       message.get('message') or 'unknown')
+            totals['skipped'] += message['skipped']
+
+    coordinator = setup_driver(download_dir)
+    try:
+        enum_stats = enumerate_article_jobs(coordinator, board_url, job_queue,
+                                            max_pages=max_pages, workers=workers)
+    except KeyboardInterrupt:
+        print("\n🛑 사용자가 중단했습니다 (Ctrl+C)")
+    except WorkersExitedError:
+        debug_log("모든 워커가 종료되어 게시글 목록 수집을 중단합니다", 'ERROR')
+    except Exception as e:
+        debug_log("게시글 목록 수집 중 오류", 'ERROR', e)
+    finally:
+        try:
+            coordinator.quit()
+        except:
+            pass
+
+        try:
+            for _ in workers:
+                _put_job(job_queue, _STOP, workers)
+        except WorkersExitedError:
+            pass
+
+    print(f"\n📝 작업 {enum_stats['jobs']}개 분배 완료 (페이지 {enum_stats['pages']}개), 워커 처리 대기 중...\n")
+
+    try:
+        while finished_workers < num_workers and any(worker.is_alive() for worker in workers):
+            drain(block=True)
+        drain(block=False)
+    except KeyboardInterrupt:
+        print("\n🛑 사용자가 중단했습니다 (Ctrl+C)")
+        for worker in workers:
+            worker.terminate()
+
+    for worker in workers:
+        worker.join(timeout=10)
+
+    totals['skipped'] += enum_stats['skipped']
+    elapsed_time = time.time() - start_time
+
+    print(f"\n{'='*60}")
+    print(f"🏁 병렬 스크래핑 완료 (워커 {num_workers}개)")
+    print(f"{'='*60}")
+    print(f"📄 처리한 페이지: {enum_stats['pages']}개 | 게시글: {enum_stats['jobs']}개")
+    print(f"✅ 다운로드 성공: {totals['success']}개")
+    print(f"⏭️ 건너뜀: {totals['skipped']}개")
+    print(f"⚠️ PDF 없음: {totals['no_pdf']}개")
+    print(f"❌ 실패: {totals['error']}개")
+    print(f"⏱️ 소요 시간: {format_time(elapsed_time)}")
+    if elapsed_time > 0:
+        print(f"⚡ 처리량: {enum_stats['jobs'] / elapsed_time * 60:.1f} 게시글/분")
+    print(f"{'='*60}\n")
+
+    return {**totals, **enum_stats, 'elapsed': elapsed_time}
@@ -12,6 +12,11 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Shared download tracker (backend/services/download_tracker.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from download_tracker import track_download
+from smart_wait import wait_for_quiet, wait_for_selector, format_wait_stats, save_wait_stats
+
 # --- 설정 ---
 BASE_URL = "https://www.bokjiro.go.kr/ssis-tbu/twataa/wlfareInfo/moveTWAT52005M.do?page=1&orderBy=date&tabId=1&sidoCd=1100000000&period=%EC%9E%84%EC%8B%A0%20%C2%B7%20%EC%B6%9C%EC%82%B0,%EC%98%81%EC%9C%A0%EC%95%84,%EC%95%84%EB%8F%99"
 
@@ -22,6 +27,7 @@ LOG_DIR = os.path.join(PROJECT_ROOT, 'data', 'logs')
 LOG_FILE = os.path.join(LOG_DIR, 'download_log.json')
 DEBUG_LOG_FILE = os.path.join(LOG_DIR, 'debug_log.txt')
 CHECKPOINT_FILE = os.path.join(LOG_DIR, 'checkpoint.json')
+WAIT_STATS_FILE = os.path.join(LOG_DIR, 'wait_stats.jsonl')
 
 # Debug levels
 DEBUG_LEVELS = {
@@ -104,41 +110,14 @@ def load_checkpoint():
         debug_log(f"Failed to load checkpoint", 'ERROR', e)
     return None
 
-def wait_for_page_stable(driver, timeout=30, stable_time=2):
-    """Wait for page to be stable (no DOM changes for specified time)"""
-    debug_log(f"Waiting for page to stabilize (timeout: {timeout}s, stable time: {stable_time}s)", 'DEBUG')
+def wait_for_page_stable(driver, timeout=30, quiet_ms=500):
+    """Wait until the page has had no DOM changes or resource loads for quiet_ms"""
+    debug_log(f"Waiting for page to stabilize (timeout: {timeout}s, quiet: {quiet_ms}ms)", 'DEBUG')
 
     start_time = time.time()
-    last_dom_size = 0
-    stable_count = 0
-
-    while time.time() - start_time < timeout:
-        try:
-            # Check if page is still loading
-            ready_state = driver.execute_script("return document.readyState")
-            if ready_state != "complete":
-                debug_log("Page still loading...", 'VERBOSE')
-                time.sleep(0.5)
-                continue
-
-            # Check DOM stability
-            current_dom_size = driver.execute_script("return document.getElementsByTagName('*').length")
-
-            if current_dom_size == last_dom_size:
-                stable_count += 1
-                if stable_count >= stable_time:
-                    debug_log(f"Page stabilized after {time.time() - start_time:.1f}s", 'DEBUG')
-                    return True
-            else:
-                stable_count = 0
-                last_dom_size = current_dom_size
-                debug_log(f"DOM still changing (elements: {current_dom_size})", 'VERBOSE')
-
-            time.sleep(0.5)
-
-        except Exception as e:
-            debug_log(f"Error checking page stability: {e}", 'WARNING')
-            time.sleep(0.5)
+    if wait_for_quiet(driver, timeout=timeout, quiet_ms=quiet_ms):
+        debug_log(f"Page stabilized after {time.time() - start_time:.1f}s", 'DEBUG')
+        return True
 
     debug_log(f"Page stabilization timeout after {timeout}s", 'WARNING')
     return False
@@ -155,8 +134,8 @@ def wait_for_element_stable(driver, by, value, timeout=20):
         # Then wait for it to be clickable
         element = wait.until(EC.element_to_be_clickable((by, value)))
 
-        # Additional stability check
-        time.sleep(0.5)
+        # Additional stability check (returns as soon as the DOM is quiet)
+        wait_for_quiet(driver, timeout=2, quiet_ms=200)
         debug_log(f"Element is stable and ready: {by}={value}", 'DEBUG')
         return element
 
@@ -509,7 +488,6 @@ def restart_browser_if_needed(driver, wait, processed_count):
         debug_log(f"Browser restart triggered after {processed_count} processed items", 'INFO')
         try:
             driver.quit()
-            time.sleep(2)
             new_driver = setup_driver()
             new_wait = WebDriverWait(new_driver, 20)
             debug_log("Browser restarted successfully", 'INFO')
@@ -628,38 +606,6 @@ def find_pdf_elements(driver):
 
     return pdf_element, pdf_filename, download_element
 
-def wait_for_download_completion(download_dir, expected_filename=None, timeout=30):
-    """Wait for file download to complete and verify it's a valid PDF"""
-    import glob
-
-    start_time = time.time()
-    initial_files = set(os.listdir(download_dir))
-
-    while time.time() - start_time < timeout:
-        current_files = set(os.listdir(download_dir))
-        new_files = current_files - initial_files
-
-        # Check for completed downloads (no .crdownload or .tmp files)
-        completed_downloads = [f for f in new_files if not f.endswith(('.crdownload', '.tmp', '.part'))]
-
-        if completed_downloads:
-            latest_file = max(completed_downloads, key=lambda f: os.path.getctime(os.path.join(download_dir, f)))
-            file_path = os.path.join(download_dir, latest_file)
-
-            # Verify file size and basic PDF structure
-            if os.path.getsize(file_path) > 100:  # Minimum size check
-                try:
-                    with open(file_path, 'rb') as f:
-                        header = f.read(4)
-                        if header == b'%PDF':
-                            return {"status": "success", "filename": latest_file, "filepath": file_path}
-                except Exception as e:
-                    print(f"PDF 검증 실패: {e}")
-
-        time.sleep(1)
-
-    return {"status": "download_timeout", "message": "다운로드 시간 초과"}
-
 def process_detail_page(driver, wait):
     """Enhanced PDF detection and download with robust error handling"""
     try:
@@ -684,7 +630,6 @@ def process_detail_page(driver, wait):
                 element.click()
                 additional_info_clicked = True
                 print("추가정보 탭 클릭 성공")
-                time.sleep(0.5)  # Initial wait
                 wait_for_page_stable(driver, timeout=15)  # Wait for tab content to stabilize
                 break
             except (TimeoutException, NoSuchElementException) as e:
@@ -718,10 +663,12 @@ def process_detail_page(driver, wait):
         # Step 3: Attempt download with verification
         print("다운로드 시작...")
         try:
-            download_element.click()
-
-            # Wait for download completion with verification
-            download_result = wait_for_download_completion(DOWNLOAD_DIR, pdf_filename)
+            # Track this download in its own temp folder (no polling of DOWNLOAD_DIR)
+            with track_download(driver, DOWNLOAD_DIR) as job:
+                download_element.click()
+                download_result = job.wait(timeout=30)
+            if download_result["status"] == "timeout":
+                download_result["status"] = "download_timeout"
 
             if download_result["status"] == "success":
                 print(f"다운로드 완료: {download_result['filename']}")
@@ -847,8 +794,8 @@ def check_pagination_available(driver, current_page):
         next_page = current_page + 1
         debug_log(f"Checking pagination availability: {current_page} → {next_page}", 'DEBUG')
 
-        # Wait for pagination elements to be stable
-        time.sleep(1)
+        # Wait for pagination elements to be present
+        wait_for_selector(driver, "//div[@class='cl-pageindexer-index']", timeout=5, by=By.XPATH)
 
         # Get all available page numbers in current view first
         all_page_buttons = driver.find_elements(By.XPATH,
@@ -890,7 +837,7 @@ def check_pagination_available(driver, current_page):
                 try:
                     # Click the next button (even if it appears disabled)
                     driver.execute_script("arguments[0].click();", next_button[0])
-                    time.sleep(2)  # Wait for new range to load
+                    wait_for_quiet(driver, timeout=5)  # Wait for new range to load
                     debug_log("Clicked next button for range transition", 'DEBUG')
 
                     # Re-scan for available pages in the new range
@@ -1013,7 +960,6 @@ def run_scraper():
             page_load_start = time.time()
             debug_log(f"Loading page {current_page}: {page_url}", 'INFO')
             driver.get(page_url)
-            time.sleep(0.5)  # Initial wait
             wait_for_page_stable(driver, timeout=20)  # Wait for page to stabilize
             log_timing_info(f"Page {current_page} load", page_load_start)
         except WebDriverException as e:
@@ -1050,7 +996,7 @@ def run_scraper():
                 WebDriverWait(driver, 20).until(
                     lambda d: len(d.find_elements(By.CSS_SELECTOR, details_button_selector)) >= 1
                 )
-                time.sleep(1)  # Additional wait for all policies to load
+                wait_for_quiet(driver, timeout=5)  # Wait for the rest of the policies to load
 
                 policy_elements = driver.find_elements(By.CSS_SELECTOR, details_button_selector)
                 num_policies_on_page = len(policy_elements)
@@ -1188,8 +1134,8 @@ def run_scraper():
             page_load_success = True
 
             # Update and display overall progress
-            current_processed_log = load_processed_log()
-            total_processed_count = len(current_processed_log)
+            # In-memory log is the source of truth during the run (no reload from disk)
+            total_processed_count = len(processed_log)
             progress_percentage = (total_processed_count / expected_total) * 100
             print(f"\n[전체 진행률] {total_processed_count}/{expected_total} ({progress_percentage:.1f}%) | 페이지 {current_page}/{expected_pages}")
             debug_log(f"Page {current_page} completed. Total progress: {total_processed_count}/{expected_total}", 'INFO')
@@ -1226,8 +1172,7 @@ def run_scraper():
                 print(f"{'='*60}")
 
                 # Final progress update
-                final_processed_log = load_processed_log()
-                final_count = len(final_processed_log)
+                final_count = len(processed_log)
                 final_percentage = (final_count / expected_total) * 100
 
                 print(f"✅ 최종 진행률: {final_count}/{expected_total} ({final_percentage:.1f}%)")
@@ -1272,7 +1217,6 @@ def run_scraper():
                  raise Exception("페이지 네비게이션 클릭에 실패했습니다.")
 
             current_page = actual_target_page
-            time.sleep(1)  # Initial wait
             wait_for_page_stable(driver, timeout=20)  # Wait for page to stabilize
 
         except Exception as e:
@@ -1287,7 +1231,7 @@ def run_scraper():
 
     driver.quit()
 
-    final_log = load_processed_log()
+    final_log = processed_log
     session_elapsed_time = time.time() - session_start_time
 
     print(f"\n{'='*80}")
@@ -1297,6 +1241,12 @@ def run_scraper():
     print(f"📄 처리된 총 페이지: {current_page}/{expected_pages}")
 
     generate_summary_report(final_log, expected_total)
+
+    # Time spent waiting per site
+    for line in format_wait_stats():
+        print(f"⏳ {line}")
+    save_wait_stats(WAIT_STATS_FILE)
+
     print(f"\n{'='*80}")
     print("🎊 모든 작업이 성공적으로 완료되었습니다!")
     print(f"{'='*80}")
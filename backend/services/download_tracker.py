@@ -0,0 +1,239 @@
+"""
+브라우저 다운로드 완료 추적 (auto_scraper / bokjiro_scraper / scraper_service 공용)
+
+다운로드마다 전용 임시 폴더를 만들고 Chrome DevTools(Browser.setDownloadBehavior)로
+해당 폴더에 받도록 지정한 뒤, 그 폴더만 감시해 완료 시점을 감지합니다.
+
+- watchdog(inotify/FSEvents)이 설치되어 있으면 파일 이벤트로 즉시 감지
+- 없으면 임시 폴더(파일 1~2개)만 짧은 간격으로 확인
+- 전체 다운로드 폴더를 listdir/getctime으로 훑지 않음 (폴더 크기와 무관)
+- 완료된 PDF는 검증 후 다운로드 폴더로 이동
+
+사용법:
+    with track_download(driver, download_dir) as job:
+        element.click()
+        result = job.wait(timeout=30)
+"""
+
+import os
+import time
+import uuid
+import shutil
+import threading
+from contextlib import contextmanager
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog 미설치 시 임시 폴더 폴링
+    Observer = None
+    FileSystemEventHandler = object
+
+PARTIAL_SUFFIXES = ('.crdownload', '.tmp', '.part')
+INCOMING_DIRNAME = '.incoming'
+
+_observer = None
+_observer_lock = threading.Lock()
+
+
+def _get_observer():
+    """프로세스 공용 watchdog Observer (최초 사용 시 시작)"""
+    global _observer
+    with _observer_lock:
+        if _observer is None:
+            _observer = Observer()
+            _observer.daemon = True
+            _observer.start()
+        return _observer
+
+
+class _CompletionHandler(FileSystemEventHandler):
+    """임시 폴더에 파일이 생기거나 이름이 바뀌면(.crdownload → .pdf) 알림"""
+
+    def __init__(self, event):
+        self._event = event
+
+    def on_created(self, event):
+        self._event.set()
+
+    def on_moved(self, event):
+        self._event.set()
+
+    def on_modified(self, event):
+        self._event.set()
+
+
+def _set_download_dir(driver, path):
+    """브라우저 다운로드 폴더 변경 (Browser 도메인 우선, 구버전은 Page 도메인)"""
+    params = {'behavior': 'allow', 'downloadPath': os.path.abspath(path)}
+    try:
+        driver.execute_cdp_cmd('Browser.setDownloadBehavior', params)
+    except Exception:
+        driver.execute_cdp_cmd('Page.setDownloadBehavior', params)
+
+
+def _unique_path(directory, filename):
+    """같은 이름이 있으면 'name (1).pdf' 형식으로 번호 추가 (Chrome과 동일 규칙)"""
+    target = os.path.join(directory, filename)
+    name, ext = os.path.splitext(filename)
+    counter = 1
+    while os.path.exists(target):
+        target = os.path.join(directory, f"{name} ({counter}){ext}")
+        counter += 1
+    return target
+
+
+def move_to_unique_path(source, directory, filename):
+    """
+    파일을 directory/filename으로 옮기되 기존 파일은 덮어쓰지 않음
+
+    존재 확인 후 이동하면 다른 프로세스와 경합할 수 있으므로 하드 링크
+    (불가하면 O_EXCL로 빈 파일 생성)로 이름을 원자적으로 선점하고,
+    이미 있으면 _unique_path 규칙('name (1).pdf')으로 다음 이름을 시도합니다.
+
+    Args:
+        source: 옮길 파일 경로
+        directory: 대상 폴더
+        filename: 원하는 파일명
+
+    Returns:
+        str: 최종 경로
+    """
+    while True:
+        target = _unique_path(directory, filename)
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            continue
+        except OSError:
+            # 하드 링크 불가 (다른 파일 시스템 등): 빈 파일로 이름을 먼저 선점한 뒤 이동
+            try:
+                os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                continue
+            shutil.move(source, target)
+            return target
+        os.remove(source)
+        return target
+
+
+class DownloadJob:
+    """
+    다운로드 한 건의 추적기
+
+    Args:
+        driver: WebDriver 객체 (Chrome)
+        download_dir: 최종 저장 폴더
+        min_size: 최소 파일 크기 (바이트)
+        pdf_header: PDF 헤더 시그니처
+        poll_interval: watchdog 미사용 시 확인 간격 (초)
+    """
+
+    def __init__(self, driver, download_dir, min_size=100, pdf_header=b'%PDF', poll_interval=0.1):
+        self.driver = driver
+        self.download_dir = os.path.abspath(download_dir)
+        self.job_dir = os.path.join(self.download_dir, INCOMING_DIRNAME, uuid.uuid4().hex)
+        self.min_size = min_size
+        self.pdf_header = pdf_header
+        self.poll_interval = poll_interval
+        self._event = threading.Event()
+        self._watch = None
+
+    def start(self):
+        os.makedirs(self.job_dir, exist_ok=True)
+        if Observer is not None:
+            self._watch = _get_observer().schedule(_CompletionHandler(self._event), self.job_dir)
+        _set_download_dir(self.driver, self.job_dir)
+
+    def close(self):
+        if self._watch is not None:
+            try:
+                _get_observer().unschedule(self._watch)
+            except Exception:
+                pass
+            self._watch = None
+        try:
+            _set_download_dir(self.driver, self.download_dir)
+        except Exception:
+            pass
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+    def _completed_file(self):
+        """
+        임시 폴더에서 완료된 파일 확인
+
+        Returns:
+            tuple: (상태, 파일 경로) - 상태는 'pending' / 'ready' / 'invalid'
+        """
+        names = [name for name in os.listdir(self.job_dir) if not name.endswith(PARTIAL_SUFFIXES)]
+        if not names:
+            return 'pending', None
+
+        path = os.path.join(self.job_dir, names[0])
+        try:
+            if os.path.getsize(path) <= self.min_size:
+                return 'pending', None
+            with open(path, 'rb') as f:
+                header = f.read(len(self.pdf_header))
+        except OSError:
+            return 'pending', None
+
+        return ('ready' if header == self.pdf_header else 'invalid'), path
+
+    def wait(self, timeout=30):
+        """
+        다운로드 완료 대기 후 검증된 PDF를 다운로드 폴더로 이동
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            dict: {"status": "success/invalid_file/timeout", "filename": ..., "filepath": ..., "size": ...}
+        """
+        deadline = time.time() + timeout
+        interval = None if self._watch is not None else self.poll_interval
+
+        while True:
+            state, path = self._completed_file()
+
+            if state == 'ready':
+                target = move_to_unique_path(path, self.download_dir, os.path.basename(path))
+                file_size_mb = os.path.getsize(target) / (1024 * 1024)
+                return {
+                    "status": "success",
+                    "filename": os.path.basename(target),
+                    "filepath": target,
+                    "size": f"{file_size_mb:.2f} MB"
+                }
+
+            if state == 'invalid':
+                return {"status": "invalid_file", "message": f"PDF가 아닌 파일: {os.path.basename(path)}"}
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return {"status": "timeout", "message": "다운로드 시간 초과"}
+
+            # watchdog 사용 시 파일 이벤트까지 대기 (크기 기준 미달 대비 최대 1초마다 재확인)
+            self._event.wait(min(remaining, interval or 1.0))
+            self._event.clear()
+
+
+@contextmanager
+def track_download(driver, download_dir, **kwargs):
+    """
+    다운로드 한 건을 전용 임시 폴더로 받아 추적하는 컨텍스트
+
+    Args:
+        driver: WebDriver 객체
+        download_dir: 최종 저장 폴더
+        **kwargs: DownloadJob 옵션 (min_size, pdf_header, poll_interval)
+
+    Yields:
+        DownloadJob
+    """
+    job = DownloadJob(driver, download_dir, **kwargs)
+    job.start()
+    try:
+        yield job
+    finally:
+        job.close()
@@ -0,0 +1,153 @@
+"""
+Write-behind queue for assistant messages.
+
+The chat endpoint enqueues the assistant reply and returns immediately; a
+background thread flushes queued rows to the `messages` table in batches.
+Rows get their id/created_at at enqueue time so they can be served from the
+queue (pending_for) before they reach the database.
+"""
+
+import copy
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional
+
+from supabase import Client
+
+from .. import crud
+
+
+class MessageWriteBehindQueue:
+    def __init__(self, supabase: Client, batch_size: int = 20, flush_interval: float = 0.5):
+        self._supabase = supabase
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0.05, flush_interval)
+        self._pending: Deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def enqueue(self, conversation_id: str, role: str, content: str, rag_sources: Optional[list] = None) -> dict:
+        """Queue a message row and return it (with generated id/created_at)."""
+        row = {
+            "id": str(uuid.uuid4()),
+            "conversation_id": str(conversation_id),
+            "role": role,
+            "content": content,
+            "rag_sources": rag_sources,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._pending.append(row)
+            should_wake = len(self._pending) >= self._batch_size
+        self._ensure_started()
+        if should_wake:
+            self._wakeup.set()
+        return row
+
+    def pending_for(self, conversation_id: str) -> List[dict]:
+        """Messages for a conversation that are queued but not yet persisted.
+
+        Rows are deep copies so callers can't change what gets flushed.
+        """
+        conversation_id = str(conversation_id)
+        with self._lock:
+            return [copy.deepcopy(row) for row in self._pending if row["conversation_id"] == conversation_id]
+
+    def discard(self, conversation_id: str) -> None:
+        """Drop queued messages for a conversation that is being deleted."""
+        conversation_id = str(conversation_id)
+        with self._lock:
+            self._pending = deque(row for row in self._pending if row["conversation_id"] != conversation_id)
+
+    def flush(self) -> int:
+        """Persist everything queued so far. Returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._pending[i] for i in range(min(self._batch_size, len(self._pending)))]
+                if not batch:
+                    return written
+                written += self._write(batch)
+                flushed_ids = {row["id"] for row in batch}
+                with self._lock:
+                    self._pending = deque(row for row in self._pending if row["id"] not in flushed_ids)
+
+    def stop(self) -> None:
+        """Stop the background thread after a final flush."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="message-write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:  # pragma: no cover - keep the worker alive
+                print(f"[MessageWriter] flush failed: {e}")
+
+    def _write(self, batch: List[dict]) -> int:
+        try:
+            crud.create_messages_bulk(self._supabase, batch)
+            return len(batch)
+        except Exception as e:
+            # One bad row (e.g. conversation deleted meanwhile) must not block the rest.
+            print(f"[MessageWriter] batch insert failed, retrying row by row: {e}")
+            written = 0
+            for row in batch:
+                try:
+                    crud.create_messages_bulk(self._supabase, [row])
+                    written += 1
+                except Exception as row_error:
+                    print(f"[MessageWriter] dropped message {row['id']}: {row_error}")
+            return written
+
+
+_WRITER_INSTANCE: Optional[MessageWriteBehindQueue] = None
+
+
+def get_message_writer(supabase: Client) -> MessageWriteBehindQueue:
+    """Create/reuse the process-wide write-behind queue."""
+    global _WRITER_INSTANCE
+    if _WRITER_INSTANCE is None:
+        _WRITER_INSTANCE = MessageWriteBehindQueue(
+            supabase,
+            batch_size=int(os.getenv("MESSAGE_WRITE_BATCH_SIZE", "20")),
+            flush_interval=float(os.getenv("MESSAGE_WRITE_FLUSH_INTERVAL", "0.5")),
+        )
+    return _WRITER_INSTANCE
+
+
+def shutdown_message_writer() -> None:
+    """Flush pending messages; called from the FastAPI lifespan on shutdown."""
+    global _WRITER_INSTANCE
+    if _WRITER_INSTANCE is not None:
+        _WRITER_INSTANCE.stop()
+        _WRITER_INSTANCE = None
@@ -1,6 +1,6 @@
 """RAG (Retrieval-Augmented Generation) system for BabyPolicy chatbot."""
 
-from .service import RagService, get_rag_service
+from .service import RagService, get_active_chunk_table, get_rag_service
 
 # Backward compatibility aliases
 BabyPolicyChatService = RagService
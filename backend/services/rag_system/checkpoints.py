@@ -0,0 +1,74 @@
+"""Per-document ingestion checkpoints so interrupted PDF ingests can resume."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from supabase import Client
+
+
+@dataclass(slots=True)
+class IngestCheckpoint:
+    policy_id: str
+    fingerprint: str
+    last_page: int = 0
+    chunks: int = 0
+    status: str = "running"
+
+
+def file_fingerprint(path: Path) -> str:
+    """Cheap identity of a file version (size + mtime); a changed file restarts from page 1."""
+    stat = path.stat()
+    return f"{stat.st_size}-{int(stat.st_mtime)}"
+
+
+class IngestCheckpointStore:
+    """Reads/writes the ``ingest_checkpoints`` table.
+
+    Checkpointing is best-effort: if the table is missing or a write fails the
+    ingest still runs, it just cannot resume.
+    """
+
+    def __init__(self, supabase: Client, *, table: str = "ingest_checkpoints") -> None:
+        self._supabase = supabase
+        self._table = table
+
+    def resume_point(self, policy_id: str, fingerprint: str) -> IngestCheckpoint:
+        """Checkpoint to continue from, or a fresh one if none matches this file version."""
+        fresh = IngestCheckpoint(policy_id=policy_id, fingerprint=fingerprint)
+        try:
+            response = (
+                self._supabase.table(self._table)
+                .select("policy_id, fingerprint, last_page, chunks, status")
+                .eq("policy_id", policy_id)
+                .limit(1)
+                .execute()
+            )
+        except Exception as exc:  # pragma: no cover - checkpoint table is optional
+            print(f"[DEBUG Ingest] checkpoint lookup failed for {policy_id}: {exc}")
+            return fresh
+        row = response.data[0] if response.data else None
+        if not row or row.get("status") != "running" or row.get("fingerprint") != fingerprint:
+            return fresh
+        return IngestCheckpoint(
+            policy_id=policy_id,
+            fingerprint=fingerprint,
+            last_page=int(row.get("last_page") or 0),
+            chunks=int(row.get("chunks") or 0),
+        )
+
+    def save(self, checkpoint: IngestCheckpoint) -> None:
+        payload = {
+            "policy_id": checkpoint.policy_id,
+            "fingerprint": checkpoint.fingerprint,
+            "last_page": checkpoint.last_page,
+            "chunks": checkpoint.chunks,
+            "status": checkpoint.status,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            self._supabase.table(self._table).upsert(payload).execute()
+        except Exception as exc:  # pragma: no cover - checkpoint table is optional
+            print(f"[DEBUG Ingest] checkpoint save failed for {checkpoint.policy_id}: {exc}")
@@ -0,0 +1,146 @@
+"""SimHash near-duplicate detection for chunk text (ingest-time and retrieval-time)."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .vector_store import RankedChunk
+
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+_BIT_POSITIONS = np.arange(64, dtype=np.uint64)
+_MASK64 = (1 << 64) - 1
+
+
+def simhash(text: str, *, shingle_size: int = 3) -> int:
+    """64-bit SimHash over word shingles; similar texts differ in few bits."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return 0
+    if len(words) <= shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[start : start + shingle_size])
+            for start in range(len(words) - shingle_size + 1)
+        ]
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+            for item in shingles
+        ),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+    signature = 0
+    for position in np.flatnonzero(votes > 0):
+        signature |= 1 << int(position)
+    return signature
+
+
+def hamming(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK64).bit_count()
+
+
+def to_signed64(value: int) -> int:
+    """Postgres BIGINT is signed; store unsigned signatures in two's complement."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value: int) -> int:
+    return value & _MASK64
+
+
+class SimHashIndex:
+    """In-memory LSH index finding signatures within ``max_distance`` bits.
+
+    Signatures are split into ``max_distance + 1`` bands; by pigeonhole any
+    signature within the distance shares at least one band exactly, so lookups
+    only compare against same-band candidates.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        self._max_distance = max(0, max_distance)
+        bands = self._max_distance + 1
+        width = 64 // bands
+        self._bands: List[Tuple[int, int]] = [
+            (band * width, 64 - band * width if band == bands - 1 else width)
+            for band in range(bands)
+        ]
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._bands]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._buckets[0].values())
+
+    def add(self, chunk_id: str, signature: int) -> None:
+        with self._lock:
+            for buckets, key in zip(self._buckets, self._keys(signature)):
+                buckets.setdefault(key, []).append((signature, chunk_id))
+
+    def find(self, signature: int, *, exclude_id: Optional[str] = None) -> Optional[str]:
+        """Return the id of the closest indexed near-duplicate, if any."""
+        best: Optional[Tuple[int, str]] = None
+        with self._lock:
+            for buckets, key in zip(self._buckets, self._keys(signature)):
+                for candidate, chunk_id in buckets.get(key, ()):
+                    if chunk_id == exclude_id:
+                        continue
+                    distance = hamming(signature, candidate)
+                    if distance <= self._max_distance and (best is None or distance < best[0]):
+                        best = (distance, chunk_id)
+        return best[1] if best else None
+
+    def _keys(self, signature: int) -> List[int]:
+        return [(signature >> start) & ((1 << width) - 1) for start, width in self._bands]
+
+
+def with_also_in(item: RankedChunk, sources: Iterable[str]) -> RankedChunk:
+    """Return a copy of ``item`` whose ``metadata.extra["also_in"]`` includes ``sources``.
+
+    The input is left untouched; chunks may be shared with caches.
+    """
+    metadata = item.chunk.metadata
+    also_in = list(metadata.extra.get("also_in", []))
+    for source in sources:
+        if source != metadata.source and source not in also_in:
+            also_in.append(source)
+    if len(also_in) == len(metadata.extra.get("also_in", [])):
+        return item
+    new_metadata = replace(metadata, extra={**metadata.extra, "also_in": also_in})
+    return replace(item, chunk=replace(item.chunk, metadata=new_metadata))
+
+
+def collapse_near_duplicates(
+    ranked: Sequence[RankedChunk], *, max_distance: int = 3
+) -> List[RankedChunk]:
+    """Keep the best-ranked hit of each near-duplicate group.
+
+    The sources of collapsed hits are recorded on (a copy of) the kept chunk's
+    ``metadata.extra["also_in"]`` so citations are not lost.
+    """
+    kept: List[RankedChunk] = []
+    signatures: List[int] = []
+    for item in ranked:
+        signature = simhash(item.chunk.text)
+        match = next(
+            (
+                index
+                for index, existing in enumerate(signatures)
+                if hamming(signature, existing) <= max_distance
+            ),
+            None,
+        )
+        if match is None:
+            kept.append(item)
+            signatures.append(signature)
+            continue
+        kept[match] = with_also_in(kept[match], [item.chunk.metadata.source])
+    return kept
@@ -0,0 +1,127 @@
+"""Throughput-oriented batching of embedding requests during ingestion."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .openai_client import OpenAIEmbeddingClient, estimate_tokens
+
+
+@dataclass(slots=True)
+class EmbeddingStats:
+    chunks: int = 0
+    unique: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds > 0 else 0.0
+
+    def add(self, other: EmbeddingStats) -> None:
+        self.chunks += other.chunks
+        self.unique += other.unique
+        self.batches += other.batches
+        self.seconds += other.seconds
+
+
+class EmbeddingScheduler:
+    """Embed many texts with as few, as full and as parallel requests as possible.
+
+    Identical texts are embedded once. Unique texts are sorted by length so
+    each batch holds similar-length inputs (less padding for local models),
+    and batches are capped by both item count and estimated tokens. OpenAI
+    batches run concurrently; the shared transport enforces RPM/TPM limits.
+    The returned matrix is in the original input order.
+
+    One scheduler is shared by concurrent ingests, so per-call numbers are
+    returned by ``embed_with_stats`` rather than kept on the instance.
+    """
+
+    def __init__(
+        self,
+        client: OpenAIEmbeddingClient,
+        *,
+        max_batch_size: int = 64,
+        max_batch_tokens: int = 8000,
+        concurrency: int = 4,
+    ) -> None:
+        self._client = client
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_batch_tokens = max(1, max_batch_tokens)
+        self._concurrency = max(1, concurrency)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self.embed_with_stats(texts)[0]
+
+    def embed_with_stats(self, texts: Sequence[str]) -> Tuple[np.ndarray, EmbeddingStats]:
+        """Embed ``texts``; return the matrix and the throughput numbers of this call."""
+        started = perf_counter()
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32), EmbeddingStats()
+
+        positions: Dict[str, int] = {}
+        inverse = np.fromiter(
+            (positions.setdefault(text, len(positions)) for text in texts),
+            dtype=np.intp,
+            count=len(texts),
+        )
+        unique = list(positions)
+
+        batches = self._plan_batches(unique)
+        if self._client.is_local or self._concurrency == 1 or len(batches) == 1:
+            results = [self._client.embed_matrix([unique[i] for i in batch]) for batch in batches]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self._concurrency, len(batches)), thread_name_prefix="embed"
+            ) as pool:
+                results = list(
+                    pool.map(
+                        lambda batch: self._client.embed_matrix([unique[i] for i in batch]),
+                        batches,
+                    )
+                )
+
+        dim = max(result.shape[1] for result in results)
+        unique_matrix = np.zeros((len(unique), dim), dtype=np.float32)
+        for batch, result in zip(batches, results):
+            if result.shape[1]:
+                unique_matrix[batch] = result
+
+        stats = EmbeddingStats(
+            chunks=len(texts),
+            unique=len(unique),
+            batches=len(batches),
+            seconds=perf_counter() - started,
+        )
+        print(
+            "[DEBUG Embedding] "
+            f"{stats.chunks} chunks ({stats.unique} unique) in "
+            f"{stats.batches} batches, {stats.seconds:.2f}s, "
+            f"{stats.chunks_per_second:.1f} chunks/s"
+        )
+        return unique_matrix[inverse], stats
+
+    def _plan_batches(self, texts: Sequence[str]) -> List[List[int]]:
+        order = sorted(range(len(texts)), key=lambda index: len(texts[index]))
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for index in order:
+            tokens = estimate_tokens(texts[index])
+            if current and (
+                len(current) >= self._max_batch_size
+                or current_tokens + tokens > self._max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
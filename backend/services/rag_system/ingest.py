@@ -18,6 +18,7 @@ class IngestionResult:
     chunks: int
     status: str
     message: Optional[str] = None
+    chunks_per_second: Optional[float] = None
 
 
 def _load_category(payload: Any) -> Dict[str, Any]:
@@ -130,8 +131,12 @@ def ingest_pdf_files(
         # 디렉토리 이름을 카테고리로 사용 (bokjiro, auto_scraper 등)
         category_name = pdf_dir.name
 
-        # 모든 PDF 파일 찾기
-        pdf_candidates = sorted(pdf_dir.glob("**/*.pdf"))
+        # 모든 PDF 파일 찾기 (스크래퍼 임시 폴더 .incoming/.workers 등 숨김 폴더 제외)
+        pdf_candidates = sorted(
+            path
+            for path in pdf_dir.glob("**/*.pdf")
+            if not any(part.startswith(".") for part in path.relative_to(pdf_dir).parts[:-1])
+        )
 
         if not pdf_candidates:
             results.append(
@@ -177,8 +182,9 @@ def ingest_pdf_files(
                     IngestionResult(
                         path=str(pdf_path),
                         policy_id=derived_policy_id,
-                        chunks=len(ingest_result.chunks),
+                        chunks=ingest_result.total_chunks or len(ingest_result.chunks),
                         status="success",
+                        chunks_per_second=round(service.last_embedding_stats.chunks_per_second, 1),
                     )
                 )
                 total_processed += 1
@@ -0,0 +1,246 @@
+"""Rolling conversation memory that bounds the history sent to the chat model."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from supabase import Client
+
+from .openai_client import OpenAIChatClient, estimate_tokens
+
+MEMORY_CONTEXT_KEY = "conversation_memory"
+
+SUMMARY_PROMPT = (
+    "다음은 임신·출산·육아 정책 상담 대화의 이전 요약과 새로 추가된 대화입니다. "
+    "사용자의 상황(임신 주수, 거주 지역, 가구 정보 등), 질문한 정책, 안내된 핵심 조건·금액·일정을 "
+    "빠짐없이 유지하면서 한국어로 간결하게 하나의 요약으로 합쳐 주세요. "
+    "인사말이나 불필요한 설명은 제외하고 사실만 bullet 형태로 작성하세요."
+)
+
+
+class ConversationMemory:
+    """Keep the last N turns verbatim and fold older turns into a cached summary.
+
+    The summary and the timestamp of the last folded message are stored under
+    ``conversations.user_context[MEMORY_CONTEXT_KEY]``. Each turn reads the
+    messages after that cursor newest first and stops once the token budget is
+    covered, so a long unsummarized backlog never lands on the request path.
+
+    Folding waits until at least ``fold_batch_turns`` turns have overflowed and
+    runs on a background thread, which pages through the whole backlog itself;
+    until a fold lands, the overflowed turns compete for the token budget like
+    the verbatim ones.
+    """
+
+    def __init__(
+        self,
+        supabase: Client,
+        chat_client: OpenAIChatClient,
+        *,
+        keep_turns: int = 3,
+        token_budget: int = 1500,
+        summary_token_limit: int = 400,
+        fetch_limit: int = 50,
+        fold_batch_turns: int = 4,
+        fold_in_background: bool = True,
+    ) -> None:
+        self._supabase = supabase
+        self._chat_client = chat_client
+        self._keep_messages = max(1, keep_turns) * 2
+        self._token_budget = max(1, token_budget)
+        self._summary_token_limit = max(1, summary_token_limit)
+        self._fetch_limit = max(self._keep_messages, fetch_limit)
+        self._fold_batch_messages = max(1, fold_batch_turns) * 2
+        self._fold_pool = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-fold")
+            if fold_in_background
+            else None
+        )
+        self._folding: set = set()
+        self._folding_lock = threading.Lock()
+
+    def load_history(
+        self,
+        conversation: Dict[str, Any],
+        *,
+        pending_messages: Optional[Sequence[dict]] = None,
+    ) -> List[dict]:
+        """Return prompt-ready history for ``conversation`` within the token budget."""
+        conversation_id = conversation.get("id")
+        if not conversation_id:
+            return []
+
+        user_context = conversation.get("user_context") or {}
+        state = dict(user_context.get(MEMORY_CONTEXT_KEY) or {})
+        summary = state.get("summary") or ""
+
+        messages = self._fetch_recent(str(conversation_id), state.get("summarized_until"))
+        if len(messages) >= self._keep_messages + self._fold_batch_messages:
+            self._schedule_fold(str(conversation_id))
+
+        if pending_messages:
+            # Queued rows are newer than everything persisted; keep queue order
+            # rather than comparing app-clock and database timestamps.
+            stored_ids = {msg.get("id") for msg in messages}
+            messages.extend(msg for msg in pending_messages if msg.get("id") not in stored_ids)
+
+        # Unfolded turns go through the budget too (newest first), so nothing
+        # is dropped before the summary catches up.
+        return self._apply_budget(summary, messages)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _fetch_recent(self, conversation_id: str, since: Optional[str]) -> List[dict]:
+        """Newest unsummarized messages (returned oldest → newest), enough to fill the
+        token budget and to tell whether a fold is due, but no more."""
+        messages: List[dict] = []
+        tokens = 0
+        while True:
+            page = self._fetch_page(conversation_id, since, len(messages), newest_first=True)
+            messages.extend(page)
+            tokens += sum(estimate_tokens(msg.get("content") or "") for msg in page)
+            if len(page) < self._fetch_limit:
+                break
+            if (
+                tokens >= self._token_budget
+                and len(messages) >= self._keep_messages + self._fold_batch_messages
+            ):
+                break
+        messages.reverse()
+        return messages
+
+    def _fetch_backlog(self, conversation_id: str, since: Optional[str]) -> List[dict]:
+        # Page oldest → newest until the cursor is fully caught up; a single
+        # limited query would silently skip the oldest unsummarized rows.
+        messages: List[dict] = []
+        while True:
+            page = self._fetch_page(conversation_id, since, len(messages), newest_first=False)
+            messages.extend(page)
+            if len(page) < self._fetch_limit:
+                return messages
+
+    def _fetch_page(
+        self, conversation_id: str, since: Optional[str], start: int, *, newest_first: bool
+    ) -> List[dict]:
+        query = (
+            self._supabase.table("messages")
+            .select("id, role, content, created_at")
+            .eq("conversation_id", conversation_id)
+        )
+        if since:
+            query = query.gt("created_at", since)
+        response = (
+            query.order("created_at", desc=newest_first)
+            .range(start, start + self._fetch_limit - 1)
+            .execute()
+        )
+        return getattr(response, "data", None) or []
+
+    def _schedule_fold(self, conversation_id: str) -> None:
+        with self._folding_lock:
+            if conversation_id in self._folding:
+                return  # a fold for this conversation is already running
+            self._folding.add(conversation_id)
+
+        if self._fold_pool is None:
+            self._run_fold(conversation_id)
+        else:
+            self._fold_pool.submit(self._run_fold, conversation_id)
+
+    def _run_fold(self, conversation_id: str) -> None:
+        try:
+            # Start from the stored cursor, not the request's copy: another
+            # process may have folded since the conversation was read.
+            state = dict(self._load_user_context(conversation_id).get(MEMORY_CONTEXT_KEY) or {})
+            summary = state.get("summary") or ""
+            older = self._fetch_backlog(conversation_id, state.get("summarized_until"))[
+                : -self._keep_messages
+            ]
+            if len(older) < self._fold_batch_messages:
+                return
+            # Fold in fetch-sized slices so a long backlog never becomes one huge prompt.
+            for start in range(0, len(older), self._fetch_limit):
+                summary = self._fold(summary, older[start : start + self._fetch_limit])
+            state = {
+                **state,
+                "summary": summary,
+                "summarized_until": older[-1].get("created_at"),
+                "summarized_count": int(state.get("summarized_count", 0)) + len(older),
+                "updated_at": datetime.now().isoformat(),
+            }
+            self._save_state(conversation_id, state)
+        except Exception as exc:  # pragma: no cover - best effort
+            print(f"[DEBUG Memory] summarization skipped: {exc}")
+        finally:
+            with self._folding_lock:
+                self._folding.discard(conversation_id)
+
+    def _fold(self, summary: str, messages: Sequence[dict]) -> str:
+        transcript = "\n".join(
+            f"{'사용자' if msg.get('role') == 'user' else '상담사'}: {msg.get('content', '')}"
+            for msg in messages
+        )
+        prompt = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"[이전 요약]\n{summary or '없음'}\n\n[추가된 대화]\n{transcript}",
+            },
+        ]
+        result = self._chat_client.complete(prompt, temperature=0.0)
+        folded = result if isinstance(result, str) else result.get("content", "")
+        return self._truncate(folded.strip() or summary, self._summary_token_limit)
+
+    def _load_user_context(self, conversation_id: str) -> Dict[str, Any]:
+        response = (
+            self._supabase.table("conversations")
+            .select("user_context")
+            .eq("id", conversation_id)
+            .limit(1)
+            .execute()
+        )
+        rows = getattr(response, "data", None) or []
+        return (rows[0].get("user_context") if rows else None) or {}
+
+    def _save_state(self, conversation_id: str, state: Dict[str, Any]) -> None:
+        # Re-read user_context: the fold finishes after the request that
+        # scheduled it, and other keys may have changed in the meantime.
+        user_context = self._load_user_context(conversation_id)
+        self._supabase.table("conversations").update(
+            {"user_context": {**user_context, MEMORY_CONTEXT_KEY: state}}
+        ).eq("id", conversation_id).execute()
+
+    def _apply_budget(self, summary: str, verbatim: Sequence[dict]) -> List[dict]:
+        history: List[dict] = []
+        remaining = self._token_budget
+
+        if summary:
+            summary = self._truncate(summary, min(self._summary_token_limit, remaining))
+            remaining -= estimate_tokens(summary)
+            history.append({"role": "system", "content": f"이전 대화 요약:\n{summary}"})
+
+        # Walk newest → oldest so the most recent turns survive the budget.
+        kept: List[dict] = []
+        for msg in reversed(verbatim):
+            content = msg.get("content") or ""
+            cost = estimate_tokens(content)
+            if cost > remaining:
+                if not kept and remaining > 0:
+                    kept.append({"role": msg["role"], "content": self._truncate(content, remaining)})
+                break
+            kept.append({"role": msg["role"], "content": content})
+            remaining -= cost
+
+        history.extend(reversed(kept))
+        return history
+
+    @staticmethod
+    def _truncate(text: str, token_limit: int) -> str:
+        max_chars = max(0, token_limit * 2)
+        if len(text) <= max_chars:
+            return text
+        return text[: max(0, max_chars - 1)].rstrip() + "…"
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import base64
 from typing import Iterable, List, Sequence, Optional, Any
 
-from openai import OpenAI
+import numpy as np
+
+from .transport import OpenAITransport, get_openai_transport
 
 try:  # pragma: no cover - optional dependency for local embeddings
     from sentence_transformers import SentenceTransformer
@@ -10,13 +13,29 @@ except ImportError:  # pragma: no cover
     SentenceTransformer = None  # type: ignore[assignment]
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting; Korean-heavy text averages ~2 characters per token."""
+    return len(text) // 2 + 1
+
+
+def _decode_embedding(value: Any) -> np.ndarray:
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def _usage_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage is not None else None
+
+
 class OpenAIEmbeddingClient:
     """Wrapper that supports OpenAI embeddings and optional sentence-transformers fallback."""
 
     def __init__(self, api_key: str, model: str) -> None:
         self._model = model
         self._backend = "openai"
-        self._client: OpenAI | None = None
+        self._transport: OpenAITransport | None = None
         self._st_model: SentenceTransformer | None = None
 
         if self._should_use_sentence_transformers(model):
@@ -25,45 +44,64 @@ class OpenAIEmbeddingClient:
             self._backend = "sentence_transformers"
             self._st_model = SentenceTransformer(model)
         else:
-            self._client = OpenAI(api_key=api_key)
+            self._transport = get_openai_transport(api_key)
+
+    @property
+    def is_local(self) -> bool:
+        """True for the in-process sentence-transformers backend."""
+        return self._backend == "sentence_transformers"
 
     @staticmethod
     def _should_use_sentence_transformers(model: str) -> bool:
         return "/" in model or model.startswith("local:")
 
     def embed(self, inputs: Sequence[str]) -> List[List[float]]:
+        matrix = self.embed_matrix(inputs)
+        return [row.tolist() if text.strip() else [] for text, row in zip(inputs, matrix)]
+
+    def embed_matrix(self, inputs: Sequence[str]) -> np.ndarray:
+        """Embed ``inputs`` into a float32 ``(len(inputs), dim)`` matrix.
+
+        Blank inputs are not sent and get zero rows; dim is 0 if all are blank.
+        """
+        keep = [index for index, text in enumerate(inputs) if text.strip()]
+        if not keep:
+            return np.zeros((len(inputs), 0), dtype=np.float32)
+        texts = [inputs[index] for index in keep]
+
         if self._backend == "sentence_transformers":
             assert self._st_model is not None
-            texts = [text if text.strip() else "" for text in inputs]
-            if not any(texts):
-                return [[] for _ in inputs]
-            embeddings = self._st_model.encode(texts, normalize_embeddings=True)
-            return [list(map(float, vector)) for vector in embeddings]
-
-        # OpenAI backend (default)
-        assert self._client is not None
-        batched = [item for item in inputs if item.strip()]
-        if not batched:
-            return [[] for _ in inputs]
-        response = self._client.embeddings.create(model=self._model, input=batched)
-        embeddings = [item.embedding for item in response.data]
-
-        iterator = iter(embeddings)
-        result: List[List[float]] = []
-        for text in inputs:
-            if text.strip():
-                result.append(next(iterator))
-            else:
-                result.append([])
-        return result
+            vectors = self._st_model.encode(
+                texts, normalize_embeddings=True, convert_to_numpy=True
+            )
+        else:
+            # OpenAI backend (default); base64 avoids parsing 1024 JSON floats per text
+            assert self._transport is not None
+            response = self._transport.call(
+                lambda client: client.embeddings.create(
+                    model=self._model, input=texts, encoding_format="base64"
+                ),
+                estimated_tokens=sum(estimate_tokens(item) for item in texts),
+                usage_tokens=_usage_tokens,
+            )
+            vectors = np.stack([_decode_embedding(item.embedding) for item in response.data])
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(keep) == len(inputs):
+            return vectors
+        matrix = np.zeros((len(inputs), vectors.shape[1]), dtype=np.float32)
+        matrix[keep] = vectors
+        return matrix
 
 
 class OpenAIChatClient:
     """Thin wrapper around the OpenAI chat completion API with Function Calling support."""
 
-    def __init__(self, api_key: str, model: str) -> None:
-        self._client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, model: str, *, expected_output_tokens: int = 512) -> None:
+        self._transport = get_openai_transport(api_key)
         self._model = model
+        # Only used to pre-charge the TPM limiter; completions are not capped.
+        self._expected_output_tokens = expected_output_tokens
 
     def complete(
         self,
@@ -96,7 +134,14 @@ class OpenAIChatClient:
             print(f"[DEBUG OpenAI] Model: {self._model}")
             print(f"[DEBUG OpenAI] tool_choice: {kwargs.get('tool_choice', 'default (auto)')}")
 
-        response = self._client.chat.completions.create(**kwargs)
+        estimated = self._expected_output_tokens + sum(
+            estimate_tokens(str(message.get("content") or "")) for message in kwargs["messages"]
+        )
+        response = self._transport.call(
+            lambda client: client.chat.completions.create(**kwargs),
+            estimated_tokens=estimated,
+            usage_tokens=_usage_tokens,
+        )
         message = response.choices[0].message
 
         print(f"[DEBUG OpenAI] Response message.content: {message.content[:100] if message.content else 'None'}")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Tuple
 
 from pypdf import PdfReader
 
@@ -9,13 +9,15 @@ from .types import ChunkInput, DocumentMetadata
 
 
 def read_pdf(path: Path) -> List[str]:
+    return [text for _, text in iter_pages(path)]
+
+
+def iter_pages(path: Path, *, start_page: int = 1) -> Iterator[Tuple[int, str]]:
+    """Yield ``(page_number, text)`` one page at a time (1-based), from ``start_page``."""
     reader = PdfReader(str(path))
-    pages: List[str] = []
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        cleaned = text.replace(chr(0), " ").strip()
-        pages.append(cleaned)
-    return pages
+    for page_index in range(max(start_page, 1) - 1, len(reader.pages)):
+        text = reader.pages[page_index].extract_text() or ""
+        yield page_index + 1, text.replace(chr(0), " ").strip()
 
 
 def chunk_text(text: str, *, chunk_size: int = 1200, overlap: int = 200) -> Iterable[str]:
@@ -39,13 +41,22 @@ def chunk_text(text: str, *, chunk_size: int = 1200, overlap: int = 200) -> Iter
 
 
 def build_chunks(path: Path, *, chunk_size: int = 1200, overlap: int = 200) -> List[ChunkInput]:
+    return [
+        chunk
+        for _, page_chunks in iter_page_chunks(path, chunk_size=chunk_size, overlap=overlap)
+        for chunk in page_chunks
+    ]
+
+
+def iter_page_chunks(
+    path: Path, *, chunk_size: int = 1200, overlap: int = 200, start_page: int = 1
+) -> Iterator[Tuple[int, List[ChunkInput]]]:
+    """Stream ``(page_number, chunks)`` so only one page is held in memory."""
     if not path.exists():
         raise FileNotFoundError(f"PDF not found: {path}")
 
-    chunks: List[ChunkInput] = []
-    pages = read_pdf(path)
-
-    for page_index, text in enumerate(pages, start=1):
+    for page_index, text in iter_pages(path, start_page=start_page):
+        chunks: List[ChunkInput] = []
         for local_idx, chunk_text_value in enumerate(
             chunk_text(text, chunk_size=chunk_size, overlap=overlap), start=1
         ):
@@ -56,5 +67,4 @@ def build_chunks(path: Path, *, chunk_size: int = 1200, overlap: int = 200) -> L
                 extra={"chunk_index": local_idx},
             )
             chunks.append(ChunkInput(id=chunk_id, text=chunk_text_value, metadata=metadata))
-
-    return chunks
+        yield page_index, chunks
@@ -0,0 +1,116 @@
+"""LLM query rewriting (standalone question, paraphrases, HyDE) for retrieval."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from .openai_client import OpenAIChatClient
+
+REWRITE_MODES = {"standalone", "multi", "hyde"}
+
+REWRITE_PROMPT = (
+    "당신은 임신·출산·육아 정책 검색을 위한 질의 재작성기입니다. "
+    "대화 기록을 참고해 마지막 사용자 질문을 대화 없이도 이해되는 독립적인 한국어 검색 질의로 바꾸세요. "
+    "대명사나 생략된 정책명·대상·지역은 대화에서 찾아 채워 넣으세요. "
+    "반드시 JSON 객체 하나만 출력하세요: "
+    '{"standalone": "독립 질의", "paraphrases": ["다른 표현 질의", ...], '
+    '"hypothetical_answer": "정책 문서에 있을 법한 2~3문장 답변"}'
+)
+
+
+class QueryRewriter:
+    """Produce retrieval queries from the user question and conversation history.
+
+    Modes:
+        standalone: one self-contained query (only calls the LLM when history exists)
+        multi: standalone query plus ``num_paraphrases`` paraphrases
+        hyde: standalone query plus a hypothetical answer passage
+    Results are memoized in an LRU cache so repeated rewrites cost nothing.
+    """
+
+    def __init__(
+        self,
+        chat_client: OpenAIChatClient,
+        *,
+        mode: str = "standalone",
+        num_paraphrases: int = 2,
+        cache_size: int = 512,
+        history_messages: int = 4,
+    ) -> None:
+        if mode not in REWRITE_MODES:
+            raise ValueError(f"지원하지 않는 질의 재작성 모드입니다: {mode}")
+        self._chat_client = chat_client
+        self._mode = mode
+        self._num_paraphrases = max(0, num_paraphrases)
+        self._cache_size = max(1, cache_size)
+        self._history_messages = max(0, history_messages)
+        self._cache: OrderedDict[str, List[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def rewrite(self, question: str, history: Optional[Sequence[dict]] = None) -> List[str]:
+        """Return de-duplicated queries; the first one is always the standalone query."""
+        recent: List[dict] = []
+        if self._history_messages:
+            recent = [msg for msg in (history or []) if msg.get("content")][
+                -self._history_messages :
+            ]
+        if self._mode == "standalone" and not recent:
+            return [question]
+
+        key = self._cache_key(question, recent)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return list(cached)
+
+        try:
+            queries = self._call_llm(question, recent)
+        except Exception as exc:  # pragma: no cover - fall back to raw question
+            print(f"[DEBUG Rewrite] rewrite failed, using raw question: {exc}")
+            return [question]
+
+        with self._lock:
+            self._cache[key] = queries
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return list(queries)
+
+    def _call_llm(self, question: str, history: Sequence[dict]) -> List[str]:
+        transcript = "\n".join(
+            f"{msg['role']}: {(msg.get('content') or '')[:500]}" for msg in history
+        )
+        wants = {
+            "standalone": "standalone만 채우고 나머지는 비워 두세요.",
+            "multi": f"paraphrases를 {self._num_paraphrases}개 작성하고 hypothetical_answer는 비워 두세요.",
+            "hyde": "paraphrases는 비워 두고 hypothetical_answer를 작성하세요.",
+        }[self._mode]
+        messages = [
+            {"role": "system", "content": REWRITE_PROMPT},
+            {
+                "role": "user",
+                "content": f"[대화 기록]\n{transcript or '없음'}\n\n[질문]\n{question}\n\n{wants}",
+            },
+        ]
+        raw = self._chat_client.complete(messages, temperature=0.0)
+        text = raw if isinstance(raw, str) else raw.get("content", "")
+        payload = json.loads(text[text.find("{") : text.rfind("}") + 1])
+
+        queries: List[str] = [str(payload.get("standalone") or question).strip()]
+        if self._mode == "multi":
+            queries.extend(str(item).strip() for item in (payload.get("paraphrases") or [])[: self._num_paraphrases])
+        elif self._mode == "hyde" and payload.get("hypothetical_answer"):
+            queries.append(str(payload["hypothetical_answer"]).strip())
+        return list(dict.fromkeys(query for query in queries if query))
+
+    def _cache_key(self, question: str, history: Sequence[dict]) -> str:
+        fingerprint = json.dumps(
+            [self._mode, question.strip(), [(m.get("role"), m.get("content")) for m in history]],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
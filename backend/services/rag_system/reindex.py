@@ -0,0 +1,342 @@
+"""Re-embed policy chunks for a new embedding model into a shadow table, then swap."""
+
+from __future__ import annotations
+
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from supabase import Client
+
+from .dedupe import simhash, to_signed64
+from .embedding_scheduler import EmbeddingScheduler
+from .openai_client import OpenAIEmbeddingClient
+from .types import ChunkBatch, ChunkInput, DocumentMetadata
+from .vector_store import SupabaseVectorStore
+
+SOURCE_COLUMNS = "id, doc_id, chunk_index, content, metadata, simhash"
+
+# Versions that ingest writes to alongside the active index (dual-write).
+SHADOW_STATUSES = ("building", "ready")
+
+# Catch-up re-copies rows updated since the last sync minus this margin, so
+# clock skew between the backend and the database cannot skip a row.
+SYNC_MARGIN = timedelta(minutes=2)
+
+
+def normalize_version(value: str) -> str:
+    """Table-name-safe version label, e.g. ``"bge-m3 v2"`` -> ``"bge_m3_v2"``."""
+    version = re.sub(r"[^a-z0-9_]+", "_", value.lower()).strip("_")
+    if not version:
+        raise ValueError("인덱스 버전 이름이 비어 있습니다.")
+    return version
+
+
+class EmbeddingIndexRegistry:
+    """Access to the ``embedding_indexes`` table (one row per model version)."""
+
+    def __init__(self, supabase: Client, *, table: str = "embedding_indexes") -> None:
+        self._supabase = supabase
+        self._table = table
+
+    def active(self) -> Optional[dict]:
+        response = (
+            self._supabase.table(self._table).select("*").eq("status", "active").limit(1).execute()
+        )
+        return response.data[0] if response.data else None
+
+    def get(self, version: str) -> Optional[dict]:
+        response = self._supabase.table(self._table).select("*").eq("version", version).execute()
+        return response.data[0] if response.data else None
+
+    def shadows(self) -> List[dict]:
+        """Versions being built or waiting for activation."""
+        response = (
+            self._supabase.table(self._table)
+            .select("*")
+            .in_("status", list(SHADOW_STATUSES))
+            .execute()
+        )
+        return response.data or []
+
+    def list(self) -> List[dict]:
+        response = (
+            self._supabase.table(self._table).select("*").order("created_at", desc=True).execute()
+        )
+        return response.data or []
+
+    def register(self, *, version: str, model: str, dimension: int, total_chunks: int) -> dict:
+        payload = {
+            "version": version,
+            "model": model,
+            "dimension": dimension,
+            "chunk_table": f"policy_chunks_{version}",
+            "match_function": f"match_policy_chunks_{version}",
+            "status": "building",
+            "total_chunks": total_chunks,
+            "embedded_chunks": 0,
+            "error": None,
+            "updated_at": _now(),
+        }
+        response = self._supabase.table(self._table).upsert(payload).execute()
+        return response.data[0] if response.data else payload
+
+    def adopt(
+        self,
+        *,
+        version: str,
+        model: str,
+        dimension: int,
+        chunk_table: str,
+        match_function: str,
+        status: str = "active",
+    ) -> dict:
+        """Record an index that predates the registry (the env-configured one).
+
+        Adopted as active before the first swap, it is then retired like any other
+        version, so it can be rolled back to.
+        """
+        payload = {
+            "version": version,
+            "model": model,
+            "dimension": dimension,
+            "chunk_table": chunk_table,
+            "match_function": match_function,
+            "status": status,
+            "total_chunks": 0,
+            "embedded_chunks": 0,
+            "activated_at": _now() if status == "active" else None,
+            "synced_at": _now(),
+            "updated_at": _now(),
+        }
+        response = self._supabase.table(self._table).upsert(payload).execute()
+        return response.data[0] if response.data else payload
+
+    def update(self, version: str, **fields) -> None:
+        fields["updated_at"] = _now()
+        self._supabase.table(self._table).update(fields).eq("version", version).execute()
+
+    def activate(self, version: str) -> None:
+        """Flip the active index in one transaction (see activate_embedding_index)."""
+        self._supabase.rpc("activate_embedding_index", {"p_version": version}).execute()
+
+
+class Reindexer:
+    """Copy every chunk from ``source_table`` into a new shadow table with ``model`` embeddings.
+
+    The live index keeps serving queries throughout. While the shadow exists
+    ingest writes to it as well (see RagService._flush_ingest); anything that
+    still differs is reconciled by ``sync``, which re-copies rows added or
+    updated in the source since the last sync and drops rows deleted from it.
+    ``activate`` runs a final sync right before the swap.
+    """
+
+    def __init__(
+        self,
+        supabase: Client,
+        *,
+        openai_api_key: str,
+        source_table: str,
+        model: str,
+        version: str,
+        batch_size: int = 64,
+        batch_tokens: int = 8000,
+        concurrency: int = 4,
+        page_size: int = 500,
+        activate: bool = True,
+    ) -> None:
+        self._supabase = supabase
+        self._registry = EmbeddingIndexRegistry(supabase)
+        self._source_table = source_table
+        self._model = model
+        self._version = normalize_version(version)
+        self._client = OpenAIEmbeddingClient(api_key=openai_api_key, model=model)
+        self._scheduler = EmbeddingScheduler(
+            self._client,
+            max_batch_size=batch_size,
+            max_batch_tokens=batch_tokens,
+            concurrency=concurrency,
+        )
+        self._page_size = max(1, page_size)
+        self._activate = activate
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    def run(self) -> dict:
+        try:
+            dimension = self._client.embed_matrix(["dimension probe"]).shape[1]
+            # Table first: once the row says 'building', ingest dual-writes to it.
+            self._supabase.rpc(
+                "create_embedding_shadow", {"p_version": self._version, "p_dimension": dimension}
+            ).execute()
+            self._registry.register(
+                version=self._version,
+                model=self._model,
+                dimension=dimension,
+                total_chunks=self._count(self._source_table),
+            )
+            started_at = _now(-SYNC_MARGIN)
+            target = self._target()
+
+            embedded = 0
+            for rows in self._pages(self._source_table, SOURCE_COLUMNS):
+                embedded += self._copy(rows, target)
+                self._registry.update(self._version, embedded_chunks=embedded)
+
+            # Rows ingested or re-ingested into the live table during the copy
+            self._sync(target, since=started_at)
+            total = self._count(target.table)
+            self._registry.update(
+                self._version, status="ready", embedded_chunks=total, total_chunks=total
+            )
+            if self._activate:
+                self.activate()
+            print(f"[DEBUG Reindex] {self._version}: {total} chunks re-embedded with {self._model}")
+            return self._registry.get(self._version) or {}
+        except Exception as exc:
+            print(f"[DEBUG Reindex] {self._version} failed: {exc}")
+            try:
+                self._registry.update(self._version, status="failed", error=str(exc)[:1000])
+            except Exception:
+                pass
+            raise
+
+    def sync(self) -> int:
+        """Reconcile the shadow with the source table since its last sync; return rows changed."""
+        row = self._registry.get(self._version)
+        if row is None:
+            raise ValueError(f"인덱스 버전을 찾을 수 없습니다: {self._version}")
+        return self._sync(self._target(row), since=row.get("synced_at"))
+
+    def activate(self) -> None:
+        """Final catch-up, then swap; dual-writing ingests cover the gap in between."""
+        changed = self.sync()
+        self._registry.activate(self._version)
+        print(f"[DEBUG Reindex] {self._version}: activated after final sync ({changed} rows)")
+
+    def _target(self, row: Optional[dict] = None) -> SupabaseVectorStore:
+        row = row or self._registry.get(self._version)
+        return SupabaseVectorStore(
+            self._supabase, table=row["chunk_table"], query_function=row["match_function"]
+        )
+
+    def _sync(self, target: SupabaseVectorStore, *, since: Optional[str]) -> int:
+        """Copy rows missing from ``target`` or updated since ``since``; delete rows gone from the source.
+
+        Ids alone cannot tell a re-ingested chunk from the old one, so rows are
+        compared on ``updated_at`` (maintained by a trigger on every chunk table).
+        """
+        synced_at = _now(-SYNC_MARGIN)
+        source_ids = self._ids(self._source_table)
+        target_ids = self._ids(target.table)
+
+        stale = source_ids - target_ids
+        if since:
+            stale |= {
+                row["id"]
+                for rows in self._pages(self._source_table, "id", updated_since=since)
+                for row in rows
+            }
+        changed = 0
+        ordered = sorted(stale)
+        for start in range(0, len(ordered), self._page_size):
+            rows = (
+                self._supabase.table(self._source_table)
+                .select(SOURCE_COLUMNS)
+                .in_("id", ordered[start : start + self._page_size])
+                .execute()
+            ).data or []
+            changed += self._copy(rows, target)
+
+        removed = sorted(target_ids - source_ids)
+        for start in range(0, len(removed), self._page_size):
+            self._supabase.table(target.table).delete().in_(
+                "id", removed[start : start + self._page_size]
+            ).execute()
+        changed += len(removed)
+
+        self._registry.update(self._version, synced_at=synced_at)
+        return changed
+
+    def _copy(self, rows: List[dict], target: SupabaseVectorStore) -> int:
+        if not rows:
+            return 0
+        inputs = [
+            ChunkInput(
+                id=row["id"],
+                text=row.get("content") or "",
+                metadata=DocumentMetadata(
+                    source=row["doc_id"],
+                    page=(row.get("metadata") or {}).get("page"),
+                    extra={
+                        **((row.get("metadata") or {}).get("extra") or {}),
+                        "chunk_index": row.get("chunk_index", 0),
+                    },
+                ),
+            )
+            for row in rows
+        ]
+        matrix = self._scheduler.embed([item.text for item in inputs])
+        signatures = [
+            row["simhash"] if row.get("simhash") is not None else to_signed64(simhash(item.text))
+            for row, item in zip(rows, inputs)
+        ]
+        target.add_batch(ChunkBatch.from_inputs(inputs, matrix), simhashes=signatures)
+        return len(rows)
+
+    def _pages(
+        self, table: str, columns: str, *, updated_since: Optional[str] = None
+    ) -> Iterator[List[dict]]:
+        start = 0
+        while True:
+            query = self._supabase.table(table).select(columns)
+            if updated_since:
+                query = query.gte("updated_at", updated_since)
+            rows = (
+                query.order("id").range(start, start + self._page_size - 1).execute()
+            ).data or []
+            if rows:
+                yield rows
+            if len(rows) < self._page_size:
+                return
+            start += self._page_size
+
+    def _ids(self, table: str) -> set:
+        return {row["id"] for rows in self._pages(table, "id") for row in rows}
+
+    def _count(self, table: str) -> int:
+        response = self._supabase.table(table).select("id", count="exact", head=True).execute()
+        return getattr(response, "count", None) or 0
+
+
+_RUNNING: Dict[str, threading.Thread] = {}
+_RUNNING_LOCK = threading.Lock()
+
+
+def start_reindex(reindexer: Reindexer) -> bool:
+    """Run ``reindexer`` in a background thread; False if that version is already running."""
+    with _RUNNING_LOCK:
+        running = _RUNNING.get(reindexer.version)
+        if running is not None and running.is_alive():
+            return False
+
+        def _target() -> None:
+            try:
+                reindexer.run()
+            except Exception:
+                pass  # recorded as status='failed' in embedding_indexes
+            finally:
+                with _RUNNING_LOCK:
+                    _RUNNING.pop(reindexer.version, None)
+
+        thread = threading.Thread(target=_target, name=f"reindex-{reindexer.version}", daemon=True)
+        _RUNNING[reindexer.version] = thread
+        thread.start()
+        return True
+
+
+def _now(offset: timedelta = timedelta(0)) -> str:
+    return (datetime.now(timezone.utc) + offset).isoformat()
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import List, Sequence
 
+import numpy as np
+
 try:  # pragma: no cover - optional dependency
     from sentence_transformers import CrossEncoder
 except ImportError:  # pragma: no cover
@@ -36,14 +38,13 @@ class CrossEncoderReranker:
             return []
 
         pairs = [(question, item.chunk.text) for item in candidates]
-        scores = self._encoder.predict(pairs)
-
-        reranked: List[RankedChunk] = [
-            RankedChunk(chunk=item.chunk, score=float(score))
-            for item, score in zip(candidates, scores, strict=True)
-        ]
-        reranked.sort(key=lambda item: (item.score or 0.0), reverse=True)
+        scores = np.asarray(self._encoder.predict(pairs), dtype=np.float32)
 
+        # Stable descending order; only the kept top_n are materialized.
+        order = np.argsort(-scores, kind="stable")
         if top_n is not None:
-            reranked = reranked[: top_n]
-        return reranked
+            order = order[:top_n]
+        return [
+            RankedChunk(chunk=candidates[index].chunk, score=float(scores[index]))
+            for index in order
+        ]
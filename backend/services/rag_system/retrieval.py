@@ -0,0 +1,93 @@
+"""Post-retrieval helpers that combine or reshape vector-store candidates."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .vector_store import RankedChunk
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[RankedChunk]], *, k: int = 60, limit: int | None = None
+) -> List[RankedChunk]:
+    """Fuse several ranked lists by chunk id using reciprocal rank fusion.
+
+    The fused score is ``sum(1 / (k + rank))`` over every list a chunk appears in.
+    """
+    if len(rankings) == 1:
+        return list(rankings[0][:limit] if limit is not None else rankings[0])
+
+    scores: Dict[str, float] = {}
+    chunks: Dict[str, RankedChunk] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            chunk_id = item.chunk.id
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank)
+            chunks.setdefault(chunk_id, item)
+
+    fused = [
+        RankedChunk(chunk=chunks[chunk_id].chunk, score=score)
+        for chunk_id, score in sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+    ]
+    return fused[:limit] if limit is not None else fused
+
+
+def cap_per_document(
+    ranked: Sequence[RankedChunk], *, max_per_document: int, limit: int | None = None
+) -> List[RankedChunk]:
+    """Keep at most ``max_per_document`` hits per source document, preserving order."""
+    counts: Dict[str, int] = {}
+    kept: List[RankedChunk] = []
+    for item in ranked:
+        source = item.chunk.metadata.source
+        if counts.get(source, 0) >= max_per_document:
+            continue
+        counts[source] = counts.get(source, 0) + 1
+        kept.append(item)
+        if limit is not None and len(kept) >= limit:
+            break
+    return kept
+
+
+def mmr_select(
+    query_embedding: np.ndarray,
+    candidate_embeddings: np.ndarray,
+    *,
+    k: int,
+    lambda_mult: float = 0.7,
+    relevance: Optional[np.ndarray] = None,
+) -> List[int]:
+    """Maximal marginal relevance over ``(n, dim)`` candidates; returns picked row indices.
+
+    Each step picks ``argmax(lambda * rel - (1 - lambda) * max_sim_to_picked)``.
+    ``relevance`` (e.g. reranker scores) is min-max scaled; without it cosine
+    similarity to the query is used. Rows that are all zeros (missing vectors)
+    are treated as dissimilar to everything.
+    """
+    count = candidate_embeddings.shape[0]
+    if count == 0 or k <= 0:
+        return []
+    norms = np.linalg.norm(candidate_embeddings, axis=1, keepdims=True)
+    candidates = candidate_embeddings / np.where(norms == 0, 1.0, norms)
+
+    if relevance is None:
+        query = query_embedding / (np.linalg.norm(query_embedding) or 1.0)
+        relevance = candidates @ query
+    relevance = np.asarray(relevance, dtype=np.float32)
+    spread = float(relevance.max() - relevance.min())
+    relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones_like(relevance)
+
+    similarity = candidates @ candidates.T
+    selected: List[int] = []
+    max_similarity = np.zeros(count, dtype=np.float32)
+    available = np.ones(count, dtype=bool)
+    for _ in range(min(k, count)):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        np.maximum(max_similarity, similarity[pick], out=max_similarity)
+    return selected
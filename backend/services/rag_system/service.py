@@ -1,16 +1,41 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from time import perf_counter
-from typing import Iterable, List, Optional
+from time import monotonic, perf_counter
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 from supabase import Client
 
+from .dedupe import (
+    SimHashIndex,
+    collapse_near_duplicates,
+    from_signed64,
+    simhash,
+    to_signed64,
+    with_also_in,
+)
+from .embedding_scheduler import EmbeddingScheduler, EmbeddingStats
+from .memory import ConversationMemory
 from .openai_client import OpenAIChatClient, OpenAIEmbeddingClient
-from .pdf_loader import build_chunks
+from .checkpoints import IngestCheckpoint, IngestCheckpointStore, file_fingerprint
+from .pdf_loader import iter_page_chunks
+from .query_rewriter import QueryRewriter
+from .reindex import EmbeddingIndexRegistry, Reindexer, normalize_version, start_reindex
 from .reranker import CrossEncoderReranker
-from .types import ChunkInput, DocumentChunk, IngestedDocument
+from .retrieval import cap_per_document, mmr_select, reciprocal_rank_fusion
+from .singleflight import SingleFlight
+from .transport import OpenAIUnavailableError
+from .types import ChunkBatch, ChunkInput, IngestedDocument
 from .vector_store import RankedChunk, SupabaseVectorStore
 
 SYSTEM_PROMPT = (
@@ -25,11 +50,32 @@ SYSTEM_PROMPT = (
     "\n\n반드시 모든 답변은 한국어로만 작성하세요."
 )
 
+UNAVAILABLE_ANSWER = (
+    "현재 답변 생성 요청이 많아 일시적으로 응답할 수 없습니다. 잠시 후 다시 시도해 주세요."
+)
+
 
 def _default(value: Optional[str], fallback: str) -> str:
     return value if value else fallback
 
 
+@dataclass(slots=True)
+class ActiveIndex:
+    """An embedding model and the chunk table embedded with it.
+
+    Requests capture one instance up front so a concurrent index swap never
+    embeds a query with one model and searches the other model's vectors.
+    """
+
+    version: str
+    model: str
+    chunk_table: str
+    embedding_client: OpenAIEmbeddingClient
+    vector_store: SupabaseVectorStore
+    embedder: EmbeddingScheduler
+    dedupe: SimHashIndex | None = None
+
+
 class RagService:
     def __init__(
         self,
@@ -43,22 +89,82 @@ class RagService:
         chunk_size: int = 1200,
         chunk_overlap: int = 200,
         embedding_batch_size: int = 64,
+        embedding_batch_tokens: int = 8000,
+        embedding_concurrency: int = 4,
+        ingest_flush_chunks: int = 256,
+        dedupe_max_distance: Optional[int] = None,
+        diversify_mode: Optional[str] = None,
+        context_k: int = 10,
+        mmr_lambda: float = 0.7,
+        max_chunks_per_document: int = 3,
         reranker: CrossEncoderReranker | None = None,
         rerank_top_n: Optional[int] = None,
+        history_keep_turns: int = 3,
+        history_token_budget: int = 1500,
+        history_fold_batch_turns: int = 4,
+        default_top_k: int = 50,
+        query_rewrite_mode: Optional[str] = None,
+        query_paraphrases: int = 2,
+        fallback_cache_size: int = 256,
+        index_refresh_seconds: float = 30.0,
     ) -> None:
         self._supabase = supabase
-        self._vector_store = SupabaseVectorStore(
-            supabase, table=vector_table, query_function=match_function
-        )
-        self._embedding_client = OpenAIEmbeddingClient(
-            api_key=openai_api_key, model=embedding_model
-        )
+        self._openai_api_key = openai_api_key
         self._chat_client = OpenAIChatClient(api_key=openai_api_key, model=chat_model)
         self._chunk_size = chunk_size
         self._chunk_overlap = chunk_overlap
         self._embedding_batch_size = max(1, embedding_batch_size)
+        self._embedding_batch_tokens = embedding_batch_tokens
+        self._embedding_concurrency = embedding_concurrency
+        # Env-configured index; replaced by the active row of embedding_indexes if any.
+        self._index = self._build_index(
+            version="default",
+            model=embedding_model,
+            chunk_table=vector_table,
+            match_function=match_function,
+        )
+        self._configured_index = self._index
+        self._index_registry = EmbeddingIndexRegistry(supabase)
+        self._index_refresh_seconds = max(0.0, index_refresh_seconds)
+        self._index_checked_at = float("-inf")
+        self._index_lock = threading.Lock()
+        # Shadow indexes (reindex in progress) that ingest dual-writes to, by version.
+        self._shadow_indexes: Dict[str, ActiveIndex] = {}
+        self._ingest_flush_chunks = max(1, ingest_flush_chunks)
+        self._checkpoints = IngestCheckpointStore(supabase)
+        self._last_ingest_stats = EmbeddingStats()
+        # Near-duplicate detection (None disables); the index is loaded on first ingest.
+        self._dedupe_max_distance = dedupe_max_distance
+        self._dedupe_lock = threading.Lock()
+        if diversify_mode not in {None, "mmr", "cap"}:
+            raise ValueError(f"지원하지 않는 다양화 모드입니다: {diversify_mode}")
+        self._diversify_mode = diversify_mode
+        self._context_k = max(1, context_k)
+        self._mmr_lambda = mmr_lambda
+        self._max_chunks_per_document = max(1, max_chunks_per_document)
         self._reranker = reranker
         self._rerank_top_n = rerank_top_n
+        self._memory = ConversationMemory(
+            supabase,
+            self._chat_client,
+            keep_turns=history_keep_turns,
+            token_budget=history_token_budget,
+            fold_batch_turns=history_fold_batch_turns,
+        )
+        self._default_top_k = max(1, default_top_k)
+        self._query_rewriter: QueryRewriter | None = None
+        if query_rewrite_mode:
+            self._query_rewriter = QueryRewriter(
+                self._chat_client, mode=query_rewrite_mode, num_paraphrases=query_paraphrases
+            )
+        self._retrieval_pool = ThreadPoolExecutor(
+            max_workers=max(2, query_paraphrases + 1), thread_name_prefix="rag-retrieval"
+        )
+        self._inflight = SingleFlight()
+        # Last good answers per request key, served while OpenAI is unavailable.
+        self._fallback_cache: OrderedDict[str, dict] = OrderedDict()
+        self._fallback_cache_size = max(0, fallback_cache_size)
+        self._fallback_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Ingestion helpers
@@ -70,32 +176,19 @@ class RagService:
         policy_id: str,
         policy_title: str,
         metadata: dict | None = None,
+        resume: bool = True,
     ) -> IngestedDocument:
-        """Ingest a single PDF file using the provided policy metadata."""
-        chunks = build_chunks(
-            path, chunk_size=self._chunk_size, overlap=self._chunk_overlap
-        )
-        if not chunks:
-            return IngestedDocument(path=path, chunks=[])
+        """Stream-ingest a single PDF using the provided policy metadata.
 
-        normalized_chunks = self._prepare_chunks(
-            chunks, policy_id=policy_id, file_path=path
-        )
-        embeddings = self._embed_chunks(normalized_chunks)
-        stored_chunks = [
-            DocumentChunk(
-                id=chunk.id,
-                text=chunk.text,
-                metadata=chunk.metadata,
-                embedding=embedding,
-            )
-            for chunk, embedding in zip(normalized_chunks, embeddings, strict=True)
-        ]
-
-        # Persist to Supabase
-        self._vector_store.add_chunks(stored_chunks)
+        Pages are read, chunked, embedded and upserted in flushes of about
+        ``ingest_flush_chunks`` chunks, so memory does not grow with the PDF.
+        After each flush the last page is checkpointed; with ``resume`` a
+        previously interrupted ingest of the same file continues from there.
+        """
+        if not path.exists():
+            raise FileNotFoundError(f"PDF not found: {path}")
 
-        # Ensure policy row exists/upserts
+        # Policy row first: policy_chunks.doc_id references policies.id
         policy_payload = {
             "id": policy_id,
             "title": _default(policy_title, policy_id),
@@ -106,7 +199,183 @@ class RagService:
         }
         self._supabase.table("policies").upsert(policy_payload).execute()
 
-        return IngestedDocument(path=path, chunks=stored_chunks)
+        fingerprint = file_fingerprint(path)
+        checkpoint = (
+            self._checkpoints.resume_point(policy_id, fingerprint)
+            if resume
+            else IngestCheckpoint(policy_id=policy_id, fingerprint=fingerprint)
+        )
+        if checkpoint.last_page:
+            print(f"[DEBUG Ingest] resuming {policy_id} after page {checkpoint.last_page}")
+
+        stats = EmbeddingStats()
+        pending: List[ChunkInput] = []
+        pending_page = checkpoint.last_page
+        for page_number, page_chunks in iter_page_chunks(
+            path,
+            chunk_size=self._chunk_size,
+            overlap=self._chunk_overlap,
+            start_page=checkpoint.last_page + 1,
+        ):
+            pending.extend(page_chunks)
+            pending_page = page_number
+            if len(pending) >= self._ingest_flush_chunks:
+                self._flush_ingest(pending, policy_id, path, checkpoint, pending_page, stats)
+                pending = []
+        if pending or pending_page > checkpoint.last_page:
+            self._flush_ingest(pending, policy_id, path, checkpoint, pending_page, stats)
+
+        checkpoint.status = "done"
+        self._checkpoints.save(checkpoint)
+        self._last_ingest_stats = stats
+        return IngestedDocument(path=path, chunks=[], total_chunks=checkpoint.chunks)
+
+    def _flush_ingest(
+        self,
+        chunks: List[ChunkInput],
+        policy_id: str,
+        path: Path,
+        checkpoint: IngestCheckpoint,
+        last_page: int,
+        stats: EmbeddingStats,
+    ) -> None:
+        if chunks:
+            # Fresh lookup: a flush must not land only in an index that was just retired.
+            index = self._current_index(force=True)
+            prepared = self._prepare_chunks(chunks, policy_id=policy_id, file_path=path)
+            if self._dedupe_max_distance is None:
+                index.vector_store.add_batch(
+                    ChunkBatch.from_inputs(prepared, self._embed_chunks(index, prepared, stats))
+                )
+                stored, signatures = prepared, None
+            else:
+                stored, signatures = self._store_deduplicated(index, prepared, stats)
+            self._write_shadows(index, stored, signatures)
+        checkpoint.last_page = last_page
+        checkpoint.chunks += len(chunks)
+        self._checkpoints.save(checkpoint)
+
+    def _write_shadows(
+        self, active: ActiveIndex, chunks: List[ChunkInput], signatures: Optional[List[int]]
+    ) -> None:
+        """Dual-write stored chunks to every index being built, embedded with its own model.
+
+        A failed write is only logged; Reindexer.sync re-copies the rows before activation.
+        """
+        if not chunks:
+            return
+        try:
+            rows = self._index_registry.shadows()
+        except Exception as exc:  # pragma: no cover - registry table is optional
+            print(f"[DEBUG Index] shadow index lookup failed: {exc}")
+            return
+        versions = {row["version"] for row in rows}
+        for version in [version for version in self._shadow_indexes if version not in versions]:
+            self._shadow_indexes.pop(version, None)
+        for row in rows:
+            if row["version"] == active.version:
+                continue
+            shadow = self._shadow_indexes.get(row["version"])
+            if shadow is None:
+                shadow = self._shadow_indexes[row["version"]] = self._build_index(
+                    version=row["version"],
+                    model=row["model"],
+                    chunk_table=row["chunk_table"],
+                    match_function=row["match_function"],
+                )
+            try:
+                shadow.vector_store.add_batch(
+                    ChunkBatch.from_inputs(chunks, self._embed_chunks(shadow, chunks)),
+                    simhashes=(
+                        [to_signed64(signature) for signature in signatures]
+                        if signatures is not None
+                        else None
+                    ),
+                )
+            except Exception as exc:
+                print(f"[DEBUG Index] dual-write to {row['version']} failed: {exc}")
+
+    def _store_deduplicated(
+        self, active: ActiveIndex, chunks: List[ChunkInput], stats: Optional[EmbeddingStats] = None
+    ) -> tuple[List[ChunkInput], List[int]]:
+        """Embed/store only chunks without a near-duplicate; link the rest to their canonical chunk.
+
+        Returns the stored chunks and their SimHash signatures.
+        """
+        index = self._get_dedupe_index(active)
+        flush_index = SimHashIndex(self._dedupe_max_distance or 0)
+        unique: List[ChunkInput] = []
+        signatures: List[int] = []
+        duplicates: List[dict] = []
+        for chunk in chunks:
+            signature = simhash(chunk.text)
+            canonical = index.find(signature, exclude_id=chunk.id) or flush_index.find(
+                signature, exclude_id=chunk.id
+            )
+            if canonical is not None:
+                duplicates.append(
+                    {
+                        "id": chunk.id,
+                        "canonical_id": canonical,
+                        "doc_id": chunk.metadata.source,
+                        "page": chunk.metadata.page,
+                        "chunk_index": int(chunk.metadata.extra.get("chunk_index", 0)),
+                    }
+                )
+                continue
+            flush_index.add(chunk.id, signature)
+            unique.append(chunk)
+            signatures.append(signature)
+
+        if unique:
+            active.vector_store.add_batch(
+                ChunkBatch.from_inputs(unique, self._embed_chunks(active, unique, stats)),
+                simhashes=[to_signed64(signature) for signature in signatures],
+            )
+            for chunk, signature in zip(unique, signatures):
+                index.add(chunk.id, signature)
+        if duplicates:
+            # Written after the canonical rows so a reader never sees a dangling link.
+            self._supabase.table("policy_chunk_duplicates").upsert(duplicates).execute()
+            print(f"[DEBUG Ingest] {len(duplicates)} near-duplicate chunks linked, not embedded")
+        return unique, signatures
+
+    def _attach_duplicate_sources(self, ranked: List[RankedChunk]) -> List[RankedChunk]:
+        """Add policies whose near-duplicate chunks were linked at ingest to ``also_in``.
+
+        Duplicates are never stored as chunks, so retrieval only ever returns the
+        canonical chunk; the other source policies live in policy_chunk_duplicates.
+        """
+        if not ranked:
+            return ranked
+        try:
+            response = (
+                self._supabase.table("policy_chunk_duplicates")
+                .select("canonical_id, doc_id")
+                .in_("canonical_id", [item.chunk.id for item in ranked])
+                .execute()
+            )
+        except Exception as exc:  # pragma: no cover - citations are best effort
+            print(f"[DEBUG Retrieval] duplicate source lookup skipped: {exc}")
+            return ranked
+
+        doc_ids: Dict[str, List[str]] = {}
+        for row in response.data or []:
+            doc_ids.setdefault(row["canonical_id"], []).append(row["doc_id"])
+        return [
+            with_also_in(item, doc_ids[item.chunk.id]) if item.chunk.id in doc_ids else item
+            for item in ranked
+        ]
+
+    def _get_dedupe_index(self, active: ActiveIndex) -> SimHashIndex:
+        if active.dedupe is None:
+            with self._dedupe_lock:
+                if active.dedupe is None:
+                    index = SimHashIndex(self._dedupe_max_distance or 0)
+                    for chunk_id, signature in active.vector_store.iter_simhashes():
+                        index.add(chunk_id, from_signed64(signature))
+                    active.dedupe = index
+        return active.dedupe
 
     def _prepare_chunks(
         self, chunks: Iterable[ChunkInput], *, policy_id: str, file_path: Path
@@ -124,35 +393,245 @@ class RagService:
             prepared.append(chunk)
         return prepared
 
-    def _embed_chunks(self, chunks: Iterable[ChunkInput]) -> List[List[float]]:
-        texts = [chunk.text for chunk in chunks]
-        if not texts:
-            return []
-        embeddings: List[List[float]] = []
-        batch_size = self._embedding_batch_size
-        for start in range(0, len(texts), batch_size):
-            batch = texts[start : start + batch_size]
-            embeddings.extend(self._embedding_client.embed(batch))
-        return embeddings
+    @property
+    def last_embedding_stats(self) -> EmbeddingStats:
+        """Embedding throughput summed over the flushes of the most recent ingest."""
+        return self._last_ingest_stats
+
+    def _embed_chunks(
+        self,
+        index: ActiveIndex,
+        chunks: Iterable[ChunkInput],
+        stats: Optional[EmbeddingStats] = None,
+    ) -> np.ndarray:
+        """Embed chunk texts into one float32 ``(n, dim)`` matrix (input order).
+
+        This call's throughput is added to ``stats`` (owned by the caller's ingest).
+        """
+        matrix, run = index.embedder.embed_with_stats([chunk.text for chunk in chunks])
+        if stats is not None:
+            stats.add(run)
+        return matrix
+
+    # ------------------------------------------------------------------
+    # Embedding index versions
+    # ------------------------------------------------------------------
+    def _build_index(
+        self, *, version: str, model: str, chunk_table: str, match_function: str
+    ) -> ActiveIndex:
+        embedding_client = OpenAIEmbeddingClient(api_key=self._openai_api_key, model=model)
+        return ActiveIndex(
+            version=version,
+            model=model,
+            chunk_table=chunk_table,
+            embedding_client=embedding_client,
+            vector_store=SupabaseVectorStore(
+                self._supabase, table=chunk_table, query_function=match_function
+            ),
+            embedder=EmbeddingScheduler(
+                embedding_client,
+                max_batch_size=self._embedding_batch_size,
+                max_batch_tokens=self._embedding_batch_tokens,
+                concurrency=self._embedding_concurrency,
+            ),
+        )
+
+    def _current_index(self, *, force: bool = False) -> ActiveIndex:
+        """The index serving queries, re-checked against embedding_indexes at most every
+        ``index_refresh_seconds`` so an activation reaches every worker process."""
+        now = monotonic()
+        if not force and now - self._index_checked_at < self._index_refresh_seconds:
+            return self._index
+        with self._index_lock:
+            if not force and now - self._index_checked_at < self._index_refresh_seconds:
+                return self._index
+            self._index_checked_at = now
+            try:
+                row = self._index_registry.active()
+            except Exception as exc:  # pragma: no cover - registry table is optional
+                print(f"[DEBUG Index] active index lookup failed: {exc}")
+                return self._index
+            if row and row["version"] != self._index.version:
+                self._index = self._build_index(
+                    version=row["version"],
+                    model=row["model"],
+                    chunk_table=row["chunk_table"],
+                    match_function=row["match_function"],
+                )
+                print(f"[DEBUG Index] switched to {row['version']} ({row['model']})")
+            return self._index
+
+    def reindex(self, *, model: str, version: Optional[str] = None, activate: bool = True) -> str:
+        """Start re-embedding the active chunk table with ``model`` in the background.
+
+        Returns the version label; progress is tracked in embedding_indexes.
+        """
+        source = self._current_index(force=True)
+        self._adopt_configured_index()
+        reindexer = Reindexer(
+            self._supabase,
+            openai_api_key=self._openai_api_key,
+            source_table=source.chunk_table,
+            model=model,
+            version=version or normalize_version(model),
+            batch_size=self._embedding_batch_size,
+            batch_tokens=self._embedding_batch_tokens,
+            concurrency=self._embedding_concurrency,
+            activate=activate,
+        )
+        if reindexer.version == source.version:
+            raise ValueError(f"이미 활성화된 인덱스 버전입니다: {reindexer.version}")
+        if not start_reindex(reindexer):
+            raise ValueError(f"이미 재색인이 진행 중입니다: {reindexer.version}")
+        return reindexer.version
+
+    def index_status(self, version: Optional[str] = None) -> dict | List[dict] | None:
+        if version is None:
+            return self._index_registry.list()
+        return self._index_registry.get(version)
+
+    def activate_index(self, version: str) -> ActiveIndex:
+        """Make ``version`` the serving index (also used to roll back to a retired one).
+
+        Chunks ingested into the current index since ``version`` was last synced
+        are copied over first, so the swap loses nothing.
+        """
+        self._adopt_configured_index()
+        row = self._index_registry.get(version)
+        if row is None and version == self._configured_index.version:
+            # Swapped away from before it was registered: still a valid rollback target.
+            self._adopt_configured_index(status="retired")
+            row = self._index_registry.get(version)
+        if row is None:
+            raise ValueError(f"인덱스 버전을 찾을 수 없습니다: {version}")
+        source = self._current_index(force=True)
+        if row["chunk_table"] == source.chunk_table:
+            self._index_registry.activate(version)
+        else:
+            Reindexer(
+                self._supabase,
+                openai_api_key=self._openai_api_key,
+                source_table=source.chunk_table,
+                model=row["model"],
+                version=version,
+                batch_size=self._embedding_batch_size,
+                batch_tokens=self._embedding_batch_tokens,
+                concurrency=self._embedding_concurrency,
+            ).activate()
+        self._shadow_indexes.pop(version, None)
+        return self._current_index(force=True)
+
+    def _adopt_configured_index(self, *, status: str = "active") -> None:
+        """Register the env-configured index in embedding_indexes so a swap can be rolled back.
+
+        As ``active`` only while no version is active (before the first swap).
+        """
+        index = self._configured_index
+        if status == "active" and self._index_registry.active() is not None:
+            return
+        if self._index_registry.get(index.version) is not None:
+            return
+        self._index_registry.adopt(
+            version=index.version,
+            model=index.model,
+            dimension=index.embedding_client.embed_matrix(["dimension probe"]).shape[1],
+            chunk_table=index.chunk_table,
+            match_function=index.vector_store.query_function,
+            status=status,
+        )
+        print(f"[DEBUG Index] registered configured index {index.version} as {status}")
+
+    @property
+    def chunk_table(self) -> str:
+        """Chunk table of the serving index (``policy_chunks`` until a reindex is activated)."""
+        return self._current_index().chunk_table
 
     # ------------------------------------------------------------------
     # Query helpers
     # ------------------------------------------------------------------
+    def load_conversation_history(
+        self, conversation: dict, *, pending_messages: Optional[List[dict]] = None
+    ) -> List[dict]:
+        """Return summarized, token-bounded history for a stored conversation.
+
+        pending_messages are rows queued for write-behind that may not be in
+        the messages table yet.
+        """
+        return self._memory.load_history(conversation, pending_messages=pending_messages)
+
     def answer(
         self,
         question: str,
         *,
-        top_k: int = 50,
+        top_k: Optional[int] = None,
         conversation_history: Optional[List[dict]] = None,
         enable_function_calling: bool = True,
     ) -> dict:
+        """Answer a question, coalescing identical in-flight requests.
+
+        Concurrent calls with the same normalized question, history and options
+        share one embed/retrieve/LLM run; each waiter gets its own copy of the result.
+        """
         if not question.strip():
             raise ValueError("Question must not be empty")
-        if self._vector_store.is_empty():
+
+        top_k = top_k or self._default_top_k
+        key = self._request_key(question, conversation_history, top_k, enable_function_calling)
+        try:
+            result, shared = self._inflight.do(
+                key,
+                lambda: self._answer(
+                    question,
+                    top_k=top_k,
+                    conversation_history=conversation_history,
+                    enable_function_calling=enable_function_calling,
+                ),
+            )
+        except OpenAIUnavailableError as exc:
+            print(f"[DEBUG OpenAI] unavailable, serving fallback answer: {exc}")
+            return self._fallback_answer(key)
+        if shared:
+            print(f"[DEBUG SingleFlight] coalesced request key={key[:12]}")
+        elif self._fallback_cache_size:
+            with self._fallback_lock:
+                self._fallback_cache[key] = copy.deepcopy(result)
+                self._fallback_cache.move_to_end(key)
+                while len(self._fallback_cache) > self._fallback_cache_size:
+                    self._fallback_cache.popitem(last=False)
+        return result
+
+    def _fallback_answer(self, key: str) -> dict:
+        with self._fallback_lock:
+            cached = self._fallback_cache.get(key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["cached"] = True
+            return result
+        return {
+            "answer": UNAVAILABLE_ANSWER,
+            "sources": [],
+            "latency_seconds": 0.0,
+            "sections": [],
+        }
+
+    def _answer(
+        self,
+        question: str,
+        *,
+        top_k: int,
+        conversation_history: Optional[List[dict]],
+        enable_function_calling: bool,
+    ) -> dict:
+        index = self._current_index()
+        if index.vector_store.is_empty():
             raise RuntimeError("Vector store is empty. 먼저 PDF를 임베딩하세요.")
 
-        query_embedding = self._embedding_client.embed([question])[0]
-        ranked = self._vector_store.top_k(query_embedding, k=top_k)
+        retrieval_query, query_embedding, ranked = self._retrieve(
+            index, question, conversation_history, top_k
+        )
+        if self._dedupe_max_distance is not None:
+            ranked = collapse_near_duplicates(ranked, max_distance=self._dedupe_max_distance)
+            ranked = self._attach_duplicate_sources(ranked)
         print(
             "[DEBUG Retrieval] "
             f"{len(ranked)} hits; "
@@ -163,13 +642,14 @@ class RagService:
         if self._reranker is not None and ranked:
             try:
                 ranked_for_answer = self._reranker.rerank(
-                    question,
+                    retrieval_query,
                     ranked,
                     top_n=self._rerank_top_n or top_k,
                 )
             except Exception:
                 ranked_for_answer = ranked
 
+        ranked_for_answer = self._diversify(index, query_embedding, ranked_for_answer)
         sections, context_text = self._build_context(ranked_for_answer)
         messages = self._build_prompt(question, context_text, conversation_history)
 
@@ -222,7 +702,9 @@ class RagService:
                 "id": item.chunk.id,
                 "source": item.chunk.metadata.source,
                 "page": item.chunk.metadata.page,
+                "score": item.score,
                 "text": item.chunk.text,
+                "also_in": item.chunk.metadata.extra.get("also_in", []),
             }
             for item in ranked_for_answer
         ]
@@ -702,6 +1184,86 @@ class RagService:
             "sections": sections,
         }
 
+    @staticmethod
+    def _request_key(
+        question: str,
+        conversation_history: Optional[List[dict]],
+        top_k: int,
+        enable_function_calling: bool,
+    ) -> str:
+        normalized = re.sub(r"\s+", " ", question).strip().lower()
+        history = [
+            (message.get("role"), message.get("content"))
+            for message in (conversation_history or [])
+        ]
+        fingerprint = json.dumps(
+            [normalized, history, top_k, enable_function_calling], ensure_ascii=False
+        )
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def _retrieve(
+        self,
+        index: ActiveIndex,
+        question: str,
+        conversation_history: Optional[List[dict]],
+        top_k: int,
+    ) -> tuple[str, np.ndarray, List[RankedChunk]]:
+        """Embed the (optionally rewritten) queries in one call and fuse their hits.
+
+        Returns the primary retrieval query (standalone rewrite or the raw
+        question), its embedding and the ranked candidates.
+        """
+        queries = [question]
+        if self._query_rewriter is not None:
+            queries = self._query_rewriter.rewrite(question, conversation_history) or [question]
+            print(f"[DEBUG Retrieval] queries={queries}")
+
+        embeddings = index.embedding_client.embed_matrix(queries)
+        if len(embeddings) == 1:
+            return queries[0], embeddings[0], index.vector_store.top_k(embeddings[0], k=top_k)
+
+        rankings = list(
+            self._retrieval_pool.map(
+                lambda embedding: index.vector_store.top_k(embedding, k=top_k), embeddings
+            )
+        )
+        return queries[0], embeddings[0], reciprocal_rank_fusion(rankings, limit=top_k)
+
+    def _diversify(
+        self, index: ActiveIndex, query_embedding: np.ndarray, ranked: List[RankedChunk]
+    ) -> List[RankedChunk]:
+        """Trim candidates to a smaller, less redundant context set (MMR or per-document cap)."""
+        if self._diversify_mode is None or len(ranked) <= 1:
+            return ranked
+        if self._diversify_mode == "cap":
+            return cap_per_document(
+                ranked, max_per_document=self._max_chunks_per_document, limit=self._context_k
+            )
+
+        try:
+            candidates = index.vector_store.embeddings_for([item.chunk.id for item in ranked])
+        except Exception as exc:  # pragma: no cover - fall back to a per-document cap
+            print(f"[DEBUG Diversify] embedding lookup failed, using per-document cap: {exc}")
+            return cap_per_document(
+                ranked, max_per_document=self._max_chunks_per_document, limit=self._context_k
+            )
+        if candidates.shape[1] != query_embedding.shape[0]:
+            return ranked[: self._context_k]
+        scores = [item.score for item in ranked]
+        relevance = (
+            np.asarray(scores, dtype=np.float32)
+            if all(score is not None for score in scores)
+            else None
+        )
+        picked = mmr_select(
+            query_embedding,
+            candidates,
+            k=self._context_k,
+            lambda_mult=self._mmr_lambda,
+            relevance=relevance,
+        )
+        return [ranked[index] for index in picked]
+
     def _build_context(
         self, ranked_chunks: Iterable[RankedChunk]
     ) -> tuple[List[str], str]:
@@ -711,6 +1273,8 @@ class RagService:
             header = metadata.source
             if metadata.page is not None:
                 header = f"{header} (page {metadata.page})"
+            if metadata.extra.get("also_in"):
+                header = f"{header}; also in: {', '.join(metadata.extra['also_in'])}"
             section = f"Source: {header}\\n{item.chunk.text}"
             sections.append(section)
         context_text = "\\n\\n".join(sections) if sections else "No context available."
@@ -724,7 +1288,8 @@ class RagService:
     ) -> List[dict]:
         """
         Build the prompt with system message, conversation history, and current question.
-        conversation_history should be a list of dicts with 'role' and 'content' keys.
+        conversation_history should be a list of dicts with 'role' and 'content' keys,
+        typically produced by load_conversation_history() so it is already bounded.
         """
         messages = [{"role": "system", "content": SYSTEM_PROMPT}]
 
@@ -766,6 +1331,29 @@ def get_rag_service(*, supabase: Client) -> RagService:
     chunk_size = int(os.getenv("CHAT_CHUNK_SIZE", "1200"))
     chunk_overlap = int(os.getenv("CHAT_CHUNK_OVERLAP", "200"))
     embedding_batch_size = int(os.getenv("CHAT_EMBED_BATCH_SIZE", "64"))
+    embedding_batch_tokens = int(os.getenv("CHAT_EMBED_BATCH_TOKENS", "8000"))
+    embedding_concurrency = int(os.getenv("CHAT_EMBED_CONCURRENCY", "4"))
+    ingest_flush_chunks = int(os.getenv("CHAT_INGEST_FLUSH_CHUNKS", "256"))
+    dedupe_value = os.getenv("CHAT_DEDUPE_MAX_DISTANCE", "off").lower()
+    dedupe_max_distance = (
+        None if dedupe_value in {"", "off", "none", "false", "-1"} else int(dedupe_value)
+    )
+    diversify_mode = os.getenv("CHAT_DIVERSIFY", "off").lower()
+    if diversify_mode in {"", "0", "false", "off", "none"}:
+        diversify_mode = None
+    context_k = int(os.getenv("CHAT_CONTEXT_K", "10"))
+    mmr_lambda = float(os.getenv("CHAT_MMR_LAMBDA", "0.7"))
+    max_chunks_per_document = int(os.getenv("CHAT_MAX_CHUNKS_PER_DOC", "3"))
+    history_keep_turns = int(os.getenv("CHAT_HISTORY_KEEP_TURNS", "3"))
+    history_token_budget = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+    history_fold_batch_turns = int(os.getenv("CHAT_HISTORY_FOLD_BATCH_TURNS", "4"))
+    default_top_k = int(os.getenv("CHAT_TOP_K", "50"))
+    query_rewrite_mode = os.getenv("CHAT_QUERY_REWRITE", "off").lower()
+    if query_rewrite_mode in {"", "0", "false", "off", "none"}:
+        query_rewrite_mode = None
+    query_paraphrases = int(os.getenv("CHAT_QUERY_PARAPHRASES", "2"))
+    fallback_cache_size = int(os.getenv("CHAT_FALLBACK_CACHE_SIZE", "256"))
+    index_refresh_seconds = float(os.getenv("CHAT_INDEX_REFRESH_SECONDS", "30"))
 
     rerank_enabled = os.getenv("CHAT_ENABLE_RERANKING", "false").lower() in {
         "1",
@@ -799,7 +1387,55 @@ def get_rag_service(*, supabase: Client) -> RagService:
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         embedding_batch_size=embedding_batch_size,
+        embedding_batch_tokens=embedding_batch_tokens,
+        embedding_concurrency=embedding_concurrency,
+        ingest_flush_chunks=ingest_flush_chunks,
+        dedupe_max_distance=dedupe_max_distance,
+        diversify_mode=diversify_mode,
+        context_k=context_k,
+        mmr_lambda=mmr_lambda,
+        max_chunks_per_document=max_chunks_per_document,
         reranker=reranker,
         rerank_top_n=rerank_top_n,
+        history_keep_turns=history_keep_turns,
+        history_token_budget=history_token_budget,
+        history_fold_batch_turns=history_fold_batch_turns,
+        default_top_k=default_top_k,
+        query_rewrite_mode=query_rewrite_mode,
+        query_paraphrases=query_paraphrases,
+        fallback_cache_size=fallback_cache_size,
+        index_refresh_seconds=index_refresh_seconds,
     )
     return _SERVICE_INSTANCE
+
+
+_ACTIVE_CHUNK_TABLE: tuple[float, str] | None = None
+_ACTIVE_CHUNK_TABLE_LOCK = threading.Lock()
+
+
+def get_active_chunk_table(*, supabase: Client) -> str:
+    """Chunk table of the active index, without building a RagService.
+
+    Reuses the running service when there is one; otherwise reads the
+    ``embedding_indexes`` registry (falling back to ``SUPABASE_POLICY_CHUNK_TABLE``)
+    and caches the answer for ``CHAT_INDEX_REFRESH_SECONDS``.
+    """
+    global _ACTIVE_CHUNK_TABLE
+    if _SERVICE_INSTANCE is not None:
+        return _SERVICE_INSTANCE.chunk_table
+
+    refresh_seconds = float(os.getenv("CHAT_INDEX_REFRESH_SECONDS", "30"))
+    with _ACTIVE_CHUNK_TABLE_LOCK:
+        cached = _ACTIVE_CHUNK_TABLE
+        if cached is not None and monotonic() - cached[0] < refresh_seconds:
+            return cached[1]
+        chunk_table = os.getenv("SUPABASE_POLICY_CHUNK_TABLE", "policy_chunks")
+        try:
+            row = EmbeddingIndexRegistry(supabase).active()
+        except Exception as exc:  # pragma: no cover - registry table is optional
+            print(f"[DEBUG Index] active index lookup failed: {exc}")
+            row = None
+        if row:
+            chunk_table = row["chunk_table"]
+        _ACTIVE_CHUNK_TABLE = (monotonic(), chunk_table)
+        return chunk_table
@@ -0,0 +1,82 @@
+"""Short, highlighted snippets of retrieved chunks for compact chat responses."""
+
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+# Common Korean particles/endings stripped from query words so "신청은" matches "신청".
+_PARTICLE_SUFFIX = re.compile(
+    r"(으로|에서|까지|부터|에게|이랑|하고|은|는|이|가|을|를|에|의|로|도|만|야|요|나)$"
+)
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def query_terms(question: str) -> List[str]:
+    terms: List[str] = []
+    for word in _WORD.findall(question.lower()):
+        stripped = _PARTICLE_SUFFIX.sub("", word) if len(word) > 2 else word
+        if len(stripped) >= 2 and stripped not in terms:
+            terms.append(stripped)
+    return terms
+
+
+def build_snippet(
+    text: str, question: str, *, width: int = 200
+) -> Tuple[str, List[Tuple[int, int]]]:
+    """Return the ``width``-char window of ``text`` with the most query-term hits.
+
+    The second element holds ``(start, end)`` offsets of each term match inside
+    the snippet so clients can render highlights without re-parsing.
+    """
+    if not text:
+        return "", []
+    terms = query_terms(question)
+    lowered = text.lower()
+
+    matches: List[Tuple[int, int]] = []
+    for term in terms:
+        start = lowered.find(term)
+        while start != -1:
+            matches.append((start, start + len(term)))
+            start = lowered.find(term, start + len(term))
+    matches.sort()
+
+    if len(text) <= width:
+        return text, _merge(matches)
+
+    best_start, best_hits = 0, 0
+    right = 0
+    for left, (start, _) in enumerate(matches):
+        while right < len(matches) and matches[right][1] <= start + width:
+            right += 1
+        hits = right - left
+        if hits > best_hits:
+            best_start, best_hits = start, hits
+
+    # Centre the window on the densest match cluster.
+    window_start = max(0, min(best_start - width // 4, len(text) - width))
+    window_end = window_start + width
+    snippet = text[window_start:window_end].strip()
+    offset = window_start + (len(text[window_start:window_end]) - len(text[window_start:window_end].lstrip()))
+
+    highlights = [
+        (start - offset, end - offset)
+        for start, end in _merge(matches)
+        if start >= offset and end <= offset + len(snippet)
+    ]
+    prefix = "…" if window_start > 0 else ""
+    suffix = "…" if window_end < len(text) else ""
+    if prefix:
+        highlights = [(start + 1, end + 1) for start, end in highlights]
+    return f"{prefix}{snippet}{suffix}", highlights
+
+
+def _merge(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
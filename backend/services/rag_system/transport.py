@@ -0,0 +1,335 @@
+"""Shared OpenAI transport: pooled HTTP client, RPM/TPM limiting, retries, circuit breaker."""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    OpenAI,
+    RateLimitError,
+)
+
+
+class OpenAIUnavailableError(RuntimeError):
+    """Raised when the circuit is open or retries are exhausted."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``capacity`` per minute."""
+
+    def __init__(self, capacity_per_minute: int) -> None:
+        self._capacity = float(max(1, capacity_per_minute))
+        self._rate = self._capacity / 60.0
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until ``amount`` tokens are available; return seconds waited."""
+        amount = min(float(amount), self._capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) tokens once the real cost is known."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._capacity, self._tokens - delta)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """Open after ``failure_threshold`` consecutive failures; half-open after ``cooldown``.
+
+    While half-open exactly one probe call is let through; its outcome either
+    closes the circuit or re-opens it for another cooldown. A probe that ends
+    without an outcome (e.g. interrupted) must be returned with ``release_probe``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0) -> None:
+        self._threshold = max(1, failure_threshold)
+        self._cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self._cooldown:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> Optional[str]:
+        """``"closed"`` or ``"probe"`` if the call may proceed, ``None`` if rejected."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self._cooldown or self._probing:
+                return None
+            self._probing = True
+            return "probe"
+
+    def release_probe(self) -> None:
+        """Give back an unfinished probe so the next call can probe again."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """Record a failed call; return True if this failure opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            if self._probing:
+                # Failed probe: back to open for another full cooldown.
+                self._probing = False
+                self._opened_at = time.monotonic()
+                return False
+            if self._failures >= self._threshold:
+                was_closed = self._opened_at is None
+                self._opened_at = time.monotonic()
+                return was_closed
+            return False
+
+
+_RETRYABLE = (RateLimitError, APIConnectionError, APITimeoutError)
+
+
+class OpenAITransport:
+    """One pooled OpenAI client shared by the embedding and chat wrappers.
+
+    ``call`` waits for request/token budget, retries 429/5xx/connection errors
+    with full-jitter exponential backoff (honouring ``Retry-After``) and trips
+    a circuit breaker so an outage fails fast instead of piling up requests.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        circuit_failures: int = 5,
+        circuit_cooldown: float = 30.0,
+    ) -> None:
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+        # Retries are handled here so they are counted and share the limiter.
+        self.client = OpenAI(api_key=api_key, http_client=self._http_client, max_retries=0)
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._max_retries = max(0, max_retries)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._breaker = CircuitBreaker(circuit_failures, circuit_cooldown)
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, float] = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "rejected_by_circuit": 0,
+            "circuit_opened": 0,
+            "queue_delay_total": 0.0,
+            "queue_delay_max": 0.0,
+        }
+
+    def call(
+        self,
+        fn: Callable[[OpenAI], Any],
+        *,
+        estimated_tokens: int = 0,
+        usage_tokens: Optional[Callable[[Any], Optional[int]]] = None,
+    ) -> Any:
+        """Run ``fn(client)`` under rate limiting, retries and the circuit breaker."""
+        permit = self._breaker.allow()
+        if permit is None:
+            self._bump("rejected_by_circuit")
+            raise OpenAIUnavailableError("OpenAI 호출이 일시적으로 차단되었습니다 (circuit open).")
+        try:
+            return self._call(fn, estimated_tokens, usage_tokens)
+        finally:
+            if permit == "probe":
+                # No-op once the probe recorded a result; otherwise (KeyboardInterrupt,
+                # CancelledError, ...) it would leave the breaker rejecting everything.
+                self._breaker.release_probe()
+
+    def _call(
+        self,
+        fn: Callable[[OpenAI], Any],
+        estimated_tokens: int,
+        usage_tokens: Optional[Callable[[Any], Optional[int]]],
+    ) -> Any:
+        waited = self._acquire(estimated_tokens)
+        self._record_queue_delay(waited)
+
+        attempt = 0
+        while True:
+            self._bump("requests")
+            try:
+                result = fn(self.client)
+            except Exception as exc:
+                retryable = self._is_retryable(exc)
+                if retryable and attempt < self._max_retries:
+                    attempt += 1
+                    self._bump("retries")
+                    time.sleep(self._backoff_delay(attempt, exc))
+                    # Each attempt sends the prompt again, so it costs tokens again.
+                    self._acquire(estimated_tokens)
+                    continue
+                self._bump("failures")
+                if self._is_quota_exhausted(exc):
+                    # Billing/quota errors won't clear with retries: fail fast
+                    # and let the breaker stop further calls.
+                    if self._breaker.record_failure():
+                        self._bump("circuit_opened")
+                    raise OpenAIUnavailableError(f"OpenAI 사용 한도를 초과했습니다: {exc}") from exc
+                if not retryable:
+                    # OpenAI answered (e.g. 400), so the service itself is up.
+                    self._breaker.record_success()
+                    raise
+                if self._breaker.record_failure():
+                    self._bump("circuit_opened")
+                raise OpenAIUnavailableError(f"OpenAI 호출 실패: {exc}") from exc
+
+            self._breaker.record_success()
+            if usage_tokens is not None and estimated_tokens:
+                actual = usage_tokens(result)
+                if actual:
+                    self._tokens.adjust(actual - estimated_tokens)
+            return result
+
+    def _acquire(self, estimated_tokens: int) -> float:
+        waited = self._requests.acquire(1)
+        if estimated_tokens:
+            waited += self._tokens.acquire(estimated_tokens)
+        return waited
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+        calls = max(1.0, snapshot["requests"] - snapshot["retries"])
+        snapshot["queue_delay_avg"] = snapshot["queue_delay_total"] / calls
+        snapshot["circuit_state"] = self._breaker.state
+        return snapshot
+
+    def close(self) -> None:
+        self._http_client.close()
+
+    @staticmethod
+    def _is_quota_exhausted(exc: Exception) -> bool:
+        if not isinstance(exc, APIStatusError) or exc.status_code != 429:
+            return False
+        code = getattr(exc, "code", None)
+        body = getattr(exc, "body", None)
+        if code is None and isinstance(body, dict):
+            error = body.get("error", body)
+            code = error.get("code") if isinstance(error, dict) else None
+        return code == "insufficient_quota"
+
+    @classmethod
+    def _is_retryable(cls, exc: Exception) -> bool:
+        if cls._is_quota_exhausted(exc):
+            return False
+        if isinstance(exc, _RETRYABLE):
+            return True
+        return isinstance(exc, APIStatusError) and exc.status_code >= 500
+
+    def _backoff_delay(self, attempt: int, exc: Exception) -> float:
+        response = getattr(exc, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self._backoff_max)
+            except ValueError:
+                pass
+        ceiling = min(self._backoff_max, self._backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _bump(self, name: str, amount: float = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += amount
+
+    def _record_queue_delay(self, waited: float) -> None:
+        with self._metrics_lock:
+            self._metrics["queue_delay_total"] += waited
+            self._metrics["queue_delay_max"] = max(self._metrics["queue_delay_max"], waited)
+
+
+_TRANSPORTS: Dict[str, OpenAITransport] = {}
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def get_openai_transport(api_key: str) -> OpenAITransport:
+    """Create/reuse the process-wide transport for ``api_key`` using environment configuration."""
+    with _TRANSPORT_LOCK:
+        transport = _TRANSPORTS.get(api_key)
+        if transport is None:
+            transport = OpenAITransport(
+                api_key,
+                max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")),
+                max_keepalive=int(os.getenv("OPENAI_MAX_KEEPALIVE", "10")),
+                timeout=float(os.getenv("OPENAI_TIMEOUT", "60")),
+                requests_per_minute=int(os.getenv("OPENAI_RPM_LIMIT", "500")),
+                tokens_per_minute=int(os.getenv("OPENAI_TPM_LIMIT", "200000")),
+                max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "4")),
+                circuit_failures=int(os.getenv("OPENAI_CIRCUIT_FAILURES", "5")),
+                circuit_cooldown=float(os.getenv("OPENAI_CIRCUIT_COOLDOWN", "30")),
+            )
+            _TRANSPORTS[api_key] = transport
+        return transport
+
+
+def openai_transport_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every live transport, keyed by a masked API key."""
+    with _TRANSPORT_LOCK:
+        transports = list(_TRANSPORTS.items())
+    return {f"...{key[-4:]}": transport.metrics() for key, transport in transports}
+
+
+def shutdown_openai_transports() -> None:
+    with _TRANSPORT_LOCK:
+        transports = list(_TRANSPORTS.values())
+        _TRANSPORTS.clear()
+    for transport in transports:
+        transport.close()
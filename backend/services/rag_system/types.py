@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class DocumentMetadata:
     source: str
     page: int | None = None
@@ -19,26 +21,26 @@ class DocumentMetadata:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkInput:
     id: str
     text: str
     metadata: DocumentMetadata
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentChunk:
     id: str
     text: str
     metadata: DocumentMetadata
-    embedding: List[float]
+    embedding: Sequence[float]
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "text": self.text,
             "metadata": self.metadata.to_dict(),
-            "embedding": self.embedding,
+            "embedding": np.asarray(self.embedding, dtype=np.float32).tolist(),
         }
 
     @classmethod
@@ -52,14 +54,109 @@ class DocumentChunk:
                 page=metadata.get("page"),
                 extra=metadata.get("extra", {}),
             ),
-            embedding=list(payload["embedding"]),
+            embedding=np.asarray(payload.get("embedding") or [], dtype=np.float32),
+        )
+
+
+@dataclass(slots=True)
+class ChunkBatch:
+    """Columnar chunks: parallel id/text/metadata lists plus one float32 matrix.
+
+    ``embeddings`` has shape ``(len(ids), dim)``; dim is 0 when vectors were not
+    fetched (e.g. retrieval results). ``scores`` is an optional float32 vector.
+    Per-chunk objects are only built on demand via ``chunk(i)``/iteration.
+    """
+
+    ids: List[str]
+    texts: List[str]
+    sources: List[str]
+    pages: List[int | None]
+    extras: List[Dict[str, Any]]
+    embeddings: np.ndarray
+    scores: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[DocumentChunk]:
+        return (self.chunk(index) for index in range(len(self.ids)))
+
+    @property
+    def dim(self) -> int:
+        return int(self.embeddings.shape[1]) if self.embeddings.ndim == 2 else 0
+
+    @classmethod
+    def empty(cls) -> "ChunkBatch":
+        return cls([], [], [], [], [], np.zeros((0, 0), dtype=np.float32))
+
+    @classmethod
+    def from_inputs(cls, chunks: Sequence[ChunkInput], embeddings: np.ndarray) -> "ChunkBatch":
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.shape[0] != len(chunks):
+            raise ValueError(f"{len(chunks)} chunks but {matrix.shape[0]} embeddings")
+        return cls(
+            ids=[chunk.id for chunk in chunks],
+            texts=[chunk.text for chunk in chunks],
+            sources=[chunk.metadata.source for chunk in chunks],
+            pages=[chunk.metadata.page for chunk in chunks],
+            extras=[chunk.metadata.extra for chunk in chunks],
+            embeddings=matrix,
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "ChunkBatch":
+        """Build from match-function rows (id, content, metadata, similarity)."""
+        metadata = [row.get("metadata") or {} for row in rows]
+        scores = [row.get("similarity", row.get("score")) for row in rows]
+        return cls(
+            ids=[row.get("id", "") for row in rows],
+            texts=[row.get("content", "") for row in rows],
+            sources=[item.get("source", "unknown") for item in metadata],
+            pages=[item.get("page") for item in metadata],
+            extras=[item.get("extra", {}) for item in metadata],
+            embeddings=np.zeros((len(rows), 0), dtype=np.float32),
+            scores=(
+                np.asarray(scores, dtype=np.float32)
+                if rows and all(score is not None for score in scores)
+                else None
+            ),
+        )
+
+    def metadata(self, index: int) -> DocumentMetadata:
+        return DocumentMetadata(
+            source=self.sources[index], page=self.pages[index], extra=self.extras[index]
+        )
+
+    def chunk(self, index: int) -> DocumentChunk:
+        return DocumentChunk(
+            id=self.ids[index],
+            text=self.texts[index],
+            metadata=self.metadata(index),
+            embedding=self.embeddings[index],
+        )
+
+    def score(self, index: int) -> Optional[float]:
+        return float(self.scores[index]) if self.scores is not None else None
+
+    def take(self, indices: Sequence[int] | np.ndarray) -> "ChunkBatch":
+        order = np.asarray(indices, dtype=np.intp)
+        return ChunkBatch(
+            ids=[self.ids[i] for i in order],
+            texts=[self.texts[i] for i in order],
+            sources=[self.sources[i] for i in order],
+            pages=[self.pages[i] for i in order],
+            extras=[self.extras[i] for i in order],
+            embeddings=self.embeddings[order],
+            scores=self.scores[order] if self.scores is not None else None,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class IngestedDocument:
     path: Path
-    chunks: Sequence[DocumentChunk]
+    chunks: Sequence[DocumentChunk] | ChunkBatch
+    # Streaming ingests do not keep chunks in memory; they only report the count.
+    total_chunks: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 from supabase import Client
 
 try:  # pragma: no cover - optional dependency detail
@@ -10,20 +13,44 @@ try:  # pragma: no cover - optional dependency detail
 except ImportError:  # pragma: no cover
     APIError = None  # type: ignore[misc, assignment]
 
-from .types import DocumentChunk, DocumentMetadata
+try:  # pragma: no cover - only available when imported as part of the backend package
+    from ...pg_fastpath import get_fastpath
+except ImportError:  # pragma: no cover
+    get_fastpath = None  # type: ignore[assignment]
+
+from .types import ChunkBatch, DocumentChunk
 
 
-@dataclass
+@dataclass(slots=True)
 class RankedChunk:
     chunk: DocumentChunk
     score: Optional[float] = None
 
 
 class SupabaseVectorStore:
-    def __init__(self, client: Client, *, table: str, query_function: str) -> None:
+    def __init__(
+        self,
+        client: Client,
+        *,
+        table: str,
+        query_function: str,
+        embedding_cache_size: int = 5000,
+    ) -> None:
         self._client = client
         self._table = table
         self._query_function = query_function
+        # Retrieval no longer returns vectors; diversification reads them from this LRU.
+        self._embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._embedding_cache_size = max(0, embedding_cache_size)
+        self._embedding_cache_lock = threading.Lock()
+
+    @property
+    def table(self) -> str:
+        return self._table
+
+    @property
+    def query_function(self) -> str:
+        return self._query_function
 
     def is_empty(self) -> bool:
         response = (
@@ -36,27 +63,77 @@ class SupabaseVectorStore:
             return False  # fall back to assuming data exists
         return count == 0
 
-    def add_chunks(self, chunks: Iterable[DocumentChunk]) -> None:
+    def add_chunks(self, chunks: Iterable[DocumentChunk] | ChunkBatch) -> None:
+        if isinstance(chunks, ChunkBatch):
+            self.add_batch(chunks)
+            return
+        chunks = list(chunks)
+        if not chunks:
+            return
+        self._upsert(
+            [
+                {
+                    "id": chunk.id,
+                    "doc_id": chunk.metadata.source,
+                    "chunk_index": int(chunk.metadata.extra.get("chunk_index", 0)),
+                    "content": chunk.text,
+                    "metadata": chunk.metadata.to_dict(),
+                    "embedding": _vector_literal(chunk.embedding),
+                }
+                for chunk in chunks
+            ]
+        )
+
+    def add_batch(self, batch: ChunkBatch, *, simhashes: Optional[Sequence[int]] = None) -> None:
+        """Upsert a columnar batch; vectors are serialized straight from the matrix.
+
+        ``simhashes`` (signed 64-bit) are stored for near-duplicate detection.
+        """
+        if not len(batch):
+            return
         payload = [
             {
-                "id": chunk.id,
-                "doc_id": chunk.metadata.source,
-                "chunk_index": int(chunk.metadata.extra.get("chunk_index", 0)),
-                "content": chunk.text,
-                "metadata": chunk.metadata.to_dict(),
-                "embedding": chunk.embedding,
+                "id": batch.ids[index],
+                "doc_id": batch.sources[index],
+                "chunk_index": int(batch.extras[index].get("chunk_index", 0)),
+                "content": batch.texts[index],
+                "metadata": batch.metadata(index).to_dict(),
+                "embedding": _vector_literal(batch.embeddings[index]),
             }
-            for chunk in chunks
+            for index in range(len(batch))
         ]
-        if not payload:
-            return
+        if simhashes is not None:
+            for row, signature in zip(payload, simhashes, strict=True):
+                row["simhash"] = signature
+        self._upsert(payload)
+
+    def iter_simhashes(self, *, page_size: int = 1000) -> Iterator[Tuple[str, int]]:
+        """Yield ``(chunk_id, signed simhash)`` for every chunk that has a signature."""
+        start = 0
+        while True:
+            response = (
+                self._client.table(self._table)
+                .select("id, simhash")
+                .not_.is_("simhash", "null")
+                .order("id")
+                .range(start, start + page_size - 1)
+                .execute()
+            )
+            rows = response.data or []
+            for row in rows:
+                yield row["id"], int(row["simhash"])
+            if len(rows) < page_size:
+                return
+            start += page_size
+
+    def _upsert(self, payload: List[dict]) -> None:
         try:
             self._client.table(self._table).upsert(payload).execute()
         except Exception as exc:  # pragma: no cover - runtime feedback
             if APIError is not None and isinstance(exc, APIError):
                 message = getattr(exc, "message", "")
                 if "dimensions" in message.lower():
-                    actual = len(payload[0]["embedding"])
+                    actual = payload[0]["embedding"].count(",") + 1
                     raise RuntimeError(
                         "Supabase vector column dimension mismatch. "
                         f"Current embeddings have {actual} dimensions. "
@@ -64,32 +141,88 @@ class SupabaseVectorStore:
                     ) from exc
             raise
 
-    def top_k(self, query_embedding: List[float], k: int = 5) -> List[RankedChunk]:
-        response = self._client.rpc(
-            self._query_function,
-            {
-                "query_embedding": query_embedding,
-                "match_count": k,
-            },
-        ).execute()
-
-        data = getattr(response, "data", None) or []
-        ranked: List[RankedChunk] = []
-        for item in data:
-            metadata_payload = item.get("metadata") or {}
-            metadata = DocumentMetadata(
-                source=metadata_payload.get("source", "unknown"),
-                page=metadata_payload.get("page"),
-                extra=metadata_payload.get("extra", {}),
-            )
-            chunk = DocumentChunk(
-                id=item.get("id", ""),
-                text=item.get("content", ""),
-                metadata=metadata,
-                embedding=item.get("embedding") or [],
+    def top_k(self, query_embedding: Sequence[float], k: int = 5) -> List[RankedChunk]:
+        batch = self.top_k_batch(query_embedding, k)
+        return [
+            RankedChunk(chunk=batch.chunk(index), score=batch.score(index))
+            for index in range(len(batch))
+        ]
+
+    def top_k_batch(self, query_embedding: Sequence[float], k: int = 5) -> ChunkBatch:
+        """Nearest chunks as a columnar batch (no embeddings; scores = similarity)."""
+        data = self._match_fast(query_embedding, k)
+        if data is None:
+            response = self._client.rpc(
+                self._query_function,
+                {
+                    "query_embedding": _vector_literal(query_embedding),
+                    "match_count": k,
+                },
+            ).execute()
+            data = getattr(response, "data", None) or []
+        return ChunkBatch.from_rows(data)
+
+    def embeddings_for(self, chunk_ids: Sequence[str]) -> np.ndarray:
+        """Float32 ``(len(chunk_ids), dim)`` matrix, served from cache; misses in one query.
+
+        Unknown ids get zero rows.
+        """
+        found: dict[str, np.ndarray] = {}
+        with self._embedding_cache_lock:
+            for chunk_id in chunk_ids:
+                vector = self._embedding_cache.get(chunk_id)
+                if vector is not None:
+                    self._embedding_cache.move_to_end(chunk_id)
+                    found[chunk_id] = vector
+        missing = [chunk_id for chunk_id in dict.fromkeys(chunk_ids) if chunk_id not in found]
+        if missing:
+            response = (
+                self._client.table(self._table)
+                .select("id, embedding")
+                .in_("id", missing)
+                .execute()
             )
-            score_value = item.get("similarity")
-            if score_value is None:
-                score_value = item.get("score")
-            ranked.append(RankedChunk(chunk=chunk, score=score_value))
-        return ranked
+            with self._embedding_cache_lock:
+                for row in response.data or []:
+                    vector = _parse_vector(row.get("embedding"))
+                    if vector is None:
+                        continue
+                    found[row["id"]] = vector
+                    if self._embedding_cache_size:
+                        self._embedding_cache[row["id"]] = vector
+                        self._embedding_cache.move_to_end(row["id"])
+                while len(self._embedding_cache) > self._embedding_cache_size:
+                    self._embedding_cache.popitem(last=False)
+
+        dim = max((vector.shape[0] for vector in found.values()), default=0)
+        matrix = np.zeros((len(chunk_ids), dim), dtype=np.float32)
+        for row_index, chunk_id in enumerate(chunk_ids):
+            vector = found.get(chunk_id)
+            if vector is not None and vector.shape[0] == dim:
+                matrix[row_index] = vector
+        return matrix
+
+    def _match_fast(self, query_embedding: Sequence[float], k: int) -> Optional[List[dict]]:
+        """Call the match function over asyncpg when the policy_chunks fast path is on."""
+        fastpath = get_fastpath("policy_chunks") if get_fastpath is not None else None
+        if fastpath is None:
+            return None
+        try:
+            return fastpath.match_policy_chunks(self._query_function, query_embedding, k)
+        except Exception as exc:  # pragma: no cover - fall back to PostgREST
+            print(f"[FastPath] {self._query_function} failed, falling back to PostgREST: {exc}")
+            return None
+
+
+def _vector_literal(embedding: Sequence[float]) -> str:
+    """pgvector text literal with float32 precision (much smaller than a JSON float list)."""
+    return "[" + ",".join(format(float(value), ".7g") for value in embedding) + "]"
+
+
+def _parse_vector(value: object) -> Optional[np.ndarray]:
+    """pgvector comes back from PostgREST as the text literal ``"[0.1,0.2,...]"``."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip("[]").split(",")
+    return np.asarray(value, dtype=np.float32)
@@ -9,6 +9,8 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from supabase import Client
 
 from .. import crud
+from .download_tracker import track_download
+from .smart_wait import wait_for_quiet, wait_for_selector, wait_for_navigation, get_wait_stats
 
 # --- Settings ---
 BASE_URL = "https://www.bokjiro.go.kr/ssis-tbu/twataa/wlfareInfo/moveTWAT52005M.do?page=1&orderBy=date&tabId=1&sidoCd=1100000000&period=%EC%9E%84%EC%8B%A0%20%C2%B7%20%EC%B6%9C%EC%82%B0,%EC%98%81%EC%9C%A0%EC%95%84,%EC%95%84%EB%8F%99"
@@ -44,37 +46,6 @@ def clean_policy_title(raw_title):
 
     return " ".join(title.split()).strip() if title.strip() else None
 
-def wait_for_download_completion(download_dir, expected_filename=None, timeout=30):
-    """Wait for file download to complete and verify it's a valid PDF"""
-    start_time = time.time()
-    initial_files = set(os.listdir(download_dir))
-
-    while time.time() - start_time < timeout:
-        current_files = set(os.listdir(download_dir))
-        new_files = current_files - initial_files
-
-        # Check for completed downloads (no .crdownload or .tmp files)
-        completed_downloads = [f for f in new_files if not f.endswith(('.crdownload', '.tmp', '.part'))]
-
-        if completed_downloads:
-            latest_file = max(completed_downloads, key=lambda f: os.path.getctime(os.path.join(download_dir, f)))
-            file_path = os.path.join(download_dir, latest_file)
-
-            # Verify file size and basic PDF structure
-            if os.path.getsize(file_path) > 100:  # Minimum size check
-                try:
-                    with open(file_path, 'rb') as f:
-                        header = f.read(4)
-                        if header == b'%PDF':
-                            return {"status": "success", "filename": latest_file, "filepath": file_path}
-                except Exception as e:
-                    print(f"PDF 검증 실패: {e}")
-
-        time.sleep(1)
-
-    return {"status": "download_timeout", "message": "다운로드 시간 초과"}
-
-
 def find_pdf_elements(driver):
     """Find PDF-related elements using multiple selector strategies"""
     pdf_selectors = [
@@ -142,7 +113,7 @@ def process_detail_page(driver, wait):
                 element.click()
                 additional_info_clicked = True
                 print("  ✓ 추가정보 tab clicked")
-                time.sleep(2)
+                wait_for_quiet(driver, timeout=10)
                 break
             except (TimeoutException, NoSuchElementException):
                 continue
@@ -176,10 +147,12 @@ def process_detail_page(driver, wait):
 
         # Step 4: Download PDF
         print("  → Starting download...")
-        download_element.click()
-
-        # Wait for download completion
-        download_result = wait_for_download_completion(DOWNLOAD_DIR, pdf_filename)
+        # Track this download in its own temp folder (no polling of DOWNLOAD_DIR)
+        with track_download(driver, DOWNLOAD_DIR) as job:
+            download_element.click()
+            download_result = job.wait(timeout=30)
+        if download_result["status"] == "timeout":
+            download_result["status"] = "download_timeout"
 
         if download_result["status"] == "success":
             print(f"  ✓ Download complete: {download_result['filename']}")
@@ -220,17 +193,19 @@ def run_scraping(supabase: Client, max_policies: int = 5, skip_rag: bool = True)
     except Exception as e:
         print(f"⚠️  Could not fetch existing policies: {e}")
 
+    # Try multiple selectors to find policy links
+    policy_selectors = [
+        "a[title*='자세히 보기']",
+        "a[aria-label*='자세히 보기']",
+        "a[href*='TWAT52005M']"
+    ]
+    any_policy_selector = ", ".join(policy_selectors)
+
     try:
         print(f"🌐 Navigating to Bokjiro...")
         driver.get(BASE_URL)
-        time.sleep(5)
-
-        # Try multiple selectors to find policy links
-        policy_selectors = [
-            "a[title*='자세히 보기']",
-            "a[aria-label*='자세히 보기']",
-            "a[href*='TWAT52005M']"
-        ]
+        wait_for_selector(driver, any_policy_selector, timeout=20)
+        wait_for_quiet(driver, timeout=5)
 
         policy_links = None
         for selector in policy_selectors:
@@ -277,7 +252,8 @@ def run_scraping(supabase: Client, max_policies: int = 5, skip_rag: bool = True)
 
                 # Click to detail page
                 driver.execute_script("arguments[0].click();", link)
-                time.sleep(3)
+                wait_for_navigation(driver, link, timeout=5)
+                wait_for_quiet(driver, timeout=10)
 
                 # Process detail page to download PDF
                 result = process_detail_page(driver, wait)
@@ -319,13 +295,13 @@ def run_scraping(supabase: Client, max_policies: int = 5, skip_rag: bool = True)
 
                 # Go back to list page
                 driver.back()
-                time.sleep(2)
+                wait_for_selector(driver, any_policy_selector, timeout=10)
 
             except Exception as e:
                 print(f"❌ Error processing policy {i+1}: {e}")
                 try:
                     driver.get(BASE_URL)
-                    time.sleep(3)
+                    wait_for_selector(driver, any_policy_selector, timeout=10)
                 except:
                     pass
                 continue
@@ -337,4 +313,9 @@ def run_scraping(supabase: Client, max_policies: int = 5, skip_rag: bool = True)
         driver.quit()
         print(f"\n✅ Scraping completed: {processed_count} policies processed successfully")
 
-    return {"status": "completed", "scraped_policies": scraped_policies, "total_processed": processed_count}
+    return {
+        "status": "completed",
+        "scraped_policies": scraped_policies,
+        "total_processed": processed_count,
+        "wait_stats": get_wait_stats()
+    }
@@ -0,0 +1,283 @@
+"""
+페이지 대기 도구 (auto_scraper / bokjiro_scraper / scraper_service 공용)
+
+고정 time.sleep()과 DOM 요소 개수 폴링 대신, 기다리는 조건이 충족되는 즉시 반환합니다.
+
+- wait_for_selector: 특정 요소가 나타날 때까지
+- wait_for_quiet: 페이지에 주입한 MutationObserver(DOM 변경)와 PerformanceObserver(리소스 요청)가
+  quiet_ms 동안 조용할 때까지 (execute_async_script, 브라우저 안에서 대기하므로 폴링 없음)
+- wait_for_navigation: 클릭 후 이전 페이지 요소가 stale 상태가 될 때까지
+- wait_for_new_window: 새 창/탭이 열릴 때까지
+
+모든 대기 시간은 사이트(도메인)별로 누적되어 get_wait_stats()로 확인할 수 있습니다.
+
+사용법:
+    element.click()
+    wait_for_navigation(driver, element)
+    wait_for_quiet(driver, timeout=5)
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException, InvalidSessionIdException, NoSuchWindowException
+)
+
+DEFAULT_QUIET_MS = 500
+
+# 세션/창이 사라진 오류: 다시 기다려도 소용없으므로 즉시 전달
+_SESSION_GONE_ERRORS = (InvalidSessionIdException, NoSuchWindowException)
+
+# 사이트별 대기 시간 {도메인: {'total': 초, 'count': 횟수, 'kinds': {종류: 초}}}
+_wait_stats = {}
+
+# DOM 변경과 리소스 요청 완료가 quietMs 동안 없으면 true, timeoutMs가 지나면 false로 콜백
+_QUIET_PERIOD_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var finished = false, quietTimer = null, observers = [];
+
+function finish(ok) {
+    if (finished) return;
+    finished = true;
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    observers.forEach(function (o) { try { o.disconnect(); } catch (e) {} });
+    done(ok);
+}
+function activity() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function () { finish(true); }, quietMs);
+}
+function begin() {
+    var mutations = new MutationObserver(activity);
+    mutations.observe(document.documentElement || document,
+        {childList: true, subtree: true, attributes: true, characterData: true});
+    observers.push(mutations);
+    if (window.PerformanceObserver) {
+        try {
+            var network = new PerformanceObserver(activity);
+            network.observe({entryTypes: ['resource']});
+            observers.push(network);
+        } catch (e) {}
+    }
+    activity();
+}
+
+var hardTimer = setTimeout(function () { finish(false); }, timeoutMs);
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', begin);
+} else {
+    begin();
+}
+"""
+
+
+# ============================================
+# 대기 시간 통계
+# ============================================
+
+def _site_of(driver):
+    """통계용 사이트 키 (현재 URL의 도메인)"""
+    try:
+        return urlparse(driver.current_url).netloc or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+def record_wait(driver, kind, seconds):
+    """
+    대기 시간 기록
+
+    Args:
+        driver: WebDriver 객체 (현재 URL로 사이트 판단)
+        kind: 대기 종류 ('quiet', 'selector', 'navigation', 'window')
+        seconds: 대기한 시간 (초)
+    """
+    site = _wait_stats.setdefault(_site_of(driver), {'total': 0.0, 'count': 0, 'kinds': {}})
+    site['total'] += seconds
+    site['count'] += 1
+    site['kinds'][kind] = site['kinds'].get(kind, 0.0) + seconds
+
+
+def get_wait_stats():
+    """
+    사이트별 대기 시간 통계
+
+    Returns:
+        dict: {도메인: {'total': 초, 'count': 횟수, 'kinds': {종류: 초}}}
+    """
+    return _wait_stats
+
+
+def format_wait_stats(limit=5):
+    """
+    대기 시간이 긴 사이트 순으로 요약
+
+    Returns:
+        list: 출력용 문자열 목록
+    """
+    ranked = sorted(_wait_stats.items(), key=lambda item: item[1]['total'], reverse=True)
+    lines = []
+    for domain, stats in ranked[:limit]:
+        kinds = ', '.join(f"{kind} {sec:.1f}s" for kind, sec in sorted(stats['kinds'].items()))
+        lines.append(f"{domain}: {stats['total']:.1f}s / {stats['count']}회 ({kinds})")
+    return lines
+
+
+def save_wait_stats(path):
+    """
+    이번 실행의 사이트별 대기 시간을 JSON Lines 파일에 한 줄로 추가
+
+    Args:
+        path: 기록 파일 경로
+
+    Returns:
+        bool: 기록 여부
+    """
+    if not _wait_stats:
+        return False
+
+    record = {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'pid': os.getpid(),
+        'sites': {
+            domain: {
+                'total': round(stats['total'], 2),
+                'count': stats['count'],
+                'kinds': {kind: round(sec, 2) for kind, sec in stats['kinds'].items()}
+            }
+            for domain, stats in _wait_stats.items()
+        }
+    }
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return True
+
+
+# ============================================
+# 대기 함수
+# ============================================
+
+def wait_for_selector(driver, selector, timeout=10, by=By.CSS_SELECTOR, visible=False):
+    """
+    특정 요소가 나타날 때까지 대기
+
+    Args:
+        driver: WebDriver 객체
+        selector: 선택자
+        timeout: 최대 대기 시간 (초)
+        by: 선택자 종류 (기본 CSS)
+        visible: True면 화면에 표시될 때까지 대기
+
+    Returns:
+        WebElement or None: 찾은 요소 (타임아웃 시 None)
+    """
+    condition = EC.visibility_of_element_located if visible else EC.presence_of_element_located
+    start_time = time.time()
+    try:
+        return WebDriverWait(driver, timeout).until(condition((by, selector)))
+    except TimeoutException:
+        return None
+    finally:
+        record_wait(driver, 'selector', time.time() - start_time)
+
+
+def wait_for_quiet(driver, timeout=5, quiet_ms=DEFAULT_QUIET_MS):
+    """
+    DOM 변경과 리소스 요청이 quiet_ms 동안 없을 때까지 대기
+
+    대기 중 페이지가 이동해 스크립트가 끊기면 새 문서에서 남은 시간만큼 다시 대기합니다.
+    드라이버의 스크립트 타임아웃은 대기 후 원래 값으로 되돌립니다.
+
+    Args:
+        driver: WebDriver 객체
+        timeout: 최대 대기 시간 (초)
+        quiet_ms: 안정화 판단 시간 (밀리초)
+
+    Returns:
+        bool: 안정화 여부 (타임아웃 시 False)
+
+    Raises:
+        InvalidSessionIdException, NoSuchWindowException: 브라우저 세션/창이 닫힌 경우
+    """
+    start_time = time.time()
+    deadline = start_time + timeout
+    try:
+        previous_timeout = driver.timeouts.script
+    except Exception:
+        previous_timeout = None
+    driver.set_script_timeout(timeout + 1)
+
+    try:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            try:
+                return bool(driver.execute_async_script(_QUIET_PERIOD_SCRIPT, quiet_ms, int(remaining * 1000)))
+            except _SESSION_GONE_ERRORS:
+                raise
+            except Exception:
+                # 페이지 이동으로 문서가 바뀜 → 새 문서에서 다시 대기
+                time.sleep(0.1)
+    finally:
+        if previous_timeout is not None:
+            try:
+                driver.set_script_timeout(previous_timeout)
+            except Exception:
+                pass
+        record_wait(driver, 'quiet', time.time() - start_time)
+
+
+def wait_for_navigation(driver, old_element, timeout=2):
+    """
+    클릭 후 이전 페이지가 사라질 때까지 대기
+
+    Args:
+        driver: WebDriver 객체
+        old_element: 클릭 전 페이지의 요소 (페이지가 바뀌면 stale 상태가 됨)
+        timeout: 최대 대기 시간 (초)
+
+    Returns:
+        bool: 페이지 이동 여부 (False면 같은 페이지에서 갱신된 것으로 판단)
+    """
+    start_time = time.time()
+    try:
+        WebDriverWait(driver, timeout).until(EC.staleness_of(old_element))
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        record_wait(driver, 'navigation', time.time() - start_time)
+
+
+def wait_for_new_window(driver, initial_count, timeout=1):
+    """
+    새 창/탭이 열릴 때까지 대기
+
+    Args:
+        driver: WebDriver 객체
+        initial_count: 클릭 전 창 개수
+        timeout: 최대 대기 시간 (초)
+
+    Returns:
+        bool: 새 창이 열렸으면 True
+    """
+    start_time = time.time()
+    try:
+        WebDriverWait(driver, timeout).until(lambda d: len(d.window_handles) > initial_count)
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        record_wait(driver, 'window', time.time() - start_time)
@@ -0,0 +1,27 @@
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+# The scraper is run as a script from its own folder and imports its modules flat
+# (``from config import *``), so the tests import it the same way.
+SCRAPER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "services",
+    "auto_scraper",
+)
+if SCRAPER_DIR not in sys.path:
+    sys.path.insert(0, SCRAPER_DIR)
+
+import config as scraper_config  # noqa: E402
+
+# Importing database creates the history DB under DATA_DIR, so point every
+# data path at a throwaway folder before any scraper module reads config.
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="auto_scraper_tests_")
+atexit.register(shutil.rmtree, TEST_DATA_DIR, True)
+
+_original_data_dir = scraper_config.DATA_DIR
+for _name, _value in list(vars(scraper_config).items()):
+    if isinstance(_value, str) and _value.startswith(_original_data_dir):
+        setattr(scraper_config, _name, TEST_DATA_DIR + _value[len(_original_data_dir):])
@@ -0,0 +1,72 @@
+import sqlite3
+import time
+
+import pytest
+
+from database import ScraperRepository
+
+
+@pytest.fixture
+def repo_factory(tmp_path):
+    repos = []
+
+    def make(**kwargs):
+        kwargs.setdefault("commit_interval", 60)
+        repo = ScraperRepository(str(tmp_path / "history.db"), **kwargs)
+        repo.create_tables()
+        repos.append(repo)
+        return repo
+
+    yield make
+    for repo in repos:
+        repo.close()
+
+
+def _committed_downloads(repo):
+    """Rows another process would see (separate connection)."""
+    with sqlite3.connect(repo.db_file) as conn:
+        return conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+
+
+def test_writes_commit_once_per_batch(repo_factory):
+    repo = repo_factory(commit_batch=3)
+    repo.add_download("t1", "u1", "a.pdf", "h1")
+    repo.add_download("t2", "u2", "b.pdf", "h2")
+    # Same connection sees uncommitted rows; other connections do not.
+    assert repo.has_filename("a.pdf")
+    assert repo.find_by_hash("h2")["filename"] == "b.pdf"
+    assert _committed_downloads(repo) == 0
+
+    repo.add_download("t3", "u3", "c.pdf", "h3")
+    assert _committed_downloads(repo) == 3
+    assert repo._pending == 0
+
+
+def test_interval_timer_commits_a_partial_batch(repo_factory):
+    repo = repo_factory(commit_batch=100, commit_interval=0.05)
+    repo.add_failure("t", "u", "no_pdf")
+    repo.add_download("t", "u", "a.pdf")
+    deadline = time.monotonic() + 5
+    while _committed_downloads(repo) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _committed_downloads(repo) == 1
+    assert repo._pending == 0
+
+
+def test_flush_and_close_commit_pending_writes(repo_factory):
+    repo = repo_factory(commit_batch=100)
+    repo.add_download("t", "u", "a.pdf")
+    repo.flush()
+    assert _committed_downloads(repo) == 1
+
+    repo.add_download("t", "u", "b.pdf")
+    repo.close()
+    assert _committed_downloads(repo) == 2
+
+
+def test_rename_download_updates_the_pending_row(repo_factory):
+    repo = repo_factory(commit_batch=100)
+    repo.add_download("t", "u", "a.pdf", "h1")
+    repo.rename_download("u", "a.pdf", "a (1).pdf")
+    assert not repo.has_filename("a.pdf")
+    assert repo.find_by_hash("h1")["filename"] == "a (1).pdf"
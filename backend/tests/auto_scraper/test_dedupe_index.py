@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("selenium")  # dedupe_index -> utils needs the browser stack
+
+import database  # noqa: E402
+import dedupe_index  # noqa: E402
+from dedupe_index import BloomFilter, DedupeIndex  # noqa: E402
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    items = [f"https://example.com/board/{index}" for index in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+
+def test_bloom_filter_false_positive_rate_is_near_the_target():
+    bloom = BloomFilter(2000, error_rate=0.01)
+    for index in range(2000):
+        bloom.add(f"present-{index}")
+    false_positives = sum(f"absent-{index}" in bloom for index in range(20000))
+    assert false_positives / 20000 < 0.03
+
+
+def test_bloom_filter_sizing():
+    bloom = BloomFilter(1000, error_rate=0.001)
+    # m = -n ln p / (ln 2)^2, k = m / n ln 2
+    assert 14000 < bloom.size < 14500
+    assert bloom.hash_count == 10
+    assert len(bloom.bits) == (bloom.size + 7) // 8
+    assert "anything" not in BloomFilter(0)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(dedupe_index, "DEDUPE_DB_REFRESH_SECONDS", 30)
+    return DedupeIndex(download_dir=str(tmp_path)).load()
+
+
+def test_exact_mode_hash_lookup_uses_memory(index):
+    index.add_download("a.pdf", "hash-a", "title", "2026-01-01 00:00:00")
+    assert index.exact
+    assert index.find_hash("hash-a")["filename"] == "a.pdf"
+    assert index.filename_duplicate_reason("a.pdf") == "filename_in_db"
+    assert index.find_hash("hash-missing") is None
+
+
+def test_exact_mode_picks_up_other_workers_only_after_the_interval(index):
+    # Written by "another worker": straight to the DB, not through this index.
+    database.get_repository().add_download("title", "https://example.com/1", "b.pdf", "hash-b")
+    assert index.find_hash("hash-b") is None
+
+    index._refreshed_at -= 30
+    assert index.find_hash("hash-b")["filename"] == "b.pdf"
+    assert index.filename_duplicate_reason("b.pdf") == "filename_in_db"
@@ -0,0 +1,61 @@
+import hashlib
+import os
+
+import pytest
+
+pytest.importorskip("selenium")  # pdf_store -> utils needs the browser stack
+
+from pdf_store import PdfStore  # noqa: E402
+
+CONTENT = b"%PDF-1.4 policy body"
+CONTENT_HASH = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PdfStore(root=str(tmp_path / "store"))
+
+
+def _download(directory, name, content=CONTENT):
+    directory.mkdir(exist_ok=True)
+    path = directory / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_put_moves_into_the_store_and_links_back(store, tmp_path):
+    path = _download(tmp_path / "downloads", "guide.pdf")
+    result = store.put(path)
+
+    assert result["hash"] == CONTENT_HASH
+    assert result["duplicate"] is False
+    assert result["filepath"] == path
+    assert result["object_path"] == store.object_path(CONTENT_HASH)
+    assert os.path.samefile(path, result["object_path"])
+    assert store.contains(CONTENT_HASH)
+    assert store.lookup_name("guide.pdf") == result["object_path"]
+
+
+def test_put_trusts_a_precomputed_hash(store, tmp_path):
+    path = _download(tmp_path / "downloads", "guide.pdf")
+    result = store.put(path, file_hash="ab" + "0" * 62)
+    assert result["object_path"].endswith(os.path.join("ab", "ab" + "0" * 62 + ".pdf"))
+
+
+def test_put_drops_a_duplicate_but_records_its_name(store, tmp_path):
+    first = store.put(_download(tmp_path / "downloads", "guide.pdf"))
+    again = _download(tmp_path / "downloads", "guide (copy).pdf")
+    result = store.put(again)
+
+    assert result["duplicate"] is True
+    assert result["filepath"] is None
+    assert result["object_path"] == first["object_path"]
+    assert not os.path.exists(again)
+    assert store.lookup_name("guide (copy).pdf") == first["object_path"]
+
+
+def test_different_content_gets_its_own_object(store, tmp_path):
+    first = store.put(_download(tmp_path / "downloads", "a.pdf"))
+    second = store.put(_download(tmp_path / "downloads", "b.pdf", b"%PDF-1.4 other"))
+    assert second["duplicate"] is False
+    assert second["object_path"] != first["object_path"]
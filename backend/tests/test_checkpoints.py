@@ -0,0 +1,89 @@
+import os
+from types import SimpleNamespace
+
+from backend.services.rag_system.checkpoints import (
+    IngestCheckpoint,
+    IngestCheckpointStore,
+    file_fingerprint,
+)
+
+
+class FakeTable:
+    """Just enough of the supabase query builder for one keyed table."""
+
+    def __init__(self, rows, key):
+        self._rows = rows
+        self._key = key
+        self._filters = {}
+        self._payload = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self._filters[column] = value
+        return self
+
+    def limit(self, count):
+        return self
+
+    def upsert(self, payload):
+        self._payload = payload
+        return self
+
+    def execute(self):
+        if self._payload is not None:
+            self._rows[self._payload[self._key]] = dict(self._payload)
+            return SimpleNamespace(data=[self._payload])
+        data = [
+            row
+            for row in self._rows.values()
+            if all(row.get(column) == value for column, value in self._filters.items())
+        ]
+        return SimpleNamespace(data=data)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.rows = {}
+
+    def table(self, name):
+        assert name == "ingest_checkpoints"
+        return FakeTable(self.rows, "policy_id")
+
+
+def test_resume_point_without_a_row_starts_fresh():
+    store = IngestCheckpointStore(FakeSupabase())
+    checkpoint = store.resume_point("p1", "10-20")
+    assert (checkpoint.last_page, checkpoint.chunks, checkpoint.status) == (0, 0, "running")
+
+
+def test_saved_progress_resumes_for_the_same_file_version():
+    supabase = FakeSupabase()
+    store = IngestCheckpointStore(supabase)
+    store.save(IngestCheckpoint(policy_id="p1", fingerprint="10-20", last_page=4, chunks=37))
+    assert "updated_at" in supabase.rows["p1"]
+
+    checkpoint = store.resume_point("p1", "10-20")
+    assert (checkpoint.last_page, checkpoint.chunks) == (4, 37)
+
+
+def test_changed_file_or_finished_ingest_starts_fresh():
+    store = IngestCheckpointStore(FakeSupabase())
+    store.save(IngestCheckpoint(policy_id="p1", fingerprint="10-20", last_page=4))
+    assert store.resume_point("p1", "11-25").last_page == 0
+
+    store.save(IngestCheckpoint(policy_id="p1", fingerprint="10-20", last_page=9, status="done"))
+    assert store.resume_point("p1", "10-20").last_page == 0
+
+
+def test_file_fingerprint_tracks_size_and_mtime(tmp_path):
+    path = tmp_path / "policy.pdf"
+    path.write_bytes(b"%PDF-1.4 one")
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    first = file_fingerprint(path)
+    assert first == f"{len(b'%PDF-1.4 one')}-1700000000"
+
+    path.write_bytes(b"%PDF-1.4 one plus more")
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    assert file_fingerprint(path) != first
@@ -0,0 +1,77 @@
+import random
+
+from backend.services.rag_system.dedupe import (
+    SimHashIndex,
+    collapse_near_duplicates,
+    from_signed64,
+    hamming,
+    simhash,
+    to_signed64,
+)
+from backend.services.rag_system.types import DocumentChunk, DocumentMetadata
+from backend.services.rag_system.vector_store import RankedChunk
+
+
+def _flip(signature, *positions):
+    for position in positions:
+        signature ^= 1 << position
+    return signature
+
+
+def test_simhash_is_stable_and_close_for_similar_text():
+    text = "출산 지원금은 출생 신고 후 60일 이내에 주민센터에서 신청할 수 있습니다 " * 3
+    assert simhash(text) == simhash(text)
+    assert simhash(text.upper()) == simhash(text)
+    assert hamming(simhash(text), simhash(text + " 문의")) <= 3
+    assert simhash("") == 0
+
+
+def test_signed64_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        signed = to_signed64(value)
+        assert -(1 << 63) <= signed < (1 << 63)
+        assert from_signed64(signed) == value
+
+
+def test_index_finds_signatures_within_the_distance():
+    index = SimHashIndex(max_distance=3)
+    base = random.Random(7).getrandbits(64)
+    index.add("a", base)
+    assert len(index) == 1
+    assert index.find(base) == "a"
+    # Spread the flipped bits over several bands; pigeonhole still guarantees a match.
+    assert index.find(_flip(base, 0, 20, 40)) == "a"
+    assert index.find(_flip(base, 0, 20, 40, 60)) is None
+
+
+def test_index_prefers_the_closest_match_and_honours_exclude_id():
+    index = SimHashIndex(max_distance=3)
+    base = random.Random(11).getrandbits(64)
+    index.add("far", _flip(base, 1, 2))
+    index.add("near", _flip(base, 3))
+    assert index.find(base) == "near"
+    assert index.find(base, exclude_id="near") == "far"
+
+
+def test_zero_distance_index_matches_exact_signatures_only():
+    index = SimHashIndex(max_distance=0)
+    index.add("a", 12345)
+    assert index.find(12345) == "a"
+    assert index.find(_flip(12345, 63)) is None
+
+
+def test_collapse_keeps_best_hit_and_records_other_sources():
+    text = "임신 바우처는 국민행복카드로 100만원을 지원하며 다태아는 140만원입니다"
+
+    def ranked(chunk_id, source, body):
+        chunk = DocumentChunk(
+            id=chunk_id, text=body, metadata=DocumentMetadata(source=source), embedding=[]
+        )
+        return RankedChunk(chunk=chunk)
+
+    first = ranked("a", "seoul", text)
+    hits = [first, ranked("b", "busan", text), ranked("c", "seoul", "전혀 다른 내용의 청크입니다")]
+    collapsed = collapse_near_duplicates(hits)
+    assert [item.chunk.id for item in collapsed] == ["a", "c"]
+    assert collapsed[0].chunk.metadata.extra["also_in"] == ["busan"]
+    assert "also_in" not in first.chunk.metadata.extra
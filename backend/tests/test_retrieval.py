@@ -0,0 +1,86 @@
+import numpy as np
+
+from backend.services.rag_system.retrieval import (
+    cap_per_document,
+    mmr_select,
+    reciprocal_rank_fusion,
+)
+from backend.services.rag_system.types import DocumentChunk, DocumentMetadata
+from backend.services.rag_system.vector_store import RankedChunk
+
+
+def _ranked(chunk_id, source="doc", score=None):
+    chunk = DocumentChunk(
+        id=chunk_id, text=chunk_id, metadata=DocumentMetadata(source=source), embedding=[]
+    )
+    return RankedChunk(chunk=chunk, score=score)
+
+
+def _ids(ranked):
+    return [item.chunk.id for item in ranked]
+
+
+def test_rrf_single_list_is_passed_through():
+    ranking = [_ranked("a", score=0.9), _ranked("b", score=0.5)]
+    fused = reciprocal_rank_fusion([ranking])
+    assert _ids(fused) == ["a", "b"]
+    assert [item.score for item in fused] == [0.9, 0.5]
+
+
+def test_rrf_sums_reciprocal_ranks_across_lists():
+    fused = reciprocal_rank_fusion(
+        [[_ranked("a"), _ranked("b"), _ranked("c")], [_ranked("b"), _ranked("c")]], k=60
+    )
+    assert _ids(fused) == ["b", "c", "a"]
+    assert fused[0].score == 1 / 62 + 1 / 61
+    assert fused[2].score == 1 / 61
+
+
+def test_rrf_limit():
+    fused = reciprocal_rank_fusion([[_ranked("a"), _ranked("b")], [_ranked("c")]], limit=2)
+    assert len(fused) == 2
+    assert reciprocal_rank_fusion([[_ranked("a"), _ranked("b")]], limit=1)[0].chunk.id == "a"
+
+
+def test_cap_per_document_keeps_order_and_limits_each_source():
+    ranked = [
+        _ranked("a1", "a"),
+        _ranked("a2", "a"),
+        _ranked("b1", "b"),
+        _ranked("a3", "a"),
+        _ranked("c1", "c"),
+    ]
+    assert _ids(cap_per_document(ranked, max_per_document=2)) == ["a1", "a2", "b1", "c1"]
+    assert _ids(cap_per_document(ranked, max_per_document=1, limit=2)) == ["a1", "b1"]
+
+
+def test_mmr_without_diversity_is_relevance_order():
+    query = np.array([1.0, 0.0], dtype=np.float32)
+    candidates = np.array([[0.6, 0.8], [1.0, 0.0], [0.8, 0.6]], dtype=np.float32)
+    assert mmr_select(query, candidates, k=3, lambda_mult=1.0) == [1, 2, 0]
+
+
+def test_mmr_skips_near_copies_of_picked_candidates():
+    query = np.array([1.0, 1.0], dtype=np.float32)
+    candidates = np.array(
+        # rows 0 and 1 are near copies; row 2 is as relevant as row 0 but different
+        [[1.0, 0.0], [0.995, 0.0998], [0.0, 1.0], [-1.0, 0.0]],
+        dtype=np.float32,
+    )
+    assert mmr_select(query, candidates, k=2, lambda_mult=1.0) == [1, 0]
+    assert mmr_select(query, candidates, k=2, lambda_mult=0.5) == [1, 2]
+
+
+def test_mmr_uses_given_relevance_and_tolerates_missing_vectors():
+    query = np.array([1.0, 0.0], dtype=np.float32)
+    candidates = np.array([[1.0, 0.0], [0.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    picked = mmr_select(query, candidates, k=3, relevance=np.array([0.1, 0.9, 0.5]))
+    assert picked[0] == 1
+    assert sorted(picked) == [0, 1, 2]
+
+
+def test_mmr_edge_cases():
+    query = np.ones(2, dtype=np.float32)
+    assert mmr_select(query, np.zeros((0, 2), dtype=np.float32), k=3) == []
+    assert mmr_select(query, np.eye(2, dtype=np.float32), k=0) == []
+    assert len(mmr_select(query, np.eye(2, dtype=np.float32), k=5)) == 2
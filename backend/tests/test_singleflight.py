@@ -0,0 +1,84 @@
+import threading
+import time
+
+from backend.services.rag_system.singleflight import SingleFlight
+
+
+def _wait_for_waiters(flight, key, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call.waiters >= count:
+                return
+        time.sleep(0.001)
+    raise AssertionError(f"{count} waiters never joined {key!r}")
+
+
+def _run_coalesced(flight, fn, waiters=3):
+    """Start a leader plus ``waiters`` callers on the same key; return their outcomes."""
+    release = threading.Event()
+    outcomes = []
+    lock = threading.Lock()
+
+    def leader_fn():
+        release.wait(5)
+        return fn()
+
+    def caller(call_fn):
+        try:
+            outcome = flight.do("q", call_fn)
+        except Exception as exc:  # noqa: BLE001 - recorded for the assertions
+            outcome = exc
+        with lock:
+            outcomes.append(outcome)
+
+    threads = [threading.Thread(target=caller, args=(leader_fn,))]
+    threads[0].start()
+    _wait_for_waiters(flight, "q", 0)
+    for _ in range(waiters):
+        thread = threading.Thread(target=caller, args=(fn,))
+        thread.start()
+        threads.append(thread)
+    _wait_for_waiters(flight, "q", waiters)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return {"answer": [1, 2]}
+
+    outcomes = _run_coalesced(flight, fn, waiters=3)
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True]
+    results = [result for result, _ in outcomes]
+    assert all(result == {"answer": [1, 2]} for result in results)
+    # Waiters get deep copies, so mutating one answer cannot leak into another.
+    assert len({id(result) for result in results}) == len(results)
+    assert flight.in_flight() == 0
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+
+    def fn():
+        raise ValueError("boom")
+
+    outcomes = _run_coalesced(flight, fn, waiters=2)
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flight.in_flight() == 0
+
+
+def test_nothing_is_cached_after_completion():
+    flight = SingleFlight()
+    counter = iter(range(10))
+    assert flight.do("q", lambda: next(counter)) == (0, False)
+    assert flight.do("q", lambda: next(counter)) == (1, False)
@@ -0,0 +1,109 @@
+import pytest
+
+from backend.services.rag_system import transport
+from backend.services.rag_system.transport import CircuitBreaker, TokenBucket
+
+
+class FakeTime:
+    """Stands in for the ``time`` module: ``sleep`` advances ``monotonic``."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(transport, "time", fake)
+    return fake
+
+
+def test_bucket_starts_full_then_waits_for_refill(clock):
+    bucket = TokenBucket(60)  # one token per second
+    for _ in range(60):
+        assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_bucket_refills_with_elapsed_time(clock):
+    bucket = TokenBucket(60)
+    bucket.acquire(60)
+    clock.now += 30
+    assert bucket.acquire(30) == 0.0
+    assert bucket.acquire(1) == pytest.approx(1.0)
+
+
+def test_bucket_clamps_requests_larger_than_capacity(clock):
+    bucket = TokenBucket(10)
+    assert bucket.acquire(500) == 0.0
+    assert bucket.acquire(1) == pytest.approx(6.0)
+
+
+def test_bucket_adjust_charges_and_refunds(clock):
+    bucket = TokenBucket(60)
+    bucket.acquire(60)
+    bucket.adjust(-10)  # refund an over-estimate
+    assert bucket.acquire(10) == 0.0
+    bucket.adjust(5)  # charge an under-estimate: the bucket goes into debt
+    assert bucket.acquire(1) == pytest.approx(6.0)
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=30)
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is False
+    assert breaker.allow() == "closed"
+    assert breaker.record_failure() is True
+    assert breaker.state == "open"
+    assert breaker.allow() is None
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30)
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.record_failure() is False
+    assert breaker.state == "closed"
+
+
+def test_breaker_lets_one_probe_through_when_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow() == "probe"
+    assert breaker.allow() is None
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() == "closed"
+
+
+def test_failed_probe_reopens_for_a_full_cooldown(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow() == "probe"
+    assert breaker.record_failure() is False
+    assert breaker.state == "open"
+    clock.now += 29
+    assert breaker.allow() is None
+    clock.now += 1
+    assert breaker.allow() == "probe"
+
+
+def test_released_probe_can_be_retried(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow() == "probe"
+    breaker.release_probe()
+    assert breaker.allow() == "probe"
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from backend.services.rag_system.types import ChunkBatch, ChunkInput, DocumentMetadata
+
+
+def _inputs(count):
+    return [
+        ChunkInput(
+            id=f"c{index}",
+            text=f"text {index}",
+            metadata=DocumentMetadata(source=f"doc{index % 2}", page=index, extra={"chunk_index": index}),
+        )
+        for index in range(count)
+    ]
+
+
+def test_from_inputs_keeps_columns_aligned():
+    embeddings = np.arange(6, dtype=np.float64).reshape(3, 2)
+    batch = ChunkBatch.from_inputs(_inputs(3), embeddings)
+    assert len(batch) == 3
+    assert batch.dim == 2
+    assert batch.embeddings.dtype == np.float32
+    assert batch.ids == ["c0", "c1", "c2"]
+    chunk = batch.chunk(1)
+    assert (chunk.id, chunk.text, chunk.metadata.source, chunk.metadata.page) == (
+        "c1",
+        "text 1",
+        "doc1",
+        1,
+    )
+    assert chunk.metadata.extra == {"chunk_index": 1}
+    assert list(chunk.embedding) == [2.0, 3.0]
+    assert [item.id for item in batch] == batch.ids
+
+
+def test_from_inputs_rejects_mismatched_embeddings():
+    with pytest.raises(ValueError):
+        ChunkBatch.from_inputs(_inputs(3), np.zeros((2, 4)))
+
+
+def test_from_rows_reads_match_function_rows():
+    rows = [
+        {"id": "a", "content": "alpha", "metadata": {"source": "s1", "page": 3}, "similarity": 0.9},
+        {"id": "b", "content": "beta", "metadata": None, "similarity": 0.4},
+    ]
+    batch = ChunkBatch.from_rows(rows)
+    assert batch.dim == 0
+    assert batch.texts == ["alpha", "beta"]
+    assert batch.sources == ["s1", "unknown"]
+    assert batch.pages == [3, None]
+    assert batch.score(0) == pytest.approx(0.9)
+    assert batch.score(1) == pytest.approx(0.4)
+
+
+def test_from_rows_without_every_score_has_no_scores():
+    batch = ChunkBatch.from_rows([{"id": "a", "similarity": 0.5}, {"id": "b"}])
+    assert batch.scores is None
+    assert batch.score(0) is None
+
+
+def test_take_reorders_every_column():
+    batch = ChunkBatch.from_inputs(_inputs(3), np.eye(3))
+    batch.scores = np.asarray([0.1, 0.2, 0.3], dtype=np.float32)
+    taken = batch.take([2, 0])
+    assert taken.ids == ["c2", "c0"]
+    assert taken.sources == ["doc0", "doc0"]
+    assert taken.pages == [2, 0]
+    assert taken.embeddings.tolist() == [[0, 0, 1], [1, 0, 0]]
+    assert taken.scores.tolist() == pytest.approx([0.3, 0.1])
+
+
+def test_empty_batch():
+    batch = ChunkBatch.empty()
+    assert len(batch) == 0
+    assert list(batch) == []
+    assert batch.take([]).ids == []
@@ -12,7 +12,7 @@ interface Message {
   id: string;
   role: "user" | "assistant";
   content: string;
-  sources?: Array<{ doc_id: string; content: string; score: number }>;
+  sources?: Array<{ chunk_id?: string; doc_id: string; content?: string; snippet?: string; score: number }>;
   function_call?: {
     name: string;
     arguments: any;
@@ -46,6 +46,10 @@ export default function ChatPage() {
   const [deleteModalOpen, setDeleteModalOpen] = useState(false);
   const [conversationToDelete, setConversationToDelete] = useState<string | null>(null);
   const [executingFunction, setExecutingFunction] = useState<string | null>(null);
+  // Full source text loaded on demand (compact mode only sends snippets), keyed by chunk id
+  const [sourceTexts, setSourceTexts] = useState<Record<string, string>>({});
+  const [expandedSources, setExpandedSources] = useState<Record<string, boolean>>({});
+  const [loadingSources, setLoadingSources] = useState<string | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
   // Redirect to login if not authenticated
@@ -106,6 +110,40 @@ export default function ChatPage() {
     setIsSidebarOpen(false);
   };
 
+  const toggleSources = async (message: Message) => {
+    if (expandedSources[message.id]) {
+      setExpandedSources((prev) => ({ ...prev, [message.id]: false }));
+      return;
+    }
+
+    // Fetch the full text of every shown source in one batched request
+    const missing = (message.sources || [])
+      .slice(0, 2)
+      .filter((source) => source.chunk_id && !source.content && !(source.chunk_id in sourceTexts))
+      .map((source) => source.chunk_id as string);
+
+    if (missing.length > 0) {
+      setLoadingSources(message.id);
+      try {
+        const chunks = await chatApi.getChunks(missing);
+        setSourceTexts((prev) => {
+          const next = { ...prev };
+          chunks.forEach((chunk: any) => {
+            next[chunk.id] = chunk.content;
+          });
+          return next;
+        });
+      } catch (error) {
+        console.error("Failed to load source text:", error);
+        return;
+      } finally {
+        setLoadingSources(null);
+      }
+    }
+
+    setExpandedSources((prev) => ({ ...prev, [message.id]: true }));
+  };
+
   const handleDeleteClick = (convId: string, e: React.MouseEvent) => {
     e.stopPropagation(); // Prevent loading the conversation when clicking delete
     setConversationToDelete(convId);
@@ -478,12 +516,31 @@ export default function ChatPage() {
                   <p className="text-xs font-semibold text-purple-600">
                     📋 참고 정책
                   </p>
-                  {message.sources.slice(0, 2).map((source, idx) => (
-                    <div key={idx} className="text-xs bg-pink-50 p-2 rounded-lg border border-pink-100">
-                      <p className="font-medium text-gray-700">{source.doc_id}</p>
-                      <p className="text-gray-600 line-clamp-2 mt-1">{source.content}</p>
-                    </div>
-                  ))}
+                  {message.sources.slice(0, 2).map((source, idx) => {
+                    const fullText = source.content ?? (source.chunk_id ? sourceTexts[source.chunk_id] : undefined);
+                    const expanded = expandedSources[message.id] && fullText;
+                    return (
+                      <div key={idx} className="text-xs bg-pink-50 p-2 rounded-lg border border-pink-100">
+                        <p className="font-medium text-gray-700">{source.doc_id}</p>
+                        <p className={`text-gray-600 mt-1 ${expanded ? "whitespace-pre-wrap" : "line-clamp-2"}`}>
+                          {expanded ? fullText : source.snippet ?? source.content}
+                        </p>
+                      </div>
+                    );
+                  })}
+                  {message.sources.slice(0, 2).some((source) => source.chunk_id || source.content) && (
+                    <button
+                      onClick={() => toggleSources(message)}
+                      disabled={loadingSources === message.id}
+                      className="text-xs text-purple-600 hover:text-purple-700 font-medium disabled:opacity-50"
+                    >
+                      {loadingSources === message.id
+                        ? "불러오는 중..."
+                        : expandedSources[message.id]
+                        ? "접기"
+                        : "원문 펼치기"}
+                    </button>
+                  )}
                 </div>
               )}
 
@@ -59,10 +59,14 @@ export const chatApi = {
     return apiRequest('/chat', {
       method: 'POST',
       token,
-      body: JSON.stringify({ message, conversation_id: conversationId }),
+      body: JSON.stringify({ message, conversation_id: conversationId, compact_sources: true }),
     });
   },
 
+  async getChunks(chunkIds: string[]): Promise<any[]> {
+    return apiRequest(`/chunks?ids=${chunkIds.map(encodeURIComponent).join(',')}`);
+  },
+
   async getConversations(token: string): Promise<any[]> {
     return apiRequest('/conversations', { token });
   },